@@ -0,0 +1,51 @@
+# Archive API - Serves one archived brief or magazine as plain JSON
+# Documents are stored zstd-compressed with a trained dictionary
+# (scripts/archive_store.py), which browsers cannot decode; search results
+# link here instead of to the stored file.
+#
+# GET /api/archive?path=2025/12/12/emea-evening
+
+import json
+import re
+import sys
+from http.server import BaseHTTPRequestHandler
+from pathlib import Path
+from urllib.parse import parse_qs, urlparse
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "scripts"))
+
+from archive_store import ARCHIVE_DIR, read_archive  # noqa: E402
+
+PATH_PATTERN = re.compile(r"^\d{4}/\d{2}/\d{2}/[a-z0-9-]+$")
+
+# Archived documents only change on a redeploy, which clears the edge cache
+CACHE_CONTROL = "public, max-age=3600, s-maxage=31536000"
+
+
+class handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        path = parse_qs(urlparse(self.path).query).get("path", [""])[0]
+        if not PATH_PATTERN.match(path):
+            return self.send_json(400, {"error": "path must be YYYY/MM/DD/<key>"})
+
+        try:
+            document = read_archive(ARCHIVE_DIR / path)
+        except FileNotFoundError:
+            return self.send_json(404, {"error": f"No archived document at {path}"})
+        except (OSError, ValueError, RuntimeError) as e:
+            return self.send_json(500, {"error": str(e)})
+
+        self.send_json(200, document, CACHE_CONTROL)
+
+    def do_OPTIONS(self):
+        self.send_response(200)
+        self.end_headers()
+
+    def send_json(self, status: int, payload, cache_control: str = "no-store"):
+        body = json.dumps(payload, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Cache-Control", cache_control)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
@@ -1,12 +1,16 @@
 /**
  * Top 100 Coins Cache
  * 
- * Fetches top 100 coins from CoinGecko every 15 minutes
+ * Serves the static snapshot published by scripts/capture_mood.py when fresh,
+ * otherwise fetches top 100 coins from CoinGecko every 15 minutes
  * Used by: Your Coins vs Market, coin selection, portfolio tracking
  * 
  * Returns: { coins: [...], updated, cached }
  */
 
+import { readFileSync } from 'fs';
+import { join } from 'path';
+
 // In-memory cache
 let cache = {
     data: null,
@@ -14,6 +18,8 @@ let cache = {
 };
 
 const CACHE_DURATION = 15 * 60 * 1000; // 15 minutes in ms
+const SNAPSHOT_PATH = join(process.cwd(), 'data', 'snapshots', 'v1', 'coins.json');
+const SNAPSHOT_MAX_AGE = CACHE_DURATION; // A snapshot is no staler than a live fetch would be
 
 export default async function handler(req, res) {
     res.setHeader('Access-Control-Allow-Origin', '*');
@@ -31,6 +37,21 @@ export default async function handler(req, res) {
         });
     }
     
+    // Serve the published snapshot if it is recent enough; it ages from its capture time
+    const snapshot = readSnapshot(now);
+    if (snapshot) {
+        cache = {
+            data: snapshot,
+            timestamp: snapshot.updatedTimestamp
+        };
+        
+        return res.status(200).json({
+            ...snapshot,
+            cached: false,
+            snapshot: true
+        });
+    }
+    
     // Fetch fresh data
     try {
         const coins = await fetchTop100Coins();
@@ -115,3 +136,16 @@ async function fetchTop100Coins() {
         athChangePercent: coin.ath_change_percentage
     }));
 }
+
+function readSnapshot(now) {
+    try {
+        const snapshot = JSON.parse(readFileSync(SNAPSHOT_PATH, 'utf8'));
+        if (!snapshot.updatedTimestamp || (now - snapshot.updatedTimestamp) > SNAPSHOT_MAX_AGE) {
+            return null;
+        }
+        return snapshot;
+    } catch (e) {
+        console.log('[Coins Cache] No snapshot available, fetching live data');
+        return null;
+    }
+}
@@ -1,12 +1,16 @@
 /**
  * Market Data Cache
  * 
- * Fetches BTC, ETH and global market data from CoinGecko
+ * Serves the static snapshot published by scripts/capture_mood.py when fresh,
+ * otherwise fetches BTC, ETH and global market data from CoinGecko
  * Caches for 5 minutes to reduce API calls and improve reliability
  * 
  * Returns: { btc, eth, market, updated }
  */
 
+import { readFileSync } from 'fs';
+import { join } from 'path';
+
 // In-memory cache (persists across warm function invocations)
 let cache = {
     data: null,
@@ -14,6 +18,8 @@ let cache = {
 };
 
 const CACHE_DURATION = 5 * 60 * 1000; // 5 minutes in ms
+const SNAPSHOT_PATH = join(process.cwd(), 'data', 'snapshots', 'v1', 'market.json');
+const SNAPSHOT_MAX_AGE = CACHE_DURATION; // A snapshot is no staler than a live fetch would be
 
 export default async function handler(req, res) {
     // CORS headers
@@ -32,6 +38,21 @@ export default async function handler(req, res) {
         });
     }
     
+    // Serve the published snapshot if it is recent enough; it ages from its capture time
+    const snapshot = readSnapshot(now);
+    if (snapshot) {
+        cache = {
+            data: snapshot,
+            timestamp: snapshot.updatedTimestamp
+        };
+        
+        return res.status(200).json({
+            ...snapshot,
+            cached: false,
+            snapshot: true
+        });
+    }
+    
     // Fetch fresh data
     try {
         const [priceData, globalData] = await Promise.all([
@@ -158,3 +179,16 @@ function getFallbackData() {
         fallback: true
     };
 }
+
+function readSnapshot(now) {
+    try {
+        const snapshot = JSON.parse(readFileSync(SNAPSHOT_PATH, 'utf8'));
+        if (!snapshot.updatedTimestamp || (now - snapshot.updatedTimestamp) > SNAPSHOT_MAX_AGE) {
+            return null;
+        }
+        return snapshot;
+    } catch (e) {
+        console.log('[Market Cache] No snapshot available, fetching live data');
+        return null;
+    }
+}
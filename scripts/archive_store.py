@@ -0,0 +1,254 @@
+#!/usr/bin/env python3
+"""
+Archive Store - The Litmus
+Compressed storage for the dated brief archive (content/archive/).
+
+Every archived document is compressed on its own - so any one can be read
+without touching the others - with a zstd dictionary trained on our own
+brief corpus. Briefs share most of their structure and vocabulary, so a
+shared dictionary takes a small document to a fraction of its per-file gzip
+size.
+
+- Documents:     content/archive/YYYY/MM/DD/<key>.json.zst
+- Serving:       browsers cannot decode zstd with our dictionary, so search
+                 results link to /api/archive?path=YYYY/MM/DD/<key>
+                 (api/archive.py), which decompresses with read_archive()
+- Dictionaries:  content/archive/_dict/<dict id>.zdict, state in state.json
+- Retraining:    after RETRAIN_EVERY new documents (or RETRAIN_DAYS) once at
+                 least MIN_TRAINING_DOCS exist. Existing documents keep the
+                 dictionary they were written with (its id is in the zstd
+                 frame header), so retraining never rewrites the archive in
+                 git; `compact` recompresses everything and prunes old ones
+- Fallback:      without the zstandard package documents are written as
+                 <key>.json.gz; read_archive() reads every format
+
+Run:
+  python scripts/archive_store.py stats      Compare plain, gzip and zstd sizes
+  python scripts/archive_store.py train      Retrain the dictionary now
+  python scripts/archive_store.py compact    Recompress everything with the current
+                                             dictionary and prune unused ones
+  python scripts/archive_store.py cat <path> Print a decompressed document
+
+Requires: zstandard (optional)
+"""
+
+import gzip
+import json
+import sys
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+try:
+    import zstandard
+except ImportError:  # Archive falls back to per-file gzip
+    zstandard = None
+
+from content_writer import atomic_write, encode_json
+
+# Paths
+SCRIPT_DIR = Path(__file__).parent
+ARCHIVE_DIR = SCRIPT_DIR.parent / "content" / "archive"
+DICT_DIR = ARCHIVE_DIR / "_dict"
+DICT_STATE_FILE = DICT_DIR / "state.json"
+ARCHIVE_API = "/api/archive"
+
+# Compression
+ZSTD_LEVEL = 19
+DICT_SIZE = 32 * 1024
+GZIP_LEVEL = 9
+SUFFIXES = (".json.zst", ".json.gz", ".json")
+
+# Retraining
+MIN_TRAINING_DOCS = 30        # zstd needs a reasonable corpus to train on
+MAX_TRAINING_DOCS = 2000      # Newest documents used as samples
+RETRAIN_EVERY = 200           # New documents since the last training
+RETRAIN_DAYS = 30
+
+_dictionaries = {}
+
+
+def load_state() -> dict:
+    try:
+        with open(DICT_STATE_FILE, "r") as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {"dict_id": None, "trained_at": None, "trained_on": 0, "since_training": 0}
+
+
+def save_state(state: dict):
+    atomic_write(DICT_STATE_FILE, json.dumps(state, indent=2).encode())
+
+
+def dictionary(dict_id: int):
+    """Load (and cache) a trained dictionary by its zstd dictionary id."""
+    if dict_id not in _dictionaries:
+        path = DICT_DIR / f"{dict_id}.zdict"
+        _dictionaries[dict_id] = zstandard.ZstdCompressionDict(path.read_bytes())
+    return _dictionaries[dict_id]
+
+
+def iter_archive():
+    """Every archived document path, oldest first."""
+    return sorted(
+        path for path in ARCHIVE_DIR.glob("*/*/*/*")
+        if path.name.endswith(SUFFIXES) and not path.name.startswith(".")
+    )
+
+
+def base_path(path: Path) -> Path:
+    """Archive path without its storage suffix (.../emea-morning)."""
+    name = Path(path).name
+    for suffix in SUFFIXES:
+        if name.endswith(suffix):
+            return Path(path).with_name(name[:-len(suffix)])
+    return Path(path)
+
+
+def compress(body: bytes) -> tuple:
+    """Return (suffix, compressed bytes) with the current dictionary if there is one."""
+    if zstandard is None:
+        return ".json.gz", gzip.compress(body, GZIP_LEVEL, mtime=0)
+
+    dict_id = load_state()["dict_id"]
+    if dict_id is not None:
+        compressor = zstandard.ZstdCompressor(level=ZSTD_LEVEL, dict_data=dictionary(dict_id))
+    else:
+        compressor = zstandard.ZstdCompressor(level=ZSTD_LEVEL)
+    return ".json.zst", compressor.compress(body)
+
+
+def decompress(path: Path, data: bytes) -> bytes:
+    if path.name.endswith(".json.gz"):
+        return gzip.decompress(data)
+    if not path.name.endswith(".json.zst"):
+        return data
+    if zstandard is None:
+        raise RuntimeError(f"{path} is zstd-compressed - pip install zstandard to read it")
+
+    dict_id = zstandard.get_frame_parameters(data).dict_id
+    options = {"dict_data": dictionary(dict_id)} if dict_id else {}
+    return zstandard.ZstdDecompressor(**options).decompress(data)
+
+
+def read_archive(path) -> dict:
+    """Read any archived document, whatever it was stored as."""
+    path = Path(path)
+    if not path.exists():
+        path = next((p for p in (base_path(path).with_name(base_path(path).name + s) for s in SUFFIXES) if p.exists()), path)
+    return json.loads(decompress(path, path.read_bytes()))
+
+
+def store(base: Path, body: bytes) -> Path:
+    """Write one document's bytes in the current format and drop any other copies of it."""
+    suffix, data = compress(body)
+    output_file = base.with_name(base.name + suffix)
+    atomic_write(output_file, data)
+
+    for other in SUFFIXES + (".json.br",):
+        if other != suffix:
+            base.with_name(base.name + other).unlink(missing_ok=True)
+    return output_file
+
+
+def archive_url(path) -> str:
+    """The URL api/archive.py serves a document at, decompressed."""
+    return f"{ARCHIVE_API}?path={base_path(path).relative_to(ARCHIVE_DIR).as_posix()}"
+
+
+def write_archive(path, payload) -> Path:
+    """Compress one document to <path>.json.zst (or .json.gz)."""
+    output_file = store(base_path(path), encode_json(payload))
+
+    if zstandard is not None:
+        state = load_state()
+        state["since_training"] += 1
+        save_state(state)
+        maybe_retrain(state)
+    return output_file
+
+
+def maybe_retrain(state: dict):
+    trained_at = state["trained_at"]
+    stale = trained_at is None or datetime.fromisoformat(trained_at) < datetime.now(timezone.utc) - timedelta(days=RETRAIN_DAYS)
+    if state["since_training"] >= RETRAIN_EVERY or (stale and state["since_training"] > 0):
+        if len(iter_archive()) >= MIN_TRAINING_DOCS:
+            train()
+
+
+def train() -> bool:
+    """Train a new current dictionary on the newest documents."""
+    paths = iter_archive()
+    if len(paths) < MIN_TRAINING_DOCS:
+        print(f"  Archive dictionary: {len(paths)} documents, need {MIN_TRAINING_DOCS} to train")
+        return False
+
+    samples = [decompress(path, path.read_bytes()) for path in paths[-MAX_TRAINING_DOCS:]]
+    trained = zstandard.train_dictionary(DICT_SIZE, samples, level=ZSTD_LEVEL)
+    dict_id = trained.dict_id()
+
+    atomic_write(DICT_DIR / f"{dict_id}.zdict", trained.as_bytes())
+    _dictionaries[dict_id] = trained
+    save_state({
+        "dict_id": dict_id,
+        "trained_at": datetime.now(timezone.utc).isoformat(),
+        "trained_on": len(samples),
+        "since_training": 0,
+    })
+
+    print(f"  Archive dictionary {dict_id}: trained on {len(samples)} documents")
+    return True
+
+
+def compact() -> int:
+    """Recompress every document with the current dictionary and prune unused ones."""
+    documents = {base_path(path): decompress(path, path.read_bytes()) for path in iter_archive()}
+    for base, body in documents.items():
+        store(base, body)
+
+    current = str(load_state()["dict_id"])
+    for path in DICT_DIR.glob("*.zdict"):
+        if path.stem != current:
+            path.unlink()
+    return len(documents)
+
+
+def stats():
+    """Archive size as plain JSON, per-file gzip and as stored."""
+    plain = gzipped = stored = 0
+    paths = iter_archive()
+    for path in paths:
+        data = path.read_bytes()
+        body = decompress(path, data)
+        plain += len(body)
+        gzipped += len(gzip.compress(body, GZIP_LEVEL, mtime=0))
+        stored += len(data)
+    dictionary_bytes = sum(path.stat().st_size for path in DICT_DIR.glob("*.zdict"))
+
+    print(f"  {len(paths)} documents")
+    print(f"  plain JSON:     {plain / 1024:8.1f} KB")
+    print(f"  per-file gzip:  {gzipped / 1024:8.1f} KB")
+    print(f"  stored:         {stored / 1024:8.1f} KB (+ {dictionary_bytes / 1024:.1f} KB dictionary)")
+
+
+def main():
+    command = sys.argv[1] if len(sys.argv) > 1 else "stats"
+    if command == "stats":
+        stats()
+        return 0
+    if command == "train":
+        if zstandard is None:
+            print("  zstandard is not installed")
+            return 1
+        return 0 if train() else 1
+    if command == "compact":
+        print(f"  Recompressed {compact()} documents")
+        return 0
+    if command == "cat" and len(sys.argv) > 2:
+        print(json.dumps(read_archive(sys.argv[2]), indent=2, ensure_ascii=False))
+        return 0
+    print(__doc__)
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
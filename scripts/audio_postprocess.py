@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+audio_postprocess.py - Loudness normalisation, compact encode and HLS for narration
+
+Runs after generate_audio.py has stitched an episode:
+- Measures loudness (EBU R128) and applies a linear two-pass loudnorm so every
+  episode plays at the same level - the episode MP3 itself (audio_url) is
+  replaced by its normalised encode
+- Writes a compact mono speech encode next to it (<stem>.compact.mp3)
+- Writes an HLS variant (hls/<stem>/index.m3u8 + short AAC segments) so players
+  start after the first segment instead of the whole download
+
+Everything runs locally with ffmpeg. Without ffmpeg on PATH the stage is
+skipped and the MP3 is published as synthesised.
+
+Run: python scripts/audio_postprocess.py <episode.mp3>
+"""
+
+import json
+import os
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+
+from mp3_frames import iter_frames
+
+# Loudness target for spoken word (podcast norm)
+LOUDNESS_TARGET = {"I": -16.0, "TP": -1.5, "LRA": 11.0}
+
+# Episode MP3 re-encode - the ElevenLabs mp3_44100_128 format (loudnorm works at
+# 192 kHz internally, so the sample rate is set back to the episode's own)
+MAIN_BITRATE = '128k'
+MAIN_SAMPLE_RATE = 44100
+
+# Compact speech profile
+COMPACT_SAMPLE_RATE = 24000
+COMPACT_BITRATE = '48k'
+
+# HLS - short segments so playback starts within one
+HLS_SEGMENT_SECONDS = 6
+HLS_BITRATE = '48k'
+HLS_PLAYLIST = 'index.m3u8'
+
+FFMPEG_TIMEOUT = 600
+
+def ffmpeg_available():
+    return shutil.which('ffmpeg') is not None
+
+def run_ffmpeg(args):
+    """Run ffmpeg quietly; return its stderr (where filters report)"""
+    result = subprocess.run(
+        ['ffmpeg', '-hide_banner', '-nostdin', '-y', *args],
+        capture_output=True, text=True, timeout=FFMPEG_TIMEOUT, check=True
+    )
+    return result.stderr
+
+def measure_loudness(source):
+    """First loudnorm pass: integrated loudness, true peak, range and threshold"""
+    target = ':'.join(f'{k}={v}' for k, v in LOUDNESS_TARGET.items())
+    stderr = run_ffmpeg(['-i', str(source), '-af', f'loudnorm={target}:print_format=json', '-f', 'null', '-'])
+
+    # The measurement is the last JSON object ffmpeg prints
+    return json.loads(stderr[stderr.rindex('{'):stderr.rindex('}') + 1])
+
+def loudnorm_filter(measured):
+    """Second-pass loudnorm filter using the measured values (linear gain, no pumping)"""
+    target = ':'.join(f'{k}={v}' for k, v in LOUDNESS_TARGET.items())
+    return (
+        f"loudnorm={target}"
+        f":measured_I={measured['input_i']}:measured_TP={measured['input_tp']}"
+        f":measured_LRA={measured['input_lra']}:measured_thresh={measured['input_thresh']}"
+        f":offset={measured['target_offset']}:linear=true"
+    )
+
+def postprocess(source):
+    """Normalise the episode MP3 in place and encode the variants
+
+    Returns {'compact': path, 'hls': playlist path} (forward-slash strings),
+    or {} when ffmpeg is missing or fails - the MP3 is then left untouched.
+    """
+    source = Path(source)
+    if not ffmpeg_available():
+        print("⚠️ ffmpeg not found - skipping loudness normalisation and variants")
+        return {}
+
+    compact_path = source.with_name(f'{source.stem}.compact.mp3')
+    hls_dir = source.parent / 'hls' / source.stem
+    main_tmp = source.with_name(f'.{source.name}.tmp')
+    compact_tmp = compact_path.with_name(f'.{compact_path.name}.tmp')
+    hls_tmp = hls_dir.with_name(f'.{hls_dir.name}.tmp')
+
+    try:
+        print(f"🔊 Measuring loudness: {source.name}")
+        measured = measure_loudness(source)
+        print(f"   {measured['input_i']} LUFS -> {LOUDNESS_TARGET['I']} LUFS")
+        audio_filter = loudnorm_filter(measured)
+        first_frame = next(iter_frames(source.read_bytes()), (0, {}))[1]
+        main_rate = first_frame.get('sample_rate', MAIN_SAMPLE_RATE)
+
+        # One decode, three outputs: normalised MP3, compact MP3 and HLS segments, all into temp paths
+        shutil.rmtree(hls_tmp, ignore_errors=True)
+        hls_tmp.mkdir(parents=True)
+        run_ffmpeg([
+            '-i', str(source),
+            '-af', audio_filter, '-ar', str(main_rate),
+            '-c:a', 'libmp3lame', '-b:a', MAIN_BITRATE, '-f', 'mp3', str(main_tmp),
+            '-af', audio_filter, '-ac', '1', '-ar', str(COMPACT_SAMPLE_RATE),
+            '-c:a', 'libmp3lame', '-b:a', COMPACT_BITRATE, '-f', 'mp3', str(compact_tmp),
+            '-af', audio_filter, '-ac', '1', '-ar', str(COMPACT_SAMPLE_RATE),
+            '-c:a', 'aac', '-b:a', HLS_BITRATE,
+            '-f', 'hls', '-hls_time', str(HLS_SEGMENT_SECONDS), '-hls_playlist_type', 'vod',
+            '-hls_segment_filename', str(hls_tmp / 'segment-%03d.ts'), str(hls_tmp / HLS_PLAYLIST),
+        ])
+
+        os.replace(compact_tmp, compact_path)
+        shutil.rmtree(hls_dir, ignore_errors=True)
+        os.replace(hls_tmp, hls_dir)
+        os.replace(main_tmp, source)
+
+    except (subprocess.CalledProcessError, subprocess.TimeoutExpired, OSError, ValueError, KeyError) as e:
+        detail = getattr(e, 'stderr', None) or e
+        print(f"⚠️ Post-processing failed, keeping original only: {str(detail).strip()[-300:]}")
+        return {}
+    finally:
+        main_tmp.unlink(missing_ok=True)
+        compact_tmp.unlink(missing_ok=True)
+        shutil.rmtree(hls_tmp, ignore_errors=True)
+
+    original_kb = source.stat().st_size / 1024
+    compact_kb = compact_path.stat().st_size / 1024
+    segments = len(list(hls_dir.glob('*.ts')))
+    print(f"✅ Normalised: {source.name} ({original_kb:.0f} KB)")
+    print(f"✅ Compact: {compact_path.name} ({compact_kb:.0f} KB, {compact_kb / original_kb:.0%} of the episode)")
+    print(f"✅ HLS: {segments} x {HLS_SEGMENT_SECONDS}s segments in {hls_dir}")
+
+    return {
+        'compact': str(compact_path).replace('\\', '/'),
+        'hls': str(hls_dir / HLS_PLAYLIST).replace('\\', '/'),
+    }
+
+if __name__ == '__main__':
+    if len(sys.argv) != 2:
+        print("Usage: python scripts/audio_postprocess.py <episode.mp3>")
+        sys.exit(2)
+    sys.exit(0 if postprocess(sys.argv[1]) else 1)
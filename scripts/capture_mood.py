@@ -5,28 +5,77 @@ Runs hourly via GitHub Actions to store real historical data for trails.
 Stores:
 - Hourly snapshots (last 24 hours) for daily trail
 - Daily snapshots (last 7 days) for weekly trail
+- Every hourly breadth / M/V point, captured or backfilled, with no rolling
+  limit (data/mood-archive.json) for regime analytics over long windows
+- Hourly top-100 prices (last 90 days) for correlation and volatility matrices
+- Streaming EWMA statistics for breadth and M/V, used to emit out-of-cycle
+  brief triggers (data/mood-trigger.json) on sharp moves or zone changes;
+  generate_brief.py --on-trigger (scheduler.py's mood-trigger job) consumes them
+Publishes:
+- Static market (BTC/ETH/global) and top-100 coins snapshots for the
+  market-cache and coins-cache endpoints (minified, content_writer.py),
+  queued for the next publish_queue.py flush so every capture is deployed
+
+Backfill past history (resumable, rate-limited):
+    python scripts/capture_mood.py backfill <start YYYY-MM-DD> <end YYYY-MM-DD>
+    python scripts/capture_mood.py backfill --resume <days>
+--resume fills only the hours since the newest one both the archive and the
+price history hold, or the last <days> days when either is empty.
 """
 
 import json
 import os
 import sys
-from datetime import datetime, timezone
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
 import urllib.request
 import urllib.error
 
+from content_writer import write_json
+from http_pool import MARKET_TTL, NETWORK_ERRORS, get_json
+from mood_zones import determine_zone, mv_to_volume_ratio
+from publish_queue import enqueue
+from run_metrics import metrics_run, span
+
 # Paths
 SCRIPT_DIR = Path(__file__).parent
 DATA_DIR = SCRIPT_DIR.parent / "data"
 MOOD_HISTORY_FILE = DATA_DIR / "mood-history.json"
+MOOD_ARCHIVE_FILE = DATA_DIR / "mood-archive.json"
+PRICE_HISTORY_FILE = DATA_DIR / "price-history.json"
+
+# Static snapshots - bump the version when the payload shape changes
+SNAPSHOT_VERSION = 1
+SNAPSHOT_DIR = DATA_DIR / "snapshots" / f"v{SNAPSHOT_VERSION}"
 
 # CoinGecko APIs
 GLOBAL_API = "https://api.coingecko.com/api/v3/global"
-COINS_API = "https://api.coingecko.com/api/v3/coins/markets?vs_currency=usd&order=market_cap_desc&per_page=100&page=1&sparkline=false&price_change_percentage=24h"
+COINS_API = "https://api.coingecko.com/api/v3/coins/markets?vs_currency=usd&order=market_cap_desc&per_page=100&page=1&sparkline=false&price_change_percentage=24h,7d,30d"
+COIN_RANGE_API = "https://api.coingecko.com/api/v3/coins/{coin_id}/market_chart/range?vs_currency=usd&from={start}&to={end}"
 
 # Retention
 MAX_HOURLY_POINTS = 25  # ~24 hours + buffer
 MAX_DAILY_POINTS = 8    # 7 days + buffer
+MAX_PRICE_POINTS = 90 * 24  # 90 days of hourly prices
+
+# Anomaly detection (constant time per capture - state lives in history["stream"])
+MOOD_TRIGGER_FILE = DATA_DIR / "mood-trigger.json"
+EWMA_ALPHA = 0.1               # ~10 hour memory on hourly captures
+Z_SCORE_THRESHOLD = 3.0
+WARMUP_POINTS = 24             # Don't score until the variance has settled
+TRIGGER_COOLDOWN_HOURS = 6
+MAX_TRIGGERS = 20
+
+# Backfill
+BACKFILL_CHECKPOINT_FILE = DATA_DIR / "mood-backfill-checkpoint.json"
+BACKFILL_WORKERS = 4           # Concurrent CoinGecko requests
+BACKFILL_MIN_INTERVAL = 2.5    # Seconds between request starts (~24/min, free tier is ~30)
+BACKFILL_MAX_RETRIES = 5
+BACKFILL_WINDOW_DAYS = 90      # CoinGecko returns hourly points for ranges up to 90 days
+BACKFILL_CHECKPOINT_EVERY = 25 # Coin windows fetched between checkpoint writes
 
 
 def fetch_json(url: str) -> dict:
@@ -36,14 +85,8 @@ def fetch_json(url: str) -> dict:
         return json.loads(response.read().decode())
 
 
-def calculate_mood_data() -> dict:
+def calculate_mood_data(global_data: dict, coins: list) -> dict:
     """Calculate current market mood metrics."""
-    # Fetch global data
-    global_data = fetch_json(GLOBAL_API)
-    
-    # Fetch top 100 coins
-    coins = fetch_json(COINS_API)
-    
     # Calculate breadth (% of coins that are green)
     green_coins = sum(1 for c in coins if (c.get("price_change_percentage_24h") or 0) > 0)
     breadth = (green_coins / len(coins)) * 100 if coins else 50
@@ -64,6 +107,67 @@ def calculate_mood_data() -> dict:
     }
 
 
+def build_market_snapshot(global_data: dict, coins: list, updated: datetime) -> dict:
+    """Build the market-cache payload (BTC, ETH, global) from captured data."""
+    def coin_summary(coin_id: str) -> dict:
+        coin = next((c for c in coins if c.get("id") == coin_id), {})
+        return {
+            "price": coin.get("current_price") or 0,
+            "change24h": coin.get("price_change_percentage_24h") or 0,
+            "marketCap": coin.get("market_cap") or 0
+        }
+    
+    data = global_data.get("data", {})
+    return {
+        "version": SNAPSHOT_VERSION,
+        "btc": coin_summary("bitcoin"),
+        "eth": coin_summary("ethereum"),
+        "market": {
+            "totalMarketCap": data.get("total_market_cap", {}).get("usd", 0),
+            "totalVolume24h": data.get("total_volume", {}).get("usd", 0),
+            "marketCapChange24h": data.get("market_cap_change_percentage_24h_usd", 0),
+            "btcDominance": data.get("market_cap_percentage", {}).get("btc", 0),
+            "ethDominance": data.get("market_cap_percentage", {}).get("eth", 0),
+            "activeCryptos": data.get("active_cryptocurrencies", 0)
+        },
+        "updated": updated.isoformat(),
+        "updatedTimestamp": int(updated.timestamp() * 1000)
+    }
+
+
+def build_coins_snapshot(coins: list, updated: datetime) -> dict:
+    """Build the coins-cache payload (top 100) in the endpoint's standard format."""
+    transformed = [{
+        "id": c.get("id"),
+        "symbol": (c.get("symbol") or "").upper(),
+        "name": c.get("name"),
+        "image": c.get("image"),
+        "price": c.get("current_price"),
+        "marketCap": c.get("market_cap"),
+        "rank": c.get("market_cap_rank"),
+        "volume24h": c.get("total_volume"),
+        "change24h": c.get("price_change_percentage_24h") or 0,
+        "change7d": c.get("price_change_percentage_7d_in_currency") or 0,
+        "change30d": c.get("price_change_percentage_30d_in_currency") or 0,
+        "ath": c.get("ath"),
+        "athDate": c.get("ath_date"),
+        "athChangePercent": c.get("ath_change_percentage")
+    } for c in coins]
+    
+    return {
+        "version": SNAPSHOT_VERSION,
+        "coins": transformed,
+        "count": len(transformed),
+        "updated": updated.isoformat(),
+        "updatedTimestamp": int(updated.timestamp() * 1000)
+    }
+
+
+def publish_snapshot(name: str, payload: dict) -> Path:
+    """Write a snapshot, replacing the old file atomically."""
+    return write_json(SNAPSHOT_DIR / f"{name}.json", payload, pretty=False)
+
+
 def load_history() -> dict:
     """Load existing history or create new structure."""
     if MOOD_HISTORY_FILE.exists():
@@ -87,6 +191,88 @@ def save_history(history: dict):
         json.dump(history, f, indent=2)
 
 
+def load_archive() -> dict:
+    """Load the hourly archive: timestamps[i] (epoch hour) has breadth[i] and mv[i]."""
+    if MOOD_ARCHIVE_FILE.exists():
+        try:
+            with open(MOOD_ARCHIVE_FILE, "r") as f:
+                return json.load(f)
+        except (json.JSONDecodeError, IOError):
+            pass
+    
+    return {"timestamps": [], "breadth": [], "mv": []}
+
+
+def merge_archive(archive: dict, points: list, replace: bool = True):
+    """Merge hourly points into the archive; replace=False keeps hours already stored."""
+    hours = {ts: (b, mv) for ts, b, mv in zip(archive["timestamps"], archive["breadth"], archive["mv"])}
+    for point in points:
+        hour = int(datetime.fromisoformat(point["timestamp"].replace("Z", "+00:00")).timestamp()) // 3600 * 3600
+        if replace or hour not in hours:
+            hours[hour] = (point["breadth"], point["mv"])
+    
+    archive["timestamps"] = sorted(hours)
+    archive["breadth"] = [hours[ts][0] for ts in archive["timestamps"]]
+    archive["mv"] = [hours[ts][1] for ts in archive["timestamps"]]
+
+
+def save_archive(archive: dict):
+    """Save the archive compactly (no retention limit - ~9k points a year)."""
+    DATA_DIR.mkdir(parents=True, exist_ok=True)
+    tmp_path = MOOD_ARCHIVE_FILE.with_name(f".{MOOD_ARCHIVE_FILE.name}.tmp")
+    with open(tmp_path, "w") as f:
+        json.dump(archive, f, separators=(",", ":"))
+    os.replace(tmp_path, MOOD_ARCHIVE_FILE)
+
+
+def load_price_history() -> dict:
+    """Load hourly price rows: coins[i] is the column for rows[*][i]."""
+    if PRICE_HISTORY_FILE.exists():
+        try:
+            with open(PRICE_HISTORY_FILE, "r") as f:
+                return json.load(f)
+        except (json.JSONDecodeError, IOError):
+            pass
+    
+    return {"coins": [], "timestamps": [], "rows": []}
+
+
+def merge_prices(price_history: dict, hour: int, prices: dict):
+    """Insert or replace the price row for one hour (epoch seconds)."""
+    columns = {coin_id: i for i, coin_id in enumerate(price_history["coins"])}
+    for coin_id in prices:
+        if coin_id not in columns:
+            columns[coin_id] = len(price_history["coins"])
+            price_history["coins"].append(coin_id)
+    
+    row = [None] * len(price_history["coins"])
+    for coin_id, price in prices.items():
+        row[columns[coin_id]] = price
+    
+    timestamps = price_history["timestamps"]
+    if hour in timestamps:
+        price_history["rows"][timestamps.index(hour)] = row
+    elif not timestamps or hour > timestamps[-1]:
+        timestamps.append(hour)
+        price_history["rows"].append(row)
+    else:
+        index = next(i for i, ts in enumerate(timestamps) if ts > hour)
+        timestamps.insert(index, hour)
+        price_history["rows"].insert(index, row)
+
+
+def save_price_history(price_history: dict):
+    """Trim to retention and save compactly (this file grows by ~100 numbers an hour)."""
+    price_history["timestamps"] = price_history["timestamps"][-MAX_PRICE_POINTS:]
+    price_history["rows"] = price_history["rows"][-MAX_PRICE_POINTS:]
+    
+    DATA_DIR.mkdir(parents=True, exist_ok=True)
+    tmp_path = PRICE_HISTORY_FILE.with_name(f".{PRICE_HISTORY_FILE.name}.tmp")
+    with open(tmp_path, "w") as f:
+        json.dump(price_history, f, separators=(",", ":"))
+    os.replace(tmp_path, PRICE_HISTORY_FILE)
+
+
 def should_capture_daily(history: dict) -> bool:
     """Check if we should capture a daily snapshot (once per day at ~00:00 UTC)."""
     now = datetime.now(timezone.utc)
@@ -105,12 +291,338 @@ def should_capture_daily(history: dict) -> bool:
         return True
 
 
+def update_stream_stats(stream: dict, point: dict) -> list:
+    """Update EWMA mean/variance and zone for one capture; return any signals.
+    
+    Z-scores are taken against the state *before* this point is folded in, so a
+    sudden move is measured against the recent regime rather than itself.
+    """
+    signals = []
+    
+    for metric in ("breadth", "mv"):
+        value = point[metric]
+        stats = stream.setdefault(metric, {"mean": value, "var": 0.0, "n": 0})
+        
+        std = stats["var"] ** 0.5
+        z = (value - stats["mean"]) / std if std > 0 else 0.0
+        stats["z"] = round(z, 2)
+        if stats["n"] >= WARMUP_POINTS and abs(z) >= Z_SCORE_THRESHOLD:
+            signals.append(f"{metric} z-score {z:+.1f}")
+        
+        # West's incremental EWMA mean and variance
+        diff = value - stats["mean"]
+        increment = EWMA_ALPHA * diff
+        stats["mean"] = stats["mean"] + increment
+        stats["var"] = (1 - EWMA_ALPHA) * (stats["var"] + diff * increment)
+        stats["n"] += 1
+    
+    zone = determine_zone(point["breadth"], mv_to_volume_ratio(point["mv"]))
+    previous_zone = stream.get("zone")
+    if previous_zone and zone != previous_zone:
+        signals.append(f"zone {previous_zone} -> {zone}")
+    stream["previous_zone"] = previous_zone
+    stream["zone"] = zone
+    stream["updated"] = point["timestamp"]
+    
+    return signals
+
+
+def emit_trigger(history: dict, point: dict, signals: list) -> dict:
+    """Record a brief trigger unless one fired within the cooldown window."""
+    stream = history["stream"]
+    last_trigger = stream.get("last_trigger")
+    now = datetime.fromisoformat(point["timestamp"].replace("Z", "+00:00"))
+    if last_trigger:
+        elapsed = now - datetime.fromisoformat(last_trigger.replace("Z", "+00:00"))
+        if elapsed < timedelta(hours=TRIGGER_COOLDOWN_HOURS):
+            print(f"  Signals in cooldown ({elapsed} since last trigger): {', '.join(signals)}")
+            return None
+    
+    trigger = {
+        "id": f"mood-{now.strftime('%Y%m%dT%H%M')}",
+        "timestamp": point["timestamp"],
+        "reasons": signals,
+        "zone_from": stream.get("previous_zone"),
+        "zone_to": stream["zone"],
+        "breadth": point["breadth"],
+        "mv": point["mv"],
+        "z_scores": {"breadth": stream["breadth"]["z"], "mv": stream["mv"]["z"]},
+        "status": "pending"
+    }
+    
+    stream["last_trigger"] = point["timestamp"]
+    history["triggers"] = (history.get("triggers", []) + [trigger])[-MAX_TRIGGERS:]
+    
+    tmp_path = MOOD_TRIGGER_FILE.with_name(f".{MOOD_TRIGGER_FILE.name}.tmp")
+    with open(tmp_path, "w") as f:
+        json.dump(trigger, f, indent=2)
+    os.replace(tmp_path, MOOD_TRIGGER_FILE)
+    
+    return trigger
+
+
+# Backfill
+# Rebuilds hourly breadth and M/V from per-coin historical ranges. The coin
+# universe is today's top 100 (there is no historical top-100 endpoint), and M/V
+# uses the summed market cap and volume of those coins as a proxy for the global
+# totals, which CoinGecko only exposes historically on paid plans.
+
+class RateLimiter:
+    """Spaces request starts across worker threads and honours 429 back-off."""
+    
+    def __init__(self, min_interval: float):
+        self.min_interval = min_interval
+        self.next_slot = 0.0
+        self.lock = threading.Lock()
+    
+    def wait(self):
+        with self.lock:
+            now = time.monotonic()
+            slot = max(now, self.next_slot)
+            self.next_slot = slot + self.min_interval
+        time.sleep(max(0.0, slot - time.monotonic()))
+    
+    def back_off(self, seconds: float):
+        with self.lock:
+            self.next_slot = max(self.next_slot, time.monotonic() + seconds)
+
+
+def fetch_json_limited(url: str, limiter: RateLimiter) -> dict:
+    """Fetch JSON through the shared rate limiter, retrying on 429 and 5xx."""
+    for attempt in range(1, BACKFILL_MAX_RETRIES + 1):
+        limiter.wait()
+        try:
+            return fetch_json(url)
+        except urllib.error.HTTPError as e:
+            if e.code != 429 and e.code < 500:
+                raise
+            retry_after = e.headers.get("Retry-After") if e.headers else None
+            delay = float(retry_after) if retry_after and retry_after.isdigit() else 15 * attempt
+            print(f"    HTTP {e.code}, backing off {delay:.0f}s (attempt {attempt})")
+            limiter.back_off(delay)
+        except urllib.error.URLError as e:
+            print(f"    Network error: {e} (attempt {attempt})")
+            limiter.back_off(5 * attempt)
+    
+    raise RuntimeError(f"Giving up after {BACKFILL_MAX_RETRIES} attempts: {url}")
+
+
+def backfill_windows(start: datetime, end: datetime) -> list:
+    """Split [start, end) into windows CoinGecko serves at hourly granularity."""
+    windows = []
+    cursor = start
+    while cursor < end:
+        window_end = min(cursor + timedelta(days=BACKFILL_WINDOW_DAYS), end)
+        windows.append((int(cursor.timestamp()), int(window_end.timestamp())))
+        cursor = window_end
+    return windows
+
+
+def fetch_coin_series(coin_id: str, window: tuple, limiter: RateLimiter) -> list:
+    """Fetch one coin's hourly [hour_ts, price, market_cap, volume] rows for a window."""
+    url = COIN_RANGE_API.format(coin_id=coin_id, start=window[0], end=window[1])
+    data = fetch_json_limited(url, limiter)
+    
+    rows = {}
+    for key, index in (("prices", 1), ("market_caps", 2), ("total_volumes", 3)):
+        for ts_ms, value in data.get(key, []):
+            hour = int(ts_ms // 1000) // 3600 * 3600
+            rows.setdefault(hour, [hour, None, None, None])[index] = value
+    
+    return [rows[hour] for hour in sorted(rows)]
+
+
+def load_checkpoint(start: datetime, end: datetime) -> dict:
+    """Load the checkpoint for this date range, or start a fresh one."""
+    if BACKFILL_CHECKPOINT_FILE.exists():
+        try:
+            with open(BACKFILL_CHECKPOINT_FILE, "r") as f:
+                checkpoint = json.load(f)
+            if checkpoint.get("range") == [start.isoformat(), end.isoformat()]:
+                return checkpoint
+            print("  Checkpoint is for a different range, starting over")
+        except (json.JSONDecodeError, IOError):
+            pass
+    
+    return {"range": [start.isoformat(), end.isoformat()], "coins": [], "series": {}}
+
+
+def save_checkpoint(checkpoint: dict):
+    """Write the checkpoint atomically so an interrupted run never corrupts it."""
+    DATA_DIR.mkdir(parents=True, exist_ok=True)
+    tmp_path = BACKFILL_CHECKPOINT_FILE.with_name(f".{BACKFILL_CHECKPOINT_FILE.name}.tmp")
+    with open(tmp_path, "w") as f:
+        json.dump(checkpoint, f, separators=(",", ":"))
+    os.replace(tmp_path, BACKFILL_CHECKPOINT_FILE)
+
+
+def build_backfill_points(series: dict, start: datetime, end: datetime) -> list:
+    """Compute hourly breadth and M/V from per-coin series."""
+    by_coin = {}
+    for key, rows in series.items():
+        coin_id = key.split("@", 1)[0]
+        table = by_coin.setdefault(coin_id, {})
+        for hour, price, market_cap, volume in rows:
+            table[hour] = (price, market_cap, volume)
+    
+    points = []
+    hour = int(start.timestamp()) // 3600 * 3600
+    while hour < end.timestamp():
+        green = counted = 0
+        cap_sum = volume_sum = 0.0
+        for table in by_coin.values():
+            row = table.get(hour)
+            if not row:
+                continue
+            price, market_cap, volume = row
+            previous = table.get(hour - 86400)
+            if price and previous and previous[0]:
+                counted += 1
+                green += price > previous[0]
+            if market_cap and volume:
+                cap_sum += market_cap
+                volume_sum += volume
+        
+        if counted and volume_sum:
+            points.append({
+                "timestamp": datetime.fromtimestamp(hour, timezone.utc).isoformat(),
+                "breadth": round(green / counted * 100, 1),
+                "mv": round(cap_sum / volume_sum, 1),
+                "market_cap": cap_sum,
+                "volume": volume_sum
+            })
+        hour += 3600
+    
+    return points
+
+
+def merge_history(history: dict, points: list) -> dict:
+    """Merge the recent end of backfilled points into the trails; captured points win on conflicts.
+
+    The trails keep their rolling limits - the full backfill goes to the archive.
+    """
+    def hour_key(point: dict) -> str:
+        return point["timestamp"].replace("Z", "+00:00")[:13]
+    
+    hourly = {hour_key(p): {"timestamp": p["timestamp"], "breadth": p["breadth"], "mv": p["mv"]} for p in points}
+    hourly.update({hour_key(p): p for p in history.get("hourly", [])})
+    history["hourly"] = [hourly[k] for k in sorted(hourly)][-MAX_HOURLY_POINTS:]
+    
+    # One daily point per UTC day, taken at the first hour available (~00:00 like the live capture)
+    daily = {}
+    for p in points:
+        daily.setdefault(p["timestamp"][:10], p)
+    daily.update({p["timestamp"][:10]: p for p in history.get("daily", [])})
+    history["daily"] = [daily[k] for k in sorted(daily)][-MAX_DAILY_POINTS:]
+    
+    if history["daily"] and not history.get("last_daily_capture"):
+        history["last_daily_capture"] = history["daily"][-1]["timestamp"]
+    
+    return history
+
+
+def backfill(start: datetime, end: datetime) -> int:
+    """Rebuild mood history for [start, end) and merge it into the history store."""
+    print(f"[{datetime.now(timezone.utc).isoformat()}] Backfilling mood history {start.date()} -> {end.date()}...")
+    
+    checkpoint = load_checkpoint(start, end)
+    limiter = RateLimiter(BACKFILL_MIN_INTERVAL)
+    
+    if not checkpoint["coins"]:
+        coins = fetch_json_limited(COINS_API, limiter)
+        checkpoint["coins"] = [c["id"] for c in coins]
+        save_checkpoint(checkpoint)
+    
+    # Fetch one extra day so the first hours have a 24h-ago price for breadth
+    windows = backfill_windows(start - timedelta(days=1), end)
+    tasks = [
+        (coin_id, window) for coin_id in checkpoint["coins"] for window in windows
+        if f"{coin_id}@{window[0]}" not in checkpoint["series"]
+    ]
+    total = len(checkpoint["coins"]) * len(windows)
+    print(f"  {total - len(tasks)}/{total} coin windows already in checkpoint")
+    
+    failures = unsaved = 0
+    try:
+        with ThreadPoolExecutor(max_workers=BACKFILL_WORKERS) as executor:
+            futures = {executor.submit(fetch_coin_series, coin_id, window, limiter): (coin_id, window) for coin_id, window in tasks}
+            for future in as_completed(futures):
+                coin_id, window = futures[future]
+                try:
+                    rows = future.result()
+                except Exception as e:
+                    failures += 1
+                    print(f"  ERROR: {coin_id} failed - {e}")
+                    continue
+                checkpoint["series"][f"{coin_id}@{window[0]}"] = rows
+                print(f"  {len(checkpoint['series'])}/{total} {coin_id} ({len(rows)} hours)")
+                unsaved += 1
+                if unsaved >= BACKFILL_CHECKPOINT_EVERY:
+                    save_checkpoint(checkpoint)
+                    unsaved = 0
+    finally:
+        # Also on Ctrl-C, so a resumed run loses nothing that was fetched
+        if unsaved:
+            save_checkpoint(checkpoint)
+    
+    if failures:
+        print(f"  {failures} coin windows failed - re-run the same command to resume")
+        return 1
+    
+    points = build_backfill_points(checkpoint["series"], start, end)
+    archive = load_archive()
+    merge_archive(archive, points, replace=False)
+    save_archive(archive)
+    print(f"  Merged {len(points)} hourly points into {MOOD_ARCHIVE_FILE} ({len(archive['timestamps'])} hours)")
+    history = merge_history(load_history(), points)
+    save_history(history)
+    print(f"  Refreshed the trails in {MOOD_HISTORY_FILE}")
+    
+    # Seed the price history used for correlation matrices
+    price_history = load_price_history()
+    by_hour = {}
+    for key, rows in checkpoint["series"].items():
+        coin_id = key.split("@", 1)[0]
+        for hour, price, _, _ in rows:
+            if price and start.timestamp() <= hour < end.timestamp():
+                by_hour.setdefault(hour, {})[coin_id] = price
+    for hour in sorted(by_hour):
+        merge_prices(price_history, hour, by_hour[hour])
+    save_price_history(price_history)
+    print(f"  Merged {len(by_hour)} hourly price rows into {PRICE_HISTORY_FILE}")
+    
+    BACKFILL_CHECKPOINT_FILE.unlink()
+    return 0
+
+
+def resume_range(days: int) -> tuple:
+    """From the newest hour the archive and price history both hold (at most days ago) to now."""
+    end = datetime.now(timezone.utc).replace(minute=0, second=0, microsecond=0)
+    start = end - timedelta(days=days)
+    newest = [store["timestamps"][-1] for store in (load_archive(), load_price_history()) if store["timestamps"]]
+    if len(newest) == 2:
+        start = max(start, datetime.fromtimestamp(min(newest), timezone.utc))
+    return start, end
+
+
 def main():
+    with metrics_run("capture-mood") as metrics:
+        result = capture()
+        metrics.outcome = "ok" if result == 0 else "failed"
+        return result
+
+
+def capture():
     print(f"[{datetime.now(timezone.utc).isoformat()}] Capturing market mood data...")
     
     try:
+        # Fetch global data and top 100 coins once for mood and snapshots
+        with span("fetch_market_data"):
+            global_data = get_json(GLOBAL_API, ttl=MARKET_TTL)
+            coins = get_json(COINS_API, ttl=MARKET_TTL)
+        
         # Calculate current mood
-        current = calculate_mood_data()
+        current = calculate_mood_data(global_data, coins)
         print(f"  Breadth: {current['breadth']}% ({current['green_coins']}/{current['total_coins']} green)")
         print(f"  M/V Ratio: {current['mv']}x")
         
@@ -129,6 +641,19 @@ def main():
         history["hourly"] = history["hourly"][-MAX_HOURLY_POINTS:]
         print(f"  Hourly points: {len(history['hourly'])}")
         
+        # Archive without a rolling limit (the whole trail, so an archive starts from it)
+        archive = load_archive()
+        merge_archive(archive, history["hourly"])
+        save_archive(archive)
+        
+        # Update streaming statistics and check for out-of-cycle triggers
+        signals = update_stream_stats(history.setdefault("stream", {}), hourly_point)
+        print(f"  Zone: {history['stream']['zone']} (z breadth {history['stream']['breadth']['z']:+.1f}, mv {history['stream']['mv']['z']:+.1f})")
+        if signals:
+            trigger = emit_trigger(history, hourly_point, signals)
+            if trigger:
+                print(f"  TRIGGER {trigger['id']}: {', '.join(signals)}")
+        
         # Check if we should add daily point
         if should_capture_daily(history):
             daily_point = {
@@ -147,9 +672,24 @@ def main():
         save_history(history)
         print(f"  Saved to {MOOD_HISTORY_FILE}")
         
+        # Publish static snapshots for the cache endpoints
+        updated = datetime.fromisoformat(current["timestamp"])
+        for name, snapshot in (("market", build_market_snapshot(global_data, coins, updated)),
+                               ("coins", build_coins_snapshot(coins, updated))):
+            # Due at the next flush: the endpoints only serve a snapshot younger than their TTL
+            enqueue(publish_snapshot(name, snapshot), f"Snapshot {name} - {updated:%H:%M} UTC", window=0)
+        print(f"  Snapshots published to {SNAPSHOT_DIR} and queued for deploy")
+        
+        # Record hourly prices for correlation and volatility matrices
+        price_history = load_price_history()
+        merge_prices(price_history, int(updated.timestamp()) // 3600 * 3600,
+                     {c["id"]: c["current_price"] for c in coins if c.get("current_price")})
+        save_price_history(price_history)
+        print(f"  Price history: {len(price_history['timestamps'])} hours x {len(price_history['coins'])} coins")
+        
         return 0
         
-    except urllib.error.URLError as e:
+    except NETWORK_ERRORS as e:
         print(f"  ERROR: Network error - {e}")
         return 1
     except Exception as e:
@@ -158,4 +698,18 @@ def main():
 
 
 if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "backfill":
+        if len(sys.argv) < 4:
+            print("Usage: python capture_mood.py backfill <start YYYY-MM-DD> <end YYYY-MM-DD>")
+            print("       python capture_mood.py backfill --resume <days>")
+            sys.exit(1)
+        if sys.argv[2] == "--resume":
+            start, end = resume_range(int(sys.argv[3]))
+            if end - start < timedelta(hours=1):
+                print(f"  Archive and price history are up to date ({start.isoformat()})")
+                sys.exit(0)
+        else:
+            start = datetime.fromisoformat(sys.argv[2]).replace(tzinfo=timezone.utc)
+            end = datetime.fromisoformat(sys.argv[3]).replace(tzinfo=timezone.utc)
+        sys.exit(backfill(start, end))
     sys.exit(main())
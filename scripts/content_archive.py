@@ -0,0 +1,288 @@
+#!/usr/bin/env python3
+"""
+Content Archive & Search Index - The Litmus
+Every generated brief and magazine is also written to a dated archive path,
+and a prebuilt inverted index makes the archive searchable in the browser.
+
+Archive:  content/archive/YYYY/MM/DD/<key>.json.zst   (e.g. emea-morning.json.zst,
+          zstd with a trained dictionary - see archive_store.py), served
+          decompressed by api/archive.py
+
+Index (content/search/), updated incrementally per new document:
+- meta.json          document ids by archive path, shard scheme, split shards
+- docs/NNNN.json     document table in blocks of DOC_BLOCK ids:
+                     {id: {path, key, date, headline, url, shards}}
+                     (path is the stored .zst, url its /api/archive address)
+- terms/NNNN/<x>.json
+                     postings of the same block of documents for every term
+                     starting with <x>: {term: [[doc id, term frequency], ...]}
+Index files are plain minified JSON - the host compresses them on the wire.
+
+Shards stay bounded: each holds one block of documents (so a term's postings
+never outgrow DOC_BLOCK entries), is named by the first SHARD_PREFIX
+characters of its terms, and once it passes MAX_SHARD_BYTES moves its longer
+terms into one-character-longer shards (<x>a, <x>b, ...), recorded in
+meta["splits"][block]. Adding a document only rewrites the shards of the
+newest block that its own terms fall in.
+
+A browser search lowercases and tokenises the query the same way; for each
+block and query term it follows meta["splits"] from the term's first
+SHARD_PREFIX characters to the longest split prefix, loads that one shard,
+intersects the postings and fetches the matching doc blocks.
+
+Run:
+  python scripts/content_archive.py archive        Archive current content and index it
+  python scripts/content_archive.py rebuild        Rebuild the index from the archive
+  python scripts/content_archive.py search <words> Query the index locally
+"""
+
+import json
+import re
+import shutil
+import sys
+from collections import Counter
+from datetime import datetime, timezone
+from pathlib import Path
+
+from archive_store import archive_url, base_path, iter_archive, read_archive, write_archive
+from content_manifest import KNOWN_ARTEFACTS, artefact_key, headline_of
+from content_writer import atomic_write, encode_json
+
+# Paths
+SCRIPT_DIR = Path(__file__).parent
+REPO_ROOT = SCRIPT_DIR.parent
+CONTENT_DIR = REPO_ROOT / "content"
+ARCHIVE_DIR = CONTENT_DIR / "archive"
+SEARCH_DIR = CONTENT_DIR / "search"
+
+INDEX_VERSION = 3
+DOC_BLOCK = 500          # Documents per docs/NNNN.json block and terms/NNNN/ directory
+SHARD_PREFIX = 2         # Terms are sharded by their first N characters...
+MAX_SHARD_BYTES = 32 * 1024  # ...and a shard past this is split one character further
+MIN_TERM_LENGTH = 2
+
+# Archive names flatten the key's "/" to "-"; these directories undo it
+KEY_DIRS = ("apac", "emea", "americas", "weekend")
+
+# Fields that are metadata, not text worth searching
+SKIP_KEYS = {
+    "image_url", "image_keywords", "generated_at", "region", "type",
+    "audio_url", "audio_variants", "audio_duration", "audio_peaks", "audio_chapters",
+}
+
+STOPWORDS = set("""
+a an and are as at be but by for from has have in into is it its of on or that
+the their this to was were will with not no than then there these they which
+while who what when where why how can could would should may might our we you
+""".split())
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+
+def tokenise(text: str) -> list:
+    """Lowercase word tokens, minus stopwords and single characters."""
+    return [
+        token for token in TOKEN_PATTERN.findall(text.lower())
+        if len(token) >= MIN_TERM_LENGTH and token not in STOPWORDS
+    ]
+
+
+def document_text(payload, key: str = None) -> str:
+    """All searchable strings in a payload, depth first."""
+    if key in SKIP_KEYS:
+        return ""
+    if isinstance(payload, str):
+        return "" if payload.startswith("http") else payload
+    if isinstance(payload, dict):
+        return "\n".join(document_text(value, k) for k, value in payload.items())
+    if isinstance(payload, list):
+        return "\n".join(document_text(value) for value in payload)
+    return ""
+
+
+def key_from_archive_name(stem: str) -> str:
+    """'emea-morning' -> 'emea/morning'; 'week-ahead' stays as it is."""
+    head, _, tail = stem.partition("-")
+    return f"{head}/{tail}" if head in KEY_DIRS and tail else stem
+
+
+def archive_path(key: str, payload: dict) -> Path:
+    """content/archive/YYYY/MM/DD/<key with / as ->.json, dated by generated_at."""
+    date = (payload.get("generated_at") or datetime.now(timezone.utc).isoformat())[:10]
+    year, month, day = date.split("-")
+    return ARCHIVE_DIR / year / month / day / f"{key.replace('/', '-')}.json"
+
+
+def load_json(path: Path, default):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return default
+
+
+class SearchIndex:
+    """Loads only the shards and doc blocks a change touches, writes them back on save()."""
+
+    def __init__(self):
+        self.meta = load_json(SEARCH_DIR / "meta.json", None)
+        if not self.meta or self.meta.get("version") != INDEX_VERSION:
+            self.meta = {
+                "version": INDEX_VERSION,
+                "shard_prefix": SHARD_PREFIX,
+                "max_shard_bytes": MAX_SHARD_BYTES,
+                "doc_block": DOC_BLOCK,
+                "next_id": 0,
+                "documents": 0,
+                "ids": {},
+                "splits": {},
+            }
+        self.shards = {}
+        self.blocks = {}
+
+    def shard_of(self, number: int, term: str) -> str:
+        """The shard a term is in for one block: its prefix, lengthened past every split."""
+        splits = self.meta["splits"].get(str(number), [])
+        name = term[:SHARD_PREFIX]
+        while name in splits and len(name) < len(term):
+            name = term[:len(name) + 1]
+        return name
+
+    def shard(self, number: int, name: str) -> dict:
+        if (number, name) not in self.shards:
+            self.shards[number, name] = load_json(SEARCH_DIR / "terms" / f"{number:04d}" / f"{name}.json", {})
+        return self.shards[number, name]
+
+    def block(self, doc_id: int) -> dict:
+        number = doc_id // DOC_BLOCK
+        if number not in self.blocks:
+            self.blocks[number] = load_json(SEARCH_DIR / "docs" / f"{number:04d}.json", {})
+        return self.blocks[number]
+
+    def remove(self, doc_id: int):
+        """Drop a document's postings (only from its block's shards its terms were in)."""
+        entry = self.block(doc_id).pop(str(doc_id), None)
+        if not entry:
+            return
+        number = doc_id // DOC_BLOCK
+        # A shard split since the document was added lives on in shards named after it
+        names = {name for n, name in self.shards if n == number}
+        names.update(path.stem for path in (SEARCH_DIR / "terms" / f"{number:04d}").glob("*.json"))
+        for name in sorted(n for n in names if n.startswith(tuple(entry["shards"]))):
+            shard = self.shard(number, name)
+            for term in [t for t, postings in shard.items() if any(p[0] == doc_id for p in postings)]:
+                shard[term] = [p for p in shard[term] if p[0] != doc_id]
+                if not shard[term]:
+                    del shard[term]
+        self.meta["documents"] -= 1
+
+    def add(self, path: str, key: str, payload: dict):
+        """Index one archived document, replacing any earlier version at the same path."""
+        doc_id = self.meta["ids"].get(path)
+        if doc_id is None:
+            doc_id = self.meta["next_id"]
+            self.meta["next_id"] += 1
+            self.meta["ids"][path] = doc_id
+        else:
+            self.remove(doc_id)
+
+        number = doc_id // DOC_BLOCK
+        counts = Counter(tokenise(document_text(payload)))
+        shards = set()
+        for term, count in counts.items():
+            name = self.shard_of(number, term)
+            self.shard(number, name).setdefault(term, []).append([doc_id, count])
+            shards.add(name)
+
+        self.block(doc_id)[str(doc_id)] = {
+            "path": path,
+            "key": key,
+            "date": path.split("/archive/")[1][:10].replace("/", "-"),
+            "headline": headline_of(payload),
+            "url": archive_url(REPO_ROOT / path),
+            "shards": sorted(shards),
+        }
+        self.meta["documents"] += 1
+
+    def split(self, number: int, name: str):
+        """Move a shard's terms longer than its name into shards one character longer."""
+        shard = self.shards[number, name]
+        splits = self.meta["splits"].setdefault(str(number), [])
+        splits.append(name)
+        splits.sort()
+        for term in [t for t in shard if len(t) > len(name)]:
+            self.shard(number, term[:len(name) + 1])[term] = shard.pop(term)
+
+    def save(self):
+        pending = sorted(self.shards)
+        while pending:
+            number, name = pending.pop()
+            body = encode_json(dict(sorted(self.shards[number, name].items())))
+            if len(body) > MAX_SHARD_BYTES and any(len(term) > len(name) for term in self.shards[number, name]):
+                self.split(number, name)
+                pending.extend(k for k in self.shards if k[0] == number and k[1][:-1] == name)
+                body = encode_json(dict(sorted(self.shards[number, name].items())))
+            atomic_write(SEARCH_DIR / "terms" / f"{number:04d}" / f"{name}.json", body)
+        for number, block in self.blocks.items():
+            atomic_write(SEARCH_DIR / "docs" / f"{number:04d}.json", encode_json(block))
+        self.meta["updated_at"] = datetime.now(timezone.utc).isoformat()
+        atomic_write(SEARCH_DIR / "meta.json", encode_json(self.meta))
+
+    def search(self, query: str) -> list:
+        """Documents containing every query term, ranked by summed term frequency."""
+        blocks = range((self.meta["next_id"] + DOC_BLOCK - 1) // DOC_BLOCK)
+        scores = None
+        for term in set(tokenise(query)):
+            postings = {
+                doc_id: tf
+                for number in blocks
+                for doc_id, tf in self.shard(number, self.shard_of(number, term)).get(term, [])
+            }
+            scores = postings if scores is None else {
+                doc_id: score + postings[doc_id] for doc_id, score in scores.items() if doc_id in postings
+            }
+        ranked = sorted((scores or {}).items(), key=lambda item: (-item[1], -item[0]))
+        return [self.block(doc_id)[str(doc_id)] for doc_id, _ in ranked]
+
+
+def archive_document(path, payload: dict) -> Path:
+    """Write a dated archive copy of a published artefact and index it."""
+    key = artefact_key(path)
+    output_file = write_archive(archive_path(key, payload), payload)
+
+    index = SearchIndex()
+    index.add(output_file.relative_to(REPO_ROOT).as_posix(), key, payload)
+    index.save()
+    return output_file
+
+
+def main():
+    command = sys.argv[1] if len(sys.argv) > 1 else ""
+
+    if command == "archive":
+        for name in KNOWN_ARTEFACTS:
+            path = CONTENT_DIR / name
+            if path.exists():
+                print(f"  {archive_document(path, load_json(path, {})).relative_to(REPO_ROOT)}")
+        return 0
+
+    if command == "rebuild":
+        shutil.rmtree(SEARCH_DIR, ignore_errors=True)
+        index = SearchIndex()
+        for path in iter_archive():
+            index.add(path.relative_to(REPO_ROOT).as_posix(), key_from_archive_name(base_path(path).name), read_archive(path))
+        index.save()
+        print(f"  Indexed {index.meta['documents']} documents into {len(index.shards)} shards")
+        return 0
+
+    if command == "search" and len(sys.argv) > 2:
+        for doc in SearchIndex().search(" ".join(sys.argv[2:])):
+            print(f"  {doc['date']}  {doc['key']:<18} {doc['headline']}")
+        return 0
+
+    print(__doc__)
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
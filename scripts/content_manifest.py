@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""
+Content Manifest - The Litmus
+Keeps content/manifest.json in step with every published artefact, so the
+site can fetch one small file and only download what changed.
+
+Each entry records the artefact's path, content hash, size, generated_at and
+headline, plus an immutable copy named by hash (content/hashed/<key>.<hash>.json)
+that can be cached forever. The last few versions per artefact keep their
+hashed copies (listed newest first in "versions"), so a client holding a
+slightly older manifest never hits a 404.
+
+"patches" maps each older version to an RFC 6902 patch (content_patch.py)
+at content/hashed/patches/<key>.<from>-<to>.json: a reader holding version
+N applies that small delta instead of refetching the whole document.
+
+publish_content(path, payload) writes the artefact (via content_writer.py),
+its hashed copy and the manifest entry in one call. Generators sharing a
+process (scheduler.py) hold PUBLISH_LOCK around their whole save step, so
+the manifest, archive index and publish queue are never read-modify-written
+by two jobs at once.
+
+Run: python scripts/content_manifest.py    Rebuild the manifest from content/
+"""
+
+import hashlib
+import json
+import sys
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+
+from content_patch import make_patch
+from content_writer import encode_json, write_json
+
+# Paths
+SCRIPT_DIR = Path(__file__).parent
+REPO_ROOT = SCRIPT_DIR.parent
+CONTENT_DIR = REPO_ROOT / "content"
+MANIFEST_FILE = CONTENT_DIR / "manifest.json"
+HASHED_DIR = CONTENT_DIR / "hashed"
+PATCH_DIR = HASHED_DIR / "patches"
+
+MANIFEST_VERSION = 1
+HASH_LENGTH = 16        # Hex characters of sha256 in hashed names
+KEEP_HASHED = 3         # Hashed copies kept per artefact
+
+PUBLISH_LOCK = threading.RLock()
+
+# Artefacts rebuilt by the CLI (relative to content/)
+KNOWN_ARTEFACTS = [
+    f"{region}/{brief_type}.json"
+    for region in ("apac", "emea", "americas")
+    for brief_type in ("morning", "evening")
+] + ["week-ahead.json", "weekend/magazine.json"]
+
+
+def artefact_key(path: Path) -> str:
+    """Manifest key: path under content/ without .json, e.g. 'emea/morning'."""
+    relative = Path(path).resolve().relative_to(CONTENT_DIR.resolve())
+    return relative.with_suffix("").as_posix()
+
+
+def headline_of(payload: dict) -> str:
+    """Briefs carry a headline; the magazine's lives on its hero."""
+    return payload.get("headline") or payload.get("hero", {}).get("headline", "")
+
+
+def load_manifest() -> dict:
+    try:
+        with open(MANIFEST_FILE, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+        if manifest.get("version") == MANIFEST_VERSION:
+            return manifest
+    except (FileNotFoundError, json.JSONDecodeError):
+        pass
+    return {"version": MANIFEST_VERSION, "updated_at": None, "artefacts": {}}
+
+
+def remove_served(path: Path):
+    """Delete a served JSON file."""
+    path.unlink(missing_ok=True)
+
+
+def prune_hashed(key: str, keep: list):
+    """Delete hashed copies of one artefact whose hash is not in keep."""
+    prefix = key.replace("/", "-")
+    for path in HASHED_DIR.glob(f"{prefix}.*.json"):
+        digest = path.name[len(prefix) + 1:-len(".json")]
+        if "." in digest or digest in keep:
+            continue
+        remove_served(path)
+
+
+def write_hashed(name: str, payload) -> tuple:
+    """Write the immutable copy content/hashed/<name>.<hash>.json; returns (hash, path)."""
+    digest = hashlib.sha256(encode_json(payload)).hexdigest()[:HASH_LENGTH]
+    hashed_path = HASHED_DIR / f"{name}.{digest}.json"
+    if not hashed_path.exists():
+        write_json(hashed_path, payload, pretty=False)
+    return digest, hashed_path
+
+
+def load_hashed(name: str, digest: str):
+    """A previous version from its immutable copy, or None once pruned."""
+    try:
+        with open(HASHED_DIR / f"{name}.{digest}.json", "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+
+
+def write_patches(key: str, payload: dict, versions: list) -> dict:
+    """RFC 6902 patches from every older live version to the newest.
+
+    Returns {from hash: patch path}. A patch that is not smaller than the
+    document itself is not published - a client on that version refetches.
+    """
+    name = key.replace("/", "-")
+    size = len(encode_json(payload))
+    patches = {}
+    for digest in versions[1:]:
+        patch_path = PATCH_DIR / f"{name}.{digest}-{versions[0]}.json"
+        if not patch_path.exists():
+            previous = load_hashed(name, digest)
+            if previous is None:
+                continue
+            patch = make_patch(previous, payload)
+            if len(encode_json(patch)) >= size:
+                continue
+            write_json(patch_path, patch, pretty=False)
+        patches[digest] = patch_path.relative_to(REPO_ROOT).as_posix()
+
+    # Patches to an older newest version are never requested again
+    live = set(patches.values())
+    for path in PATCH_DIR.glob(f"{name}.*.json"):
+        if "." not in path.name[len(name) + 1:-len(".json")] and path.relative_to(REPO_ROOT).as_posix() not in live:
+            remove_served(path)
+    return patches
+
+
+def manifest_entry(path: Path, payload: dict, previous: dict = None) -> dict:
+    """Hash the served bytes, write the immutable copy and describe the artefact.
+
+    versions lists the hashes with a live immutable copy, newest first - the
+    version chain - and patches maps each older one to a JSON Patch that turns
+    it into the newest. An unchanged re-run hashes the same, so the entry (and
+    the empty delta it implies) stays as it was.
+    """
+    key = artefact_key(path)
+    digest, hashed_path = write_hashed(key.replace("/", "-"), payload)
+
+    versions = [digest] + [h for h in (previous or {}).get("versions", []) if h != digest]
+    versions = versions[:KEEP_HASHED]
+    prune_hashed(key, versions)
+
+    return {
+        "path": Path(path).resolve().relative_to(REPO_ROOT.resolve()).as_posix(),
+        "hash": digest,
+        "size": hashed_path.stat().st_size,
+        "generated_at": payload.get("generated_at"),
+        "headline": headline_of(payload),
+        "immutable": hashed_path.relative_to(REPO_ROOT).as_posix(),
+        "versions": versions,
+        "patches": write_patches(key, payload, versions),
+    }
+
+
+def update_manifest(entries: dict, manifest: dict = None):
+    """Merge {key: entry} into content/manifest.json."""
+    manifest = manifest or load_manifest()
+    manifest["artefacts"].update(entries)
+    manifest["artefacts"] = dict(sorted(manifest["artefacts"].items()))
+    manifest["updated_at"] = datetime.now(timezone.utc).isoformat()
+    write_json(MANIFEST_FILE, manifest, pretty=False)
+
+
+def publish_content(path, payload: dict) -> Path:
+    """Write an artefact, its hashed copy and its manifest entry."""
+    path = Path(path)
+    write_json(path, payload)
+
+    manifest = load_manifest()
+    key = artefact_key(path)
+    update_manifest({key: manifest_entry(path, payload, manifest["artefacts"].get(key))}, manifest)
+    return path
+
+
+def main():
+    manifest = load_manifest()
+    entries = {}
+    for name in KNOWN_ARTEFACTS:
+        path = CONTENT_DIR / name
+        if not path.exists():
+            continue
+        with open(path, "r", encoding="utf-8") as f:
+            payload = json.load(f)
+        key = artefact_key(path)
+        entries[key] = manifest_entry(path, payload, manifest["artefacts"].get(key))
+        print(f"  {entries[key]['hash']}  {name}")
+
+    update_manifest(entries, manifest)
+    print(f"  {len(entries)} artefacts -> {MANIFEST_FILE}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Content Patch - The Litmus
+RFC 6902 JSON Patch between two versions of a published document, so a
+reader polling for updates can apply a small delta to the version it holds
+instead of refetching the whole brief or magazine.
+
+make_patch(old, new) walks both documents:
+- objects are compared key by key (add / remove / replace per member)
+- arrays of equal length are compared element by element; any other array
+  change is a single replace of the whole array
+- scalars differing only in type (1, 1.0, true) are replaced
+- identical documents give an empty patch []
+
+content_manifest.py writes the patches (content/hashed/patches/) and lists
+them per artefact in the manifest.
+
+Run: python scripts/content_patch.py <old.json> <new.json>    Print the patch
+"""
+
+import copy
+import json
+import sys
+
+
+def pointer(path: list) -> str:
+    """JSON Pointer (RFC 6901) for a list of keys / indices."""
+    return "".join("/" + str(part).replace("~", "~0").replace("/", "~1") for part in path)
+
+
+def make_patch(old, new, path: list = None) -> list:
+    """Operations that turn old into new."""
+    path = path or []
+    # Containers are walked below; scalars must match in type too (1 == True == 1.0)
+    if type(old) is type(new) and not isinstance(old, (dict, list)) and old == new:
+        return []
+
+    if isinstance(old, dict) and isinstance(new, dict):
+        operations = []
+        for key in old:
+            if key not in new:
+                operations.append({"op": "remove", "path": pointer(path + [key])})
+        for key, value in new.items():
+            if key not in old:
+                operations.append({"op": "add", "path": pointer(path + [key]), "value": value})
+            else:
+                operations.extend(make_patch(old[key], value, path + [key]))
+        return operations
+
+    if isinstance(old, list) and isinstance(new, list) and len(old) == len(new):
+        operations = []
+        for index, (before, after) in enumerate(zip(old, new)):
+            operations.extend(make_patch(before, after, path + [index]))
+        return operations
+
+    return [{"op": "replace", "path": pointer(path), "value": new}]
+
+
+def apply_patch(document, patch: list):
+    """Apply add / remove / replace operations to a copy of document."""
+    document = copy.deepcopy(document)
+    for operation in patch:
+        parts = [part.replace("~1", "/").replace("~0", "~") for part in operation["path"].split("/")[1:]]
+        if not parts:
+            document = copy.deepcopy(operation["value"])
+            continue
+
+        parent = document
+        for part in parts[:-1]:
+            parent = parent[int(part)] if isinstance(parent, list) else parent[part]
+        last = parts[-1]
+        if isinstance(parent, list):
+            last = len(parent) if last == "-" else int(last)
+
+        if operation["op"] == "remove":
+            del parent[last]
+        elif operation["op"] == "add" and isinstance(parent, list):
+            parent.insert(last, copy.deepcopy(operation["value"]))
+        elif operation["op"] in ("add", "replace"):
+            parent[last] = copy.deepcopy(operation["value"])
+        else:
+            raise ValueError(f"Unsupported patch operation: {operation['op']}")
+    return document
+
+
+def main():
+    if len(sys.argv) != 3:
+        print(__doc__)
+        return 1
+    with open(sys.argv[1], "r", encoding="utf-8") as f:
+        old = json.load(f)
+    with open(sys.argv[2], "r", encoding="utf-8") as f:
+        new = json.load(f)
+    print(json.dumps(make_patch(old, new), indent=2, ensure_ascii=False))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Content Split - The Litmus
+Hot/cold split of a brief, so first paint downloads a few KB and the rest of
+the brief loads on scroll.
+
+For content/<region>/<type>.json the full brief is still published as it is,
+plus:
+- <type>.hot.json                            headline, image, metadata, audio
+                                             and the lead section, with a
+                                             "rest" pointer to the cold part
+- content/hashed/<key>.rest.<hash>.json      every other section and
+                                             etf_flows - immutable, named by
+                                             hash, cached forever
+
+The hot document is a manifest artefact of its own (key "<key>.hot"), so it
+keeps hashed versions like every other artefact. Cold copies are kept while
+any of those versions still points at them.
+
+Run: python scripts/content_split.py    Split every brief in content/
+"""
+
+import json
+import sys
+from pathlib import Path
+
+from content_manifest import (
+    CONTENT_DIR, HASHED_DIR, KNOWN_ARTEFACTS, REPO_ROOT,
+    artefact_key, load_manifest, prune_hashed, publish_content, write_hashed,
+)
+
+# Root fields that belong to the cold document
+COLD_FIELDS = ("etf_flows",)
+
+
+def lead_section(sections: dict) -> str:
+    """Key of the first section (sections keep the order the prompt asked for)."""
+    return next((key for key in sections if not key.endswith("_title")), None)
+
+
+def split_brief(brief: dict) -> tuple:
+    """Return (hot, cold): the lead section and metadata, and everything else."""
+    sections = brief.get("sections", {})
+    lead = lead_section(sections)
+    hot_keys = {lead, f"{lead}_title"}
+
+    hot = {key: value for key, value in brief.items() if key != "sections" and key not in COLD_FIELDS}
+    hot["sections"] = {key: value for key, value in sections.items() if key in hot_keys}
+
+    cold = {"sections": {key: value for key, value in sections.items() if key not in hot_keys}}
+    for key in COLD_FIELDS:
+        if key in brief:
+            cold[key] = brief[key]
+    return hot, cold
+
+
+def hot_path(path: Path) -> Path:
+    """content/emea/morning.json -> content/emea/morning.hot.json"""
+    path = Path(path)
+    return path.with_name(f"{path.stem}.hot.json")
+
+
+def live_rest_hashes(hot_key: str) -> set:
+    """Cold hashes referenced by every hot version that still has a hashed copy."""
+    entry = load_manifest()["artefacts"].get(hot_key, {})
+    hashes = set()
+    for digest in entry.get("versions", []):
+        try:
+            with open(HASHED_DIR / f"{hot_key.replace('/', '-')}.{digest}.json", "r", encoding="utf-8") as f:
+                hashes.add(json.load(f)["rest"]["hash"])
+        except (FileNotFoundError, json.JSONDecodeError, KeyError):
+            continue
+    return hashes
+
+
+def publish_split(path, brief: dict) -> Path:
+    """Publish the hot document beside path and its cold part by hash."""
+    key = artefact_key(path)
+    hot, cold = split_brief(brief)
+
+    digest, cold_path = write_hashed(f"{key.replace('/', '-')}.rest", cold)
+    hot["rest"] = {
+        "hash": digest,
+        "path": cold_path.relative_to(REPO_ROOT).as_posix(),
+        "size": cold_path.stat().st_size,
+        "sections": [name for name in cold["sections"] if not name.endswith("_title")],
+    }
+
+    output_file = publish_content(hot_path(path), hot)
+    prune_hashed(f"{key}.rest", live_rest_hashes(artefact_key(output_file)) | {digest})
+    return output_file
+
+
+def main():
+    for name in KNOWN_ARTEFACTS:
+        path = CONTENT_DIR / name
+        if not path.exists() or name.startswith("weekend/"):
+            continue
+        with open(path, "r", encoding="utf-8") as f:
+            brief = json.load(f)
+        output_file = publish_split(path, brief)
+        print(f"  {output_file.relative_to(REPO_ROOT)}  {output_file.stat().st_size} bytes (full {path.stat().st_size})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
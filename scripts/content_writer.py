@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Content Writer - The Litmus
+One writer for every file the site serves (briefs, magazine, snapshots and
+the prerendered edition pages).
+
+write_json(path, payload) produces:
+- <name>.json         minified JSON - what the site serves
+- <name>.pretty.json  indented copy for readable diffs, when CONTENT_PRETTY=true
+
+write_served(path, body) writes any other served bytes (HTML pages, feeds).
+No .gz/.br copies are kept: the host compresses every response on the wire,
+and precompressed siblings it never serves would only double each commit.
+
+Each file is written to a temp name in the same directory and renamed over
+the old one, so a crash mid-write can never leave a truncated file to serve.
+"""
+
+import json
+import os
+from pathlib import Path
+
+from run_metrics import add
+
+CONTENT_PRETTY = os.environ.get("CONTENT_PRETTY", "false").lower() == "true"
+
+
+def atomic_write(path: Path, data: bytes):
+    """Write bytes to a temp file beside path, then rename it into place."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f".{path.name}.tmp")
+    try:
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    finally:
+        if tmp_path.exists():
+            tmp_path.unlink()
+
+
+def encode_json(payload) -> bytes:
+    """Minified UTF-8 JSON bytes."""
+    return json.dumps(payload, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+def write_served(path: Path, body: bytes) -> Path:
+    """Write a served file atomically and count its bytes."""
+    path = Path(path)
+    atomic_write(path, body)
+    add(bytes_written=len(body))
+    return path
+
+
+def write_json(path: Path, payload, pretty: bool = None) -> Path:
+    """Write payload as minified JSON, plus an optional pretty copy.
+
+    pretty: override CONTENT_PRETTY for this file (snapshots never need it).
+    Returns the path of the served file.
+    """
+    path = Path(path)
+
+    if CONTENT_PRETTY if pretty is None else pretty:
+        pretty_body = json.dumps(payload, indent=2, ensure_ascii=False).encode("utf-8") + b"\n"
+        atomic_write(path.with_name(f"{path.stem}.pretty.json"), pretty_body)
+
+    return write_served(path, encode_json(payload))
@@ -0,0 +1,261 @@
+#!/usr/bin/env python3
+"""
+Correlation & Volatility Matrices - The Litmus
+Builds rolling-window return correlation and volatility matrices for the top-N
+coins from the local hourly price history (data/price-history.json, written by
+capture_mood.py), so prompts and the frontend never compute them per request.
+
+Outputs (data/correlation/):
+- matrices.f32  - little-endian float32: per window, an N x N correlation
+                  matrix (row-major) followed by N annualised volatilities
+- summary.json  - coins, layout offsets and the headline numbers
+
+Correlations are computed pairwise over the hours both coins have prices for
+(no gap filling), and only coins with MIN_COVERAGE of every window - and of
+each trail window - are included.
+
+Run: python scripts/correlation_matrix.py [top_n]
+
+Scheduled daily by scheduler.py (correlation-matrix) and .github/workflows/mood-analytics.yml.
+
+Requires: numpy
+"""
+
+import json
+import os
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+
+import numpy as np
+
+# Paths
+SCRIPT_DIR = Path(__file__).parent
+DATA_DIR = SCRIPT_DIR.parent / "data"
+PRICE_HISTORY_FILE = DATA_DIR / "price-history.json"
+COINS_SNAPSHOT_FILE = DATA_DIR / "snapshots" / "v1" / "coins.json"
+OUTPUT_DIR = DATA_DIR / "correlation"
+
+# Configuration
+DEFAULT_TOP_N = 20
+WINDOWS = {"7d": 7 * 24, "30d": 30 * 24}   # hourly returns per window
+TRAIL_WINDOW = "7d"                         # window used for the rolling correlation trail
+TRAIL_STEP = 24                             # one trail point per day
+HOURS_PER_YEAR = 365 * 24
+MIN_COVERAGE = 0.9                          # share of window a coin must have returns for
+MIN_OVERLAP = 24                            # hours two coins must share for a correlation
+TOP_PAIRS = 5
+
+# Average pairwise correlation -> regime label
+CORRELATION_REGIMES = [
+    (0.7, "lockstep", "Coins are moving together - macro and BTC beta dominate."),
+    (0.45, "coupled", "Correlations are elevated but some coins trade on their own stories."),
+    (-1.0, "dispersed", "Low correlation - idiosyncratic drivers and rotation dominate."),
+]
+
+
+def load_price_matrix() -> tuple:
+    """Return (coin ids, epoch-hour timestamps, prices T x N with NaN gaps)."""
+    with open(PRICE_HISTORY_FILE, "r") as f:
+        history = json.load(f)
+
+    coins = history["coins"]
+    prices = np.full((len(history["rows"]), len(coins)), np.nan)
+    for i, row in enumerate(history["rows"]):
+        prices[i, :len(row)] = [np.nan if p is None else p for p in row]
+
+    return coins, np.array(history["timestamps"], dtype=np.int64), prices
+
+
+def rank_coins(coins: list) -> list:
+    """Column indices ordered by current market-cap rank (history order as fallback)."""
+    try:
+        with open(COINS_SNAPSHOT_FILE, "r") as f:
+            ranks = {c["id"]: c.get("rank") or 10**6 for c in json.load(f)["coins"]}
+    except (FileNotFoundError, json.JSONDecodeError, KeyError):
+        ranks = {}
+
+    return sorted(range(len(coins)), key=lambda i: (ranks.get(coins[i], 10**6), i))
+
+
+def hourly_returns(timestamps: np.ndarray, prices: np.ndarray) -> np.ndarray:
+    """Log returns on a regular hourly grid; missing hours become NaN rows."""
+    grid = np.arange(timestamps[0], timestamps[-1] + 3600, 3600)
+    regular = np.full((len(grid), prices.shape[1]), np.nan)
+    regular[(timestamps - timestamps[0]) // 3600] = prices
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.diff(np.log(regular), axis=0)
+
+
+def pairwise_correlation(returns: np.ndarray) -> np.ndarray:
+    """Correlation of every pair over the hours both have returns; (..., W, N) -> (..., N, N).
+
+    Pairs sharing fewer than MIN_OVERLAP hours, or flat over them, are NaN.
+    """
+    present = np.isfinite(returns).astype(np.float64)
+    x = np.where(present > 0, returns, 0.0)
+    xt, present_t = np.swapaxes(x, -1, -2), np.swapaxes(present, -1, -2)
+
+    n = present_t @ present                 # shared hours
+    sx = xt @ present                       # sum of x_i over the hours j is present
+    sxx = (xt * xt) @ present
+    sxy = xt @ x
+    sy, syy = np.swapaxes(sx, -1, -2), np.swapaxes(sxx, -1, -2)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        covariance = sxy - sx * sy / n
+        variance = (sxx - sx * sx / n) * (syy - sy * sy / n)
+        correlation = covariance / np.sqrt(variance)
+    correlation[(n < MIN_OVERLAP) | ~(variance > 0)] = np.nan
+    return np.clip(correlation, -1.0, 1.0)
+
+
+def coverage(returns: np.ndarray) -> np.ndarray:
+    """Share of hours each coin has a return for; (..., W, N) -> (..., N)."""
+    return np.isfinite(returns).mean(axis=-2)
+
+
+def correlation_and_volatility(returns: np.ndarray) -> tuple:
+    """Pairwise correlation matrix and annualised volatility for a W x N window."""
+    correlation = pairwise_correlation(returns)
+    np.fill_diagonal(correlation, 1.0)
+    with np.errstate(invalid="ignore"):
+        volatility = np.nanstd(returns, axis=0, ddof=1) * np.sqrt(HOURS_PER_YEAR)
+    return np.nan_to_num(correlation), np.nan_to_num(volatility)
+
+
+def rolling_average_correlation(returns: np.ndarray, window: int) -> list:
+    """Average pairwise correlation for each daily-stepped trailing window.
+
+    Each point averages only the pairs of coins with MIN_COVERAGE of that
+    window; None where fewer than two coins qualify.
+    """
+    if len(returns) < window:
+        return []
+
+    windows = np.lib.stride_tricks.sliding_window_view(returns, window, axis=0)
+    windows = np.swapaxes(windows[::-1][::TRAIL_STEP][::-1], 1, 2)   # K x W x N, ending on the latest hour
+    correlation = pairwise_correlation(windows)
+    covered = coverage(windows) >= MIN_COVERAGE
+
+    n = correlation.shape[1]
+    upper = np.triu(np.ones((n, n), dtype=bool), k=1)
+    valid = covered[:, :, None] & covered[:, None, :] & upper & np.isfinite(correlation)
+    counts = valid.sum(axis=(1, 2))
+    totals = np.where(valid, correlation, 0.0).sum(axis=(1, 2))
+    return [round(float(total / count), 3) if count else None for total, count in zip(totals, counts)]
+
+
+def summarise_window(coins: list, correlation: np.ndarray, volatility: np.ndarray) -> dict:
+    """Headline numbers for prompts: average correlation, regime, extreme pairs."""
+    n = len(coins)
+    upper = np.triu_indices(n, k=1)
+    pair_values = correlation[upper]
+    average = float(pair_values.mean()) if len(pair_values) else 0.0
+    order = np.argsort(pair_values)
+
+    def pairs(indices):
+        return [
+            {"a": coins[upper[0][i]], "b": coins[upper[1][i]], "correlation": round(float(pair_values[i]), 3)}
+            for i in indices
+        ]
+
+    regime = next(r for r in CORRELATION_REGIMES if average >= r[0])
+    btc = coins.index("bitcoin") if "bitcoin" in coins else None
+
+    return {
+        "average_correlation": round(average, 3),
+        "regime": regime[1],
+        "regime_description": regime[2],
+        "most_correlated": pairs(order[::-1][:TOP_PAIRS]),
+        "least_correlated": pairs(order[:TOP_PAIRS]),
+        "btc_correlation": {coins[i]: round(float(correlation[btc, i]), 3) for i in range(n)} if btc is not None else {},
+        "volatility": {coins[i]: round(float(volatility[i]), 3) for i in range(n)},
+    }
+
+
+def build_matrices(top_n: int) -> tuple:
+    """Compute every window; return (float32 blob, summary dict)."""
+    all_coins, timestamps, prices = load_price_matrix()
+    returns_all = hourly_returns(timestamps, prices)
+    ranked = rank_coins(all_coins)
+
+    # Keep the top-N coins with enough data in every window that can be computed
+    hours = [h for h in WINDOWS.values() if len(returns_all) >= h] or [len(returns_all)]
+    covered = np.min([coverage(returns_all[-h:]) for h in hours], axis=0)
+    columns = [i for i in ranked if covered[i] >= MIN_COVERAGE][:top_n]
+    coins = [all_coins[i] for i in columns]
+    returns = returns_all[:, columns]
+
+    blob = []
+    offset = 0
+    summary = {
+        "generated_at": datetime.now(timezone.utc).isoformat(),
+        "source_end": datetime.fromtimestamp(int(timestamps[-1]), timezone.utc).isoformat(),
+        "coins": coins,
+        "dtype": "float32-le",
+        "windows": {},
+    }
+
+    for name, hours in WINDOWS.items():
+        window = returns[-hours:]
+        if len(window) < hours:
+            print(f"  Skipping {name}: only {len(window)} of {hours} hourly returns")
+            continue
+
+        correlation, volatility = correlation_and_volatility(window)
+        blob.extend([correlation.ravel(), volatility])
+        summary["windows"][name] = {
+            "hours": hours,
+            "correlation_offset": offset,
+            "volatility_offset": offset + correlation.size,
+            **summarise_window(coins, correlation, volatility),
+        }
+        offset += correlation.size + volatility.size
+
+    trail = rolling_average_correlation(returns, WINDOWS[TRAIL_WINDOW])
+    summary["correlation_trail"] = {
+        "window": TRAIL_WINDOW,
+        "step_hours": TRAIL_STEP,
+        "values": trail,
+    }
+
+    data = np.concatenate(blob).astype("<f4") if blob else np.empty(0, dtype="<f4")
+    return data, summary
+
+
+def save_outputs(data: np.ndarray, summary: dict):
+    """Write the binary artifact and its summary atomically."""
+    OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
+    summary["size"] = int(data.size)
+
+    for path, write in (
+        (OUTPUT_DIR / "matrices.f32", lambda f: f.write(data.tobytes())),
+        (OUTPUT_DIR / "summary.json", lambda f: f.write(json.dumps(summary, separators=(",", ":")).encode())),
+    ):
+        tmp_path = path.with_name(f".{path.name}.tmp")
+        with open(tmp_path, "wb") as f:
+            write(f)
+        os.replace(tmp_path, path)
+
+
+def main(top_n: int = DEFAULT_TOP_N):
+    print(f"[{datetime.now(timezone.utc).isoformat()}] Building correlation matrices (top {top_n})...")
+
+    try:
+        data, summary = build_matrices(top_n)
+        save_outputs(data, summary)
+
+        for name, stats in summary["windows"].items():
+            print(f"  {name}: avg correlation {stats['average_correlation']} ({stats['regime']})")
+        print(f"  {len(summary['coins'])} coins, {data.nbytes} bytes -> {OUTPUT_DIR}")
+        return 0
+
+    except (FileNotFoundError, json.JSONDecodeError, KeyError, ValueError) as e:
+        print(f"  ERROR: {e}")
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main(int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_TOP_N))
@@ -6,23 +6,57 @@ Place in: scripts/generate_audio.py
 Required environment variables:
 - ELEVENLABS_API_KEY
 - ELEVENLABS_VOICE_ID (optional, defaults to Adam)
+- ELEVENLABS_STREAM (optional, "true" to use the streaming endpoint)
+- AUDIO_CACHE_DIR (optional, defaults to .cache/audio)
 
-Run: python scripts/generate_audio.py
+Optional: ffmpeg on PATH for loudness normalisation plus compact and HLS
+variants (see audio_postprocess.py)
+
+Run: python scripts/generate_audio.py            Week in Review
+     python scripts/generate_audio.py --batch    Every daily brief + Week Ahead
+     python scripts/generate_audio.py --check    Exit 0 if the Week in Review audio is current
+Add --force to synthesise even when the inputs are unchanged (see job_guard.py).
 """
 
+import contextvars
 import os
 import json
+import hashlib
 import re
+import shutil
+import threading
+import time
 import requests
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
 
+from audio_postprocess import postprocess
+from content_manifest import PUBLISH_LOCK, publish_content
+from content_split import hot_path, publish_split
+from http_pool import session
+from job_guard import JobGuard, JobLocked, input_hash
+from mp3_frames import append_mp3, encoder_delay, frame_levels, iter_frames, peaks
+from publish_queue import enqueue
+from run_metrics import add, metrics_run, span, timed
+from speech_normaliser import normalise
+
 # Configuration
 ELEVENLABS_API_KEY = os.environ.get('ELEVENLABS_API_KEY')
 ELEVENLABS_VOICE_ID = os.environ.get('ELEVENLABS_VOICE_ID', '21m00Tcm4TlvDq8ikWAM')  # Adam
-CONTENT_DIR = Path('content/weekend')
+CONTENT_ROOT = Path('content')
+CONTENT_DIR = CONTENT_ROOT / 'weekend'
 AUDIO_DIR = CONTENT_DIR / 'audio'
 
+# Job guard names (data/jobs/<job>.json)
+WEEKEND_AUDIO_JOB = 'weekend-audio'
+BRIEF_AUDIO_JOB = 'brief-audio'
+
+# Batch mode - daily briefs
+BRIEF_REGIONS = ['apac', 'emea', 'americas']
+BRIEF_TYPES = ['morning', 'evening']
+REGION_NAMES = {'apac': 'Asia-Pacific', 'emea': 'EMEA', 'americas': 'Americas'}
+
 # Voice settings for FT-quality narration
 VOICE_SETTINGS = {
     "stability": 0.50,          # More expressive
@@ -31,6 +65,28 @@ VOICE_SETTINGS = {
     "use_speaker_boost": True
 }
 
+MODEL_ID = "eleven_monolingual_v1"
+
+# Chunked synthesis - short requests finish fast and run side by side
+MAX_CHUNK_CHARS = 2000   # Split at paragraph, then sentence boundaries
+TTS_PARALLELISM = 3      # Concurrent requests (ElevenLabs plans allow 2-10)
+TTS_TIMEOUT = 120
+TTS_RETRIES = 3
+TTS_MIN_INTERVAL = 0.5   # Seconds between request starts across all episodes
+
+# Streaming download - audio goes to disk as it arrives, never held whole in memory
+TTS_STREAM = os.environ.get('ELEVENLABS_STREAM', 'false').lower() == 'true'  # Opt in to the /stream endpoint
+DOWNLOAD_BLOCK_BYTES = 64 * 1024
+PROGRESS_EVERY_BYTES = 1024 * 1024
+
+# Content-addressed chunk cache - only changed chunks are re-synthesised
+AUDIO_CACHE_DIR = Path(os.environ.get('AUDIO_CACHE_DIR', '.cache/audio'))
+AUDIO_CACHE_MAX_AGE_DAYS = 60
+
+# Player metadata - waveform and chapters without decoding the MP3
+AUDIO_PEAK_COUNT = 400     # Peaks (0-100) across the whole episode
+CHAPTER_TITLE_WORDS = 6    # Untitled paragraphs are labelled by their opening words
+
 def get_week_in_review_text():
     """Load the Week in Review content from magazine.json"""
     magazine_path = CONTENT_DIR / 'magazine.json'
@@ -65,59 +121,108 @@ def get_week_in_review_text():
 
 def clean_text_for_speech(text):
     """Prepare text for TTS - make it sound natural when spoken"""
+    return normalise(text)
+
+def split_into_chunks(paragraphs, max_chars=MAX_CHUNK_CHARS):
+    """Split text into chunks of at most max_chars at paragraph, then sentence boundaries
     
-    # Remove markdown formatting
-    text = re.sub(r'\*\*([^*]+)\*\*', r'\1', text)  # Bold
-    text = re.sub(r'\*([^*]+)\*', r'\1', text)  # Italic
-    text = re.sub(r'_([^_]+)_', r'\1', text)  # Underscore italic
-    text = re.sub(r'\[([^\]]+)\]\([^)]+\)', r'\1', text)  # Links
-    text = re.sub(r'#{1,6}\s*', '', text)  # Headers
-    
-    # Handle HTML entities
-    text = text.replace('&amp;', 'and')
-    text = text.replace('&nbsp;', ' ')
-    text = text.replace('—', ' — ')
-    text = text.replace('–', ' - ')
-    
-    # Handle currency - make it speakable
-    text = re.sub(r'\$(\d{1,3}),(\d{3}),(\d{3})', r'\1 point \2 billion dollars', text)
-    text = re.sub(r'\$(\d{1,3}),(\d{3})', r'\1 thousand dollars', text)
-    text = re.sub(r'\$(\d+)b', r'\1 billion dollars', text, flags=re.IGNORECASE)
-    text = re.sub(r'\$(\d+)m', r'\1 million dollars', text, flags=re.IGNORECASE)
-    text = re.sub(r'\$(\d+)k', r'\1 thousand dollars', text, flags=re.IGNORECASE)
-    text = re.sub(r'\$(\d+)', r'\1 dollars', text)
-    
-    # Handle percentages
-    text = re.sub(r'(\d+\.?\d*)%', r'\1 percent', text)
-    
-    # Handle crypto terms pronunciation hints
-    crypto_pronunciations = {
-        'BTC': 'Bitcoin',
-        'ETH': 'Ethereum',
-        'DeFi': 'DeFi',
-        'NFT': 'N F T',
-        'TVL': 'total value locked',
-        'ATH': 'all-time high',
-        'HODL': 'hodl',
-    }
+    Chunks never span paragraphs, so an edit only changes the chunks of the
+    paragraph it touches (and, through their context, the chunk either side);
+    the rest stay cache hits.
+    """
+    chunks = []
+    for paragraph in paragraphs:
+        if len(paragraph) <= max_chars:
+            chunks.append(paragraph)
+            continue
+        
+        pieces = []
+        for sentence in re.split(r'(?<=[.!?])\s+', paragraph):
+            # A single run-on sentence longer than a chunk is split at word boundaries
+            while len(sentence) > max_chars:
+                cut = sentence.rfind(' ', 0, max_chars)
+                cut = cut if cut > 0 else max_chars
+                pieces.append(sentence[:cut])
+                sentence = sentence[cut:].lstrip()
+            if sentence:
+                pieces.append(sentence)
+        
+        current = pieces[0]
+        for piece in pieces[1:]:
+            if len(current) + 1 + len(piece) <= max_chars:
+                current += ' ' + piece
+            else:
+                chunks.append(current)
+                current = piece
+        chunks.append(current)
     
-    for abbr, full in crypto_pronunciations.items():
-        text = re.sub(rf'\b{abbr}\b', full, text)
+    return chunks
+
+def chunk_cache_path(text, previous_text='', next_text=''):
+    """Cache path keyed by everything that determines a chunk's audio
+
+    The neighbouring text sent for prosody is part of the key, so a chunk
+    only reuses audio recorded in the same context.
+    """
+    key = json.dumps({
+        "text": text,
+        "previous_text": previous_text,
+        "next_text": next_text,
+        "voice_id": ELEVENLABS_VOICE_ID,
+        "model_id": MODEL_ID,
+        "voice_settings": VOICE_SETTINGS
+    }, sort_keys=True)
+    return AUDIO_CACHE_DIR / f'{hashlib.sha256(key.encode()).hexdigest()}.mp3'
+
+def prune_audio_cache():
+    """Drop cached chunks that no run has used for AUDIO_CACHE_MAX_AGE_DAYS"""
+    cutoff = time.time() - AUDIO_CACHE_MAX_AGE_DAYS * 86400
+    for path in AUDIO_CACHE_DIR.glob('*.mp3'):
+        if path.stat().st_mtime < cutoff:
+            path.unlink()
+
+def download_audio(response, path, label):
+    """Stream a TTS response body into path, reporting progress; returns bytes written"""
+    started = time.monotonic()
+    written = 0
+    next_report = PROGRESS_EVERY_BYTES
     
-    # Clean up whitespace
-    text = re.sub(r'\s+', ' ', text)
-    text = text.strip()
+    with open(path, 'wb') as f:
+        for block in response.iter_content(chunk_size=DOWNLOAD_BLOCK_BYTES):
+            f.write(block)
+            written += len(block)
+            if written >= next_report:
+                rate = written / max(time.monotonic() - started, 1e-6)
+                print(f"   … {label}: {written / 1024:.0f} KB ({rate / 1024:.0f} KB/s)")
+                next_report += PROGRESS_EVERY_BYTES
     
-    return text
+    return written
 
-def generate_audio(text, output_path):
-    """Generate audio using ElevenLabs API"""
+class RequestPacer:
+    """Global request pacing shared by every worker; a 429 pushes everyone back"""
     
-    if not ELEVENLABS_API_KEY:
-        print("❌ ELEVENLABS_API_KEY not set")
-        return False
+    def __init__(self, min_interval):
+        self.min_interval = min_interval
+        self.next_slot = 0.0
+        self.lock = threading.Lock()
+    
+    def wait(self):
+        with self.lock:
+            slot = max(time.monotonic(), self.next_slot)
+            self.next_slot = slot + self.min_interval
+        time.sleep(max(0.0, slot - time.monotonic()))
     
+    def back_off(self, seconds):
+        with self.lock:
+            self.next_slot = max(self.next_slot, time.monotonic() + seconds)
+
+TTS_PACER = RequestPacer(TTS_MIN_INTERVAL)
+
+def synthesize_chunk(text, path, label, previous_text='', next_text=''):
+    """Synthesise one chunk to path; neighbouring text keeps intonation continuous across joins"""
     url = f"https://api.elevenlabs.io/v1/text-to-speech/{ELEVENLABS_VOICE_ID}"
+    if TTS_STREAM:
+        url += "/stream"
     
     headers = {
         "Accept": "audio/mpeg",
@@ -127,58 +232,347 @@ def generate_audio(text, output_path):
     
     data = {
         "text": text,
-        "model_id": "eleven_monolingual_v1",
-        "voice_settings": VOICE_SETTINGS
+        "model_id": MODEL_ID,
+        "voice_settings": VOICE_SETTINGS,
+        "previous_text": previous_text,
+        "next_text": next_text
     }
     
-    print(f"🎙️ Generating audio ({len(text)} characters)...")
+    for attempt in range(1, TTS_RETRIES + 1):
+        TTS_PACER.wait()
+        delay = 2 ** attempt
+        try:
+            with session().post(url, json=data, headers=headers, timeout=TTS_TIMEOUT, stream=True) as response:
+                if response.status_code == 200:
+                    return download_audio(response, path, label)
+                error = f"ElevenLabs error {response.status_code}: {response.text[:200]}"
+                if response.status_code not in (429, 500, 502, 503, 504):
+                    break
+                retry_after = response.headers.get('Retry-After', '')
+                if retry_after.isdigit():
+                    delay = int(retry_after)
+        except requests.exceptions.RequestException as e:
+            error = f"request failed: {e}"
+        
+        if attempt < TTS_RETRIES:
+            add(retries=1)
+            TTS_PACER.back_off(delay)
     
-    try:
-        response = requests.post(url, json=data, headers=headers, timeout=120)
+    raise RuntimeError(error)
+
+def generate_episodes(episodes):
+    """Synthesise several episodes through one shared worker pool
+    
+    episodes: list of (paragraphs, output_path, chapters), where chapters is a
+    list of (title, index of the paragraph it starts at). Chunks from every
+    episode are queued together under TTS_PARALLELISM and TTS_PACER, so a batch
+    takes about as long as its slowest chunks rather than the sum of its episodes.
+    Returns {output_path: {duration, peaks, chapters}, or None if it failed}.
+    """
+    
+    if not ELEVENLABS_API_KEY:
+        print("❌ ELEVENLABS_API_KEY not set")
+        return {output_path: None for _, output_path, _ in episodes}
+    
+    AUDIO_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    
+    plans = []
+    jobs = {}
+    for paragraphs, output_path, chapters in episodes:
+        # Chunks never span paragraphs, so each chunk maps back to one paragraph
+        chunks, chunk_paragraphs = [], []
+        for index, paragraph in enumerate(paragraphs):
+            for chunk in split_into_chunks([paragraph]):
+                chunks.append(chunk)
+                chunk_paragraphs.append(index)
+        contexts = [
+            (chunks[i - 1] if i > 0 else '', chunks[i + 1] if i + 1 < len(chunks) else '')
+            for i in range(len(chunks))
+        ]
+        part_paths = [chunk_cache_path(chunk, *context) for chunk, context in zip(chunks, contexts)]
+        plans.append((output_path, part_paths, chunk_paragraphs, chapters))
         
-        if response.status_code == 200:
-            # Ensure directory exists
-            output_path.parent.mkdir(parents=True, exist_ok=True)
-            
-            with open(output_path, 'wb') as f:
-                f.write(response.content)
+        missing = 0
+        for i, part_path in enumerate(part_paths):
+            if part_path.exists() or part_path in jobs:
+                continue
+            missing += 1
+            jobs[part_path] = (chunks[i], f"{output_path.stem} {i + 1}/{len(chunks)}", *contexts[i])
+        
+        total_chars = sum(len(c) for c in chunks)
+        print(f"🎙️ {output_path.stem}: {total_chars} characters in {len(chunks)} chunks, {len(chunks) - missing} cached")
+    
+    def synthesize(part_path):
+        text, label, previous_text, next_text = jobs[part_path]
+        started = time.monotonic()
+        # Download beside the cache entry and rename, so a failed run never leaves a partial chunk
+        tmp_path = part_path.with_name(f'.{part_path.name}.{os.getpid()}.tmp')
+        try:
+            with span('tts_chunk', chars=len(text)):
+                size = synthesize_chunk(text, tmp_path, label, previous_text, next_text)
+                add(bytes_in=size)
+            os.replace(tmp_path, part_path)
+        finally:
+            tmp_path.unlink(missing_ok=True)
+        elapsed = time.monotonic() - started
+        print(f"   ✓ {label}: {len(text)} chars, {size / 1024:.0f} KB in {elapsed:.1f}s ({size / 1024 / max(elapsed, 1e-6):.0f} KB/s)")
+        return size
+    
+    started = time.monotonic()
+    total_bytes = 0
+    print(f"⚙️ Synthesising {len(jobs)} chunks, {TTS_PARALLELISM} at a time...")
+    with span('synthesize', chunks=len(jobs)), ThreadPoolExecutor(max_workers=TTS_PARALLELISM) as executor:
+        # Each worker runs in a copy of this context, so its spans join the run
+        futures = {part_path: executor.submit(contextvars.copy_context().run, synthesize, part_path) for part_path in jobs}
+        for part_path, future in futures.items():
+            try:
+                total_bytes += future.result()
+            except (RuntimeError, OSError) as e:
+                print(f"❌ {jobs[part_path][1]}: {e}")
+    
+    results = {}
+    for output_path, part_paths, chunk_paragraphs, chapters in plans:
+        if not all(path.exists() for path in part_paths):
+            print(f"❌ {output_path.stem}: incomplete - finished chunks are cached, re-run to resume")
+            results[output_path] = None
+            continue
+        
+        # Stitch part by part into a temp file, then swap it in atomically.
+        # Frame gains and paragraph start times are collected on the way through.
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = output_path.with_name(f'.{output_path.name}.tmp')
+        duration = 0.0
+        levels = []
+        paragraph_starts = {}
+        with span('stitch', chunks=len(part_paths)), open(tmp_path, 'wb') as f:
+            for part_path, paragraph in zip(part_paths, chunk_paragraphs):
+                paragraph_starts.setdefault(paragraph, duration)
+                duration += append_mp3(part_path.read_bytes(), f, levels)
+                part_path.touch()  # Mark as recently used for pruning
+        os.replace(tmp_path, output_path)
+        
+        size_mb = output_path.stat().st_size / (1024 * 1024)
+        print(f"✅ Audio saved: {output_path} ({size_mb:.1f} MB, {duration / 60:.1f} min, {len(chapters)} chapters)")
+        results[output_path] = {
+            'duration': round(duration, 2),
+            'peaks': peaks(levels, AUDIO_PEAK_COUNT),
+            'chapters': [
+                {'title': title, 'start': round(paragraph_starts[index], 2)}
+                for title, index in chapters if index in paragraph_starts
+            ],
+        }
+    
+    prune_audio_cache()
+    elapsed = time.monotonic() - started
+    print(f"⏱️ {len(plans)} episode(s) in {elapsed:.1f}s ({total_bytes / 1024 / max(elapsed, 1e-6):.0f} KB/s synthesised)")
+    return results
+
+def measure_published(output_path, info):
+    """Duration, peaks and chapter starts read back from the post-processed MP3
+
+    The normalised file is a re-encode of the stitched stream: its levels
+    differ, and the encoder's start delay moves every chapter by the same
+    number of samples.
+    """
+    data = output_path.read_bytes()
+    levels = frame_levels(data)
+    first = next(iter_frames(data), None)
+    shift = encoder_delay(data) / first[1]['sample_rate'] if first else 0.0
+    return {
+        **info,
+        'duration': round(sum(seconds for seconds, _ in levels), 2),
+        'peaks': peaks(levels, AUDIO_PEAK_COUNT),
+        'chapters': [
+            {**chapter, 'start': round(chapter['start'] + shift, 2) if chapter['start'] else 0}
+            for chapter in info.get('chapters', [])
+        ],
+    }
+
+def audio_inputs_hash(paragraphs):
+    """Everything that changes the synthesised audio"""
+    return input_hash(paragraphs, ELEVENLABS_VOICE_ID, MODEL_ID, VOICE_SETTINGS)
+
+def generate_audio(paragraphs, output_path, chapters=()):
+    """Generate audio using ElevenLabs API, synthesising chunks concurrently"""
+    return generate_episodes([(paragraphs, output_path, list(chapters))])[output_path]
+
+@timed('update_audio_url')
+def update_audio_url(json_path, audio_url, variants=None, info=None):
+    """Record the audio URL, compact/HLS variants, peaks and chapters in a content JSON file"""
+    info = info or {}
+    fields = {
+        'audio_variants': variants,
+        'audio_duration': info.get('duration'),
+        'audio_peaks': info.get('peaks'),
+        'audio_chapters': info.get('chapters'),
+    }
+    try:
+        with PUBLISH_LOCK:
+            with open(json_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
             
-            size_mb = len(response.content) / (1024 * 1024)
-            print(f"✅ Audio saved: {output_path} ({size_mb:.1f} MB)")
-            return True
-        else:
-            print(f"❌ ElevenLabs error: {response.status_code}")
-            print(response.text)
-            return False
+            data['audio_url'] = str(audio_url)
+            for key, value in fields.items():
+                if value:
+                    data[key] = value
+                else:
+                    data.pop(key, None)  # Never describe a previous edition
             
-    except requests.exceptions.Timeout:
-        print("❌ Request timed out")
-        return False
-    except requests.exceptions.RequestException as e:
-        print(f"❌ Request failed: {e}")
+            publish_content(json_path, data)
+            if hot_path(json_path).exists():
+                publish_split(json_path, data)  # Keep the brief's first-paint document in step
+            enqueue(json_path, f'audio for {Path(json_path).parent.name}/{Path(json_path).stem}')
+        
+        print(f"✅ Updated {json_path} with audio_url")
+        return True
+        
+    except Exception as e:
+        print(f"⚠️ Could not update {json_path}: {e}")
         return False
 
-def update_magazine_json(audio_url):
+def update_magazine_json(audio_url, variants=None, info=None):
     """Update magazine.json with the audio URL"""
-    magazine_path = CONTENT_DIR / 'magazine.json'
+    return update_audio_url(CONTENT_DIR / 'magazine.json', audio_url, variants, info)
+
+def chapter_title(paragraph, words=CHAPTER_TITLE_WORDS):
+    """Short chapter label from the opening words of a paragraph"""
+    opening = paragraph.split()
+    title = ' '.join(opening[:words]).rstrip(',;:')
+    return title + '…' if len(opening) > words else title
+
+def find_briefs():
+    """All daily briefs plus the global Week Ahead that exist on disk"""
+    paths = [CONTENT_ROOT / region / f'{brief_type}.json' for region in BRIEF_REGIONS for brief_type in BRIEF_TYPES]
+    paths.append(CONTENT_ROOT / 'week-ahead.json')
+    return [path for path in paths if path.exists()]
+
+def get_brief_paragraphs(brief):
+    """Speakable paragraphs and (title, paragraph index) chapters for a brief"""
+    region = brief.get('region', 'global')
+    brief_type = brief.get('type', 'morning')
+    if brief_type == 'week-ahead':
+        title = "The Week Ahead"
+    else:
+        title = f"The {REGION_NAMES.get(region, region.upper())} {brief_type.title()} Brief"
     
-    try:
-        with open(magazine_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+    headline = clean_text_for_speech(brief.get('headline', ''))
+    paragraphs = [f"This is {title} from Litmus Daily. {headline.rstrip('.')}."]
+    chapters = [(headline or title, 0)]
+    
+    sections = brief.get('sections', {})
+    for key, value in sections.items():
+        if key.endswith('_title'):
+            continue
         
-        data['audio_url'] = str(audio_url)
+        section_title = sections.get(f'{key}_title', '')
+        texts = []
+        if isinstance(value, str):
+            texts.append(value)
+        elif isinstance(value, dict):
+            section_title = value.get('title', section_title)
+            if value.get('content'):
+                texts.append(value['content'])
+            # Sub-regions inside the_region
+            for sub in value.values():
+                if isinstance(sub, dict) and sub.get('content'):
+                    texts.append(f"{sub.get('name', '')}. {sub['content']}")
         
-        with open(magazine_path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+        section = [clean_text_for_speech(p) for text in texts for p in re.split(r'\n\s*\n', text) if p.strip()]
+        section = [p for p in section if p]
+        if not section:
+            continue
         
-        print(f"✅ Updated magazine.json with audio_url")
-        return True
+        # The title leads into its first paragraph rather than costing a request of its own
+        if section_title:
+            section_title = clean_text_for_speech(section_title).rstrip('.')
+            section[0] = f"{section_title}. {section[0]}"
+        chapters.append((section_title or chapter_title(section[0]), len(paragraphs)))
+        paragraphs.extend(section)
+    
+    paragraphs.append(f"This has been {title} from Litmus Daily. Thank you for listening.")
+    return paragraphs, chapters
+
+def brief_audio_path(json_path, brief):
+    """content/<region>/audio/<type>-<date>.mp3 (content/audio/ for the Week Ahead)"""
+    date_str = (brief.get('generated_at') or datetime.now().isoformat())[:10]
+    return json_path.parent / 'audio' / f'{json_path.stem}-{date_str}.mp3'
+
+def prune_brief_audio(output_path):
+    """Remove older editions of the same brief (MP3, compact encode and HLS) so the repo keeps one"""
+    prefix = output_path.stem.rsplit('-', 3)[0]
+    edition = re.compile(re.escape(prefix) + r'-\d{4}-\d{2}-\d{2}\b')
+    candidates = list(output_path.parent.glob(f'{prefix}-*')) + list((output_path.parent / 'hls').glob(f'{prefix}-*'))
+    for path in candidates:
+        if edition.match(path.name) and not path.name.startswith(output_path.stem):
+            if path.is_dir():
+                shutil.rmtree(path)
+            else:
+                path.unlink()
+
+def batch_main(force=False):
+    print("=" * 50)
+    print("🎙️ Litmus Daily Brief Audio Generator")
+    print("=" * 50)
+    
+    with metrics_run(BRIEF_AUDIO_JOB) as metrics:
+        try:
+            with JobGuard(BRIEF_AUDIO_JOB) as guard:
+                success = run_batch(guard, force)
+                metrics.outcome = 'ok' if success else 'failed'
+                return success
+        except JobLocked as e:
+            print(f"⏭️ {e} - skipping")
+            metrics.outcome = 'skipped'
+            return True
+
+def run_batch(guard, force):
+    episodes = []
+    current = 0
+    for json_path in find_briefs():
+        try:
+            with open(json_path, 'r', encoding='utf-8') as f:
+                brief = json.load(f)
+        except json.JSONDecodeError as e:
+            print(f"⚠️ Skipping {json_path}: {e}")
+            continue
         
-    except Exception as e:
-        print(f"⚠️ Could not update magazine.json: {e}")
+        paragraphs, chapters = get_brief_paragraphs(brief)
+        digest = audio_inputs_hash(paragraphs)
+        if not force and guard.completed(digest):
+            current += 1
+            print(f"⏭️ {json_path}: audio is current")
+            continue
+        
+        episodes.append((json_path, paragraphs, brief_audio_path(json_path, brief), chapters, digest))
+        print(f"📄 {json_path}: {brief.get('headline', '')[:70]}")
+    
+    if not episodes:
+        if current:
+            print(f"✅ All {current} episodes are current")
+            return True
+        print("❌ No briefs found")
         return False
+    
+    results = generate_episodes([(paragraphs, output_path, chapters) for _, paragraphs, output_path, chapters, _ in episodes])
+    
+    for json_path, _, output_path, _, digest in episodes:
+        if results[output_path]:
+            info = results[output_path]
+            with span('postprocess'):
+                variants = postprocess(output_path)
+                if variants:
+                    info = measure_published(output_path, info)
+            prune_brief_audio(output_path)
+            update_audio_url(json_path, str(output_path).replace('\\', '/'), variants, info)
+            guard.record(digest, [output_path])
+    
+    succeeded = sum(1 for info in results.values() if info)
+    print("=" * 50)
+    print(f"{'✅' if succeeded == len(episodes) else '⚠️'} {succeeded}/{len(episodes)} episodes generated")
+    print("=" * 50)
+    return succeeded == len(episodes)
 
-def main():
+def main(force=False, check=False):
     print("=" * 50)
     print("🎙️ Litmus Weekend Audio Generator")
     print("=" * 50)
@@ -192,27 +586,58 @@ def main():
     
     print(f"📄 Found: {headline}")
     
-    # Clean text for speech
-    cleaned_text = clean_text_for_speech(content)
+    # Clean text for speech, keeping paragraphs as natural chunk boundaries
+    paragraphs = [clean_text_for_speech(p) for p in re.split(r'\n\s*\n', content) if p.strip()]
     
     # Add intro and outro
-    intro = f"This is The Week in Review from Litmus Daily. {headline}. "
-    outro = " This has been The Week in Review from Litmus Daily. Thank you for listening."
+    intro = f"This is The Week in Review from Litmus Daily. {headline}."
+    outro = "This has been The Week in Review from Litmus Daily. Thank you for listening."
     
-    full_text = intro + cleaned_text + outro
+    paragraphs = [intro] + paragraphs + [outro]
+    chapters = [(headline, 0)] + [(chapter_title(p), i) for i, p in enumerate(paragraphs[1:-1], 1)]
+    digest = audio_inputs_hash(paragraphs)
     
-    print(f"📝 Text length: {len(full_text)} characters")
-    print(f"⏱️ Estimated duration: ~{len(full_text) // 150} minutes")
+    with metrics_run(WEEKEND_AUDIO_JOB) as metrics:
+        try:
+            with JobGuard(WEEKEND_AUDIO_JOB) as guard:
+                previous = None if force else guard.completed(digest)
+                if previous:
+                    print(f"⏭️ Inputs unchanged since {previous['completed_at']} - {previous['outputs'][0]} is current")
+                    metrics.outcome = 'skipped'
+                    return True
+                if check:
+                    print("🔍 Week in Review audio is out of date")
+                    metrics.outcome = 'stale'
+                    return False
+                success = run_week_in_review(guard, digest, paragraphs, chapters)
+                metrics.outcome = 'ok' if success else 'failed'
+                return success
+        except JobLocked as e:
+            print(f"⏭️ {e} - skipping")
+            metrics.outcome = 'skipped'
+            return True
+
+def run_week_in_review(guard, digest, paragraphs, chapters):
+    text_length = sum(len(p) for p in paragraphs)
+    
+    print(f"📝 Text length: {text_length} characters")
+    print(f"⏱️ Estimated duration: ~{text_length // 150} minutes")
     
     # Generate filename with date
     date_str = datetime.now().strftime('%Y-%m-%d')
     output_path = AUDIO_DIR / f'week-in-review-{date_str}.mp3'
     
     # Generate audio
-    if generate_audio(full_text, output_path):
+    info = generate_audio(paragraphs, output_path, chapters)
+    if info:
         # Update magazine.json
         relative_path = str(output_path).replace('\\', '/')
-        update_magazine_json(relative_path)
+        with span('postprocess'):
+            variants = postprocess(output_path)
+            if variants:
+                info = measure_published(output_path, info)
+        update_magazine_json(relative_path, variants, info)
+        guard.record(digest, [output_path])
         
         print("=" * 50)
         print("✅ Audio generation complete!")
@@ -224,5 +649,10 @@ def main():
         return False
 
 if __name__ == '__main__':
-    success = main()
+    import sys
+    force = '--force' in sys.argv
+    if '--batch' in sys.argv:
+        success = batch_main(force)
+    else:
+        success = main(force, check='--check' in sys.argv)
     exit(0 if success else 1)
@@ -15,12 +15,21 @@ import sys
 import re
 from datetime import datetime, timezone, timedelta
 from pathlib import Path
-import urllib.request
-import urllib.error
 import urllib.parse
 import time
 import random
 
+from content_archive import archive_document
+from content_manifest import PUBLISH_LOCK, publish_content
+from content_split import publish_split
+from content_writer import atomic_write
+from http_pool import MARKET_TTL, get_json, post_json
+from job_guard import JobGuard, JobLocked, edition_key, input_hash
+from llm_ledger import prompt_version, record
+from publish_queue import enqueue
+from render_static import render_brief
+from run_metrics import add, annotate, metrics_run, span, timed
+
 # Configuration
 ANTHROPIC_API_KEY = os.environ.get("ANTHROPIC_API_KEY", "")
 MODEL = "claude-opus-4-5-20251101"  # Opus 4.5 for premium editorial quality
@@ -34,6 +43,7 @@ COINGECKO_COINS = "https://api.coingecko.com/api/v3/coins/markets?vs_currency=us
 # Paths
 SCRIPT_DIR = Path(__file__).parent
 CONTENT_DIR = SCRIPT_DIR.parent / "content"
+MOOD_TRIGGER_FILE = SCRIPT_DIR.parent / "data" / "mood-trigger.json"
 
 # ============================================
 # DYNAMIC HERO IMAGES - Keyword-based with curated fallbacks  
@@ -241,13 +251,7 @@ def fetch_unsplash_image(keywords: str, region: str = "", brief_type: str = "mor
         })
         
         url = f"{UNSPLASH_API_URL}?{params}"
-        req = urllib.request.Request(url, headers={
-            "Authorization": f"Client-ID {UNSPLASH_ACCESS_KEY}",
-            "User-Agent": "TheLitmus/1.0"
-        })
-        
-        with urllib.request.urlopen(req, timeout=15) as resp:
-            data = json.loads(resp.read().decode())
+        data = get_json(url, timeout=15, headers={"Authorization": f"Client-ID {UNSPLASH_ACCESS_KEY}"})
         
         results = data.get("results", [])
         
@@ -262,12 +266,7 @@ def fetch_unsplash_image(keywords: str, region: str = "", brief_type: str = "mor
                     "orientation": "landscape"
                 })
                 url = f"{UNSPLASH_API_URL}?{params}"
-                req = urllib.request.Request(url, headers={
-                    "Authorization": f"Client-ID {UNSPLASH_ACCESS_KEY}",
-                    "User-Agent": "TheLitmus/1.0"
-                })
-                with urllib.request.urlopen(req, timeout=15) as resp:
-                    data = json.loads(resp.read().decode())
+                data = get_json(url, timeout=15, headers={"Authorization": f"Client-ID {UNSPLASH_ACCESS_KEY}"})
                 results = data.get("results", [])
             
             if not results:
@@ -308,6 +307,7 @@ def fetch_unsplash_image(keywords: str, region: str = "", brief_type: str = "mor
         return None
 
 
+@timed("build_image_url")
 def build_image_url(keywords: str, fallback: str = "default", region: str = "", brief_type: str = "morning") -> str:
     """Build image URL - tries Unsplash API first, falls back to curated images"""
     
@@ -337,18 +337,15 @@ def build_image_url(keywords: str, fallback: str = "default", region: str = "",
     return f"https://images.unsplash.com/{photo_id}?w=1400&h=500&fit=crop&q=80"
 
 
+@timed("fetch_market_data")
 def fetch_market_data() -> dict:
     """Fetch live market data from CoinGecko"""
     try:
         # Global data
-        req = urllib.request.Request(COINGECKO_GLOBAL, headers={"User-Agent": "TheLitmus/1.0"})
-        with urllib.request.urlopen(req, timeout=30) as resp:
-            global_data = json.loads(resp.read().decode())
+        global_data = get_json(COINGECKO_GLOBAL, ttl=MARKET_TTL)
         
         # Top coins
-        req = urllib.request.Request(COINGECKO_COINS, headers={"User-Agent": "TheLitmus/1.0"})
-        with urllib.request.urlopen(req, timeout=30) as resp:
-            coins = json.loads(resp.read().decode())
+        coins = get_json(COINGECKO_COINS, ttl=MARKET_TTL)
         
         btc = next((c for c in coins if c["id"] == "bitcoin"), {})
         eth = next((c for c in coins if c["id"] == "ethereum"), {})
@@ -404,7 +401,15 @@ def clean_json_string(json_str: str) -> str:
     return json_str
 
 
-def extract_json_from_response(text: str) -> dict:
+@timed("extract_json_from_response")
+def extract_json_from_response(text: str) -> tuple:
+    """Extract JSON from an AI response; returns (data, name of the strategy that worked)"""
+    data, strategy = parse_json_strategies(text)
+    annotate(strategy=strategy)
+    return data, strategy
+
+
+def parse_json_strategies(text: str) -> tuple:
     """Safely extract JSON from AI response with multiple fallback strategies"""
     
     if not text or not text.strip():
@@ -412,7 +417,7 @@ def extract_json_from_response(text: str) -> dict:
     
     # Strategy 1: Try direct parse (response might be pure JSON)
     try:
-        return json.loads(text)
+        return json.loads(text), "direct"
     except json.JSONDecodeError:
         pass
     
@@ -425,14 +430,14 @@ def extract_json_from_response(text: str) -> dict:
     
     # Strategy 3: Try parsing the extracted JSON
     try:
-        return json.loads(json_str)
+        return json.loads(json_str), "extracted"
     except json.JSONDecodeError as e:
         print(f"  JSON parse attempt 1 failed: {e}")
     
     # Strategy 4: Clean the JSON and try again
     cleaned = clean_json_string(json_str)
     try:
-        return json.loads(cleaned)
+        return json.loads(cleaned), "cleaned"
     except json.JSONDecodeError as e:
         print(f"  JSON parse attempt 2 failed: {e}")
     
@@ -441,13 +446,13 @@ def extract_json_from_response(text: str) -> dict:
     try:
         # Find all string values and escape internal quotes
         fixed = fix_unescaped_quotes(cleaned)
-        return json.loads(fixed)
+        return json.loads(fixed), "quotes_fixed"
     except (json.JSONDecodeError, Exception) as e:
         print(f"  JSON parse attempt 3 failed: {e}")
     
     # Strategy 6: Extract just the essential fields manually
     try:
-        return extract_essential_fields(text)
+        return extract_essential_fields(text), "essential_fields"
     except Exception as e:
         print(f"  Essential field extraction failed: {e}")
     
@@ -971,8 +976,10 @@ def get_publication_timestamp(region: str, brief_type: str) -> str:
     return target_local.strftime(f"%Y-%m-%dT{pub_hour:02d}:00:00{tz_str}")
 
 
-def call_anthropic_api(prompt: str, attempt: int = 1) -> dict:
-    """Call Claude Opus 4.5 API with retry logic"""
+@timed("call_anthropic_api")
+def call_anthropic_api(prompt: str, attempt: int = 1, edition: str = "", prompt_id: str = "", version: str = "") -> dict:
+    """Call Claude Opus 4.5 API with retry logic; every call is recorded in the LLM ledger"""
+    annotate(attempt=attempt)
     if not ANTHROPIC_API_KEY:
         raise ValueError("ANTHROPIC_API_KEY not set")
     
@@ -980,30 +987,41 @@ def call_anthropic_api(prompt: str, attempt: int = 1) -> dict:
     if attempt > 1:
         prompt += "\n\nIMPORTANT: Previous attempt failed JSON parsing. Please ensure valid JSON with properly escaped quotes."
     
-    request_body = json.dumps({
+    request_body = {
         "model": MODEL,
         "max_tokens": 4096,
         "temperature": TEMPERATURE,
         "messages": [{"role": "user", "content": prompt}]
-    }).encode()
-    
-    req = urllib.request.Request(
-        "https://api.anthropic.com/v1/messages",
-        data=request_body,
-        headers={
-            "Content-Type": "application/json",
-            "x-api-key": ANTHROPIC_API_KEY,
-            "anthropic-version": "2023-06-01"
-        }
-    )
+    }
     
-    with urllib.request.urlopen(req, timeout=120) as resp:
-        response = json.loads(resp.read().decode())
+    ledger = dict(edition=edition, model=MODEL, prompt_id=prompt_id, prompt_version=version, attempt=attempt)
+    started = time.monotonic()
+    try:
+        with span("anthropic_request", model=MODEL):
+            response = post_json(
+                "https://api.anthropic.com/v1/messages",
+                request_body,
+                timeout=120,
+                headers={
+                    "x-api-key": ANTHROPIC_API_KEY,
+                    "anthropic-version": "2023-06-01"
+                }
+            )
+    except Exception as e:
+        record(**ledger, latency_ms=(time.monotonic() - started) * 1000, error=f"{type(e).__name__}: {e}")
+        raise
+    latency_ms = (time.monotonic() - started) * 1000
     
     content = response.get("content", [{}])[0].get("text", "")
     
     # Use robust JSON extraction
-    return extract_json_from_response(content)
+    try:
+        data, strategy = extract_json_from_response(content)
+    except ValueError as e:
+        record(**ledger, latency_ms=latency_ms, response=response, error=str(e)[:200])
+        raise
+    record(**ledger, latency_ms=latency_ms, response=response, parse_strategy=strategy)
+    return data
 
 
 # ============================================
@@ -1113,13 +1131,15 @@ def generate_week_ahead() -> dict:
     print("  Fetching market data...")
     market_data = fetch_market_data()
     
-    prompt = get_week_ahead_prompt(market_data)
+    with span("build_prompt"):
+        prompt = get_week_ahead_prompt(market_data)
+    version = prompt_version(get_week_ahead_prompt)
     
     last_error = None
     for attempt in range(1, MAX_RETRIES + 1):
         try:
             print(f"  Generating Week Ahead using {MODEL}... (attempt {attempt})")
-            brief_data = call_anthropic_api(prompt, attempt)
+            brief_data = call_anthropic_api(prompt, attempt, "week-ahead", "week-ahead", version)
             
             # Transform nested structure to flat
             transformed = transform_week_ahead_structure(brief_data)
@@ -1139,6 +1159,7 @@ def generate_week_ahead() -> dict:
             last_error = e
             print(f"  Attempt {attempt} failed: {e}")
             if attempt < MAX_RETRIES:
+                add(retries=1)
                 time.sleep(2)
     
     raise last_error
@@ -1164,7 +1185,11 @@ def transform_week_ahead_structure(brief_data: dict) -> dict:
 
 
 def transform_to_flat_structure(brief_data: dict) -> dict:
-    """Transform nested section structure to flat for backward compatibility"""
+    """Transform nested section structure to flat for backward compatibility
+
+    Sections keep the prompt's order - the first one is the lead that
+    save_brief() puts in the hot first-paint document (see content_split.py).
+    """
     flat_sections = {}
     etf_flows = None
     
@@ -1203,21 +1228,57 @@ def transform_to_flat_structure(brief_data: dict) -> dict:
     return result
 
 
-def generate_brief(region: str, brief_type: str) -> dict:
+def load_pending_trigger() -> dict:
+    """Load the out-of-cycle trigger written by capture_mood.py if it is still pending"""
+    try:
+        with open(MOOD_TRIGGER_FILE, "r") as f:
+            trigger = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+    
+    return trigger if trigger.get("status") == "pending" else None
+
+
+def mark_trigger_consumed(trigger: dict, region: str, brief_type: str):
+    """Mark a trigger as handled so later runs don't react to it again"""
+    trigger["status"] = "consumed"
+    trigger["consumed_by"] = f"{region}/{brief_type}"
+    trigger["consumed_at"] = datetime.now(timezone.utc).isoformat()
+    
+    atomic_write(MOOD_TRIGGER_FILE, json.dumps(trigger, indent=2).encode())
+
+
+def get_trigger_context(trigger: dict) -> str:
+    """Prompt addendum explaining why this brief is running out of cycle"""
+    return f"""
+
+OUT-OF-CYCLE EDITION:
+This brief is running outside the normal schedule because our market mood monitor flagged a sharp move at {trigger['timestamp']}:
+• Signals: {'; '.join(trigger['reasons'])}
+• Market mood zone: {trigger.get('zone_from') or 'unknown'} → {trigger['zone_to']}
+• Breadth: {trigger['breadth']}% of top 100 coins green (z-score {trigger['z_scores']['breadth']:+.1f})
+• M/V ratio: {trigger['mv']}x (z-score {trigger['z_scores']['mv']:+.1f})
+Lead with what changed and why it matters now. Do not invent a cause the data does not support."""
+
+
+def generate_brief(region: str, brief_type: str, trigger: dict = None) -> dict:
     """Generate a complete brief with retry logic"""
     print(f"  Fetching market data...")
     market_data = fetch_market_data()
     
-    if brief_type == "evening":
-        prompt = get_evening_prompt(region, market_data)
-    else:
-        prompt = get_morning_prompt(region, market_data)
+    with span("build_prompt"):
+        build_prompt = get_evening_prompt if brief_type == "evening" else get_morning_prompt
+        prompt = build_prompt(region, market_data)
+        
+        if trigger:
+            prompt += get_trigger_context(trigger)
+    version = prompt_version(build_prompt, get_trigger_context) if trigger else prompt_version(build_prompt)
     
     last_error = None
     for attempt in range(1, MAX_RETRIES + 1):
         try:
             print(f"  Generating {brief_type} brief for {region.upper()} using {MODEL}... (attempt {attempt})")
-            brief_data = call_anthropic_api(prompt, attempt)
+            brief_data = call_anthropic_api(prompt, attempt, f"{region}-{brief_type}", f"{brief_type}-brief", version)
             
             # Transform structure
             transformed = transform_to_flat_structure(brief_data)
@@ -1243,6 +1304,7 @@ def generate_brief(region: str, brief_type: str) -> dict:
             last_error = e
             print(f"  Attempt {attempt} failed: {e}")
             if attempt < MAX_RETRIES:
+                add(retries=1)
                 print(f"  Retrying in 5 seconds...")
                 time.sleep(5)
     
@@ -1250,6 +1312,7 @@ def generate_brief(region: str, brief_type: str) -> dict:
     raise last_error
 
 
+@timed("save_brief")
 def save_brief(brief: dict, region: str, brief_type: str):
     """Save brief to content directory"""
     if brief_type == "week-ahead":
@@ -1260,23 +1323,34 @@ def save_brief(brief: dict, region: str, brief_type: str):
         region_dir.mkdir(parents=True, exist_ok=True)
         output_file = region_dir / f"{brief_type}.json"
     
-    with open(output_file, "w") as f:
-        json.dump(brief, f, indent=2)
+    with PUBLISH_LOCK:
+        publish_content(output_file, brief)
+        hot_file = publish_split(output_file, brief)
+        archive_file = archive_document(output_file, brief)
+        page_file = render_brief(output_file, brief)
+        enqueue(output_file, f"{region} {brief_type} brief")
     
-    print(f"  Saved to {output_file}")
+    print(f"  Saved to {output_file} (first paint {hot_file.name}, page {page_file.name}, archived as {archive_file.relative_to(CONTENT_DIR)})")
+    return output_file
 
 
 def main():
-    if len(sys.argv) < 2:
-        print("Usage: python generate_brief.py <region> <type>")
+    args = [a for a in sys.argv[1:] if not a.startswith("--")]
+    on_trigger = "--on-trigger" in sys.argv
+    force = "--force" in sys.argv
+    
+    if len(args) < 1:
+        print("Usage: python generate_brief.py <region> <type> [--on-trigger] [--force]")
         print("  region: apac, emea, americas, global")
         print("  type: morning, evening, week-ahead")
+        print("  --on-trigger: only run if capture_mood.py has a pending mood trigger")
+        print("  --force: regenerate even if this edition was already generated")
         print("")
         print("For week-ahead: python generate_brief.py global week-ahead")
         sys.exit(1)
     
-    region = sys.argv[1].lower()
-    brief_type = sys.argv[2].lower() if len(sys.argv) > 2 else "morning"
+    region = args[0].lower()
+    brief_type = args[1].lower() if len(args) > 1 else "morning"
     
     # Handle week-ahead special case
     if brief_type == "week-ahead":
@@ -1289,21 +1363,55 @@ def main():
         print(f"Invalid brief type: {brief_type}")
         sys.exit(1)
     
-    print(f"\n[{datetime.now(timezone.utc).isoformat()}] Generating {region.upper()} {brief_type} brief")
-    
-    try:
-        if brief_type == "week-ahead":
-            brief = generate_week_ahead()
-        else:
-            brief = generate_brief(region, brief_type)
-        save_brief(brief, region, brief_type)
-        print(f"  ✓ Complete: {brief['headline']}")
+    return run(region, brief_type, force=force, on_trigger=on_trigger)
+
+
+def run(region: str, brief_type: str, force: bool = False, on_trigger: bool = False) -> int:
+    """Generate one edition unless it already exists; returns an exit code."""
+    # Only an --on-trigger run consumes the trigger; scheduled editions stay in cycle
+    trigger = load_pending_trigger() if on_trigger and brief_type != "week-ahead" else None
+    if on_trigger and not trigger:
+        print("No pending mood trigger - nothing to do")
         return 0
-    except Exception as e:
-        print(f"  ✗ Error: {e}")
-        import traceback
-        traceback.print_exc()
-        return 1
+    
+    # One brief per edition (UTC date); a mood trigger is an edition of its own
+    job = f"brief-{region}-{brief_type}"
+    digest = input_hash(region, brief_type, edition_key(), trigger["id"] if trigger else None)
+    
+    with metrics_run(job) as metrics:
+        try:
+            with JobGuard(job) as guard:
+                previous = None if force else guard.completed(digest)
+                if previous:
+                    print(f"{job} already generated for {edition_key()} at {previous['completed_at']} - use --force to regenerate")
+                    metrics.outcome = "skipped"
+                    return 0
+                
+                print(f"\n[{datetime.now(timezone.utc).isoformat()}] Generating {region.upper()} {brief_type} brief")
+                if trigger:
+                    print(f"  Mood trigger {trigger['id']}: {', '.join(trigger['reasons'])}")
+                
+                try:
+                    if brief_type == "week-ahead":
+                        brief = generate_week_ahead()
+                    else:
+                        brief = generate_brief(region, brief_type, trigger)
+                    output_file = save_brief(brief, region, brief_type)
+                    if trigger:
+                        mark_trigger_consumed(trigger, region, brief_type)
+                    guard.record(digest, [output_file])
+                    print(f"  ✓ Complete: {brief['headline']}")
+                    return 0
+                except Exception as e:
+                    print(f"  ✗ Error: {e}")
+                    metrics.outcome, metrics.error = "failed", f"{type(e).__name__}: {e}"
+                    import traceback
+                    traceback.print_exc()
+                    return 1
+        except JobLocked as e:
+            print(f"{e} - skipping")
+            metrics.outcome = "skipped"
+            return 0
 
 
 if __name__ == "__main__":
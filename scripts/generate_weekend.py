@@ -16,13 +16,25 @@ Sections:
 """
 
 import os
-import json
-import re
-from datetime import datetime, timedelta
-import requests
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+
+from content_archive import archive_document
+from content_manifest import PUBLISH_LOCK, publish_content
+from generate_brief import extract_json_from_response
+from http_pool import session
+from job_guard import JobGuard, JobLocked, input_hash
+from llm_ledger import prompt_version, record
+from mood_zones import determine_zone
+from publish_queue import enqueue
+from render_static import render_magazine
+from run_metrics import add, metrics_run, span, timed
 
 ANTHROPIC_API_KEY = os.environ.get("ANTHROPIC_API_KEY")
 COINGECKO_API = "https://api.coingecko.com/api/v3"
+MAGAZINE_JOB = "weekend-magazine"
+MAX_RETRIES = 2  # Retry on API and JSON parse failures
 
 # ============================================
 # DYNAMIC HERO IMAGES - Keyword-based with curated fallbacks
@@ -79,6 +91,7 @@ FALLBACK_IMAGES = {
     "weekend": "photo-1507003211169-0a1dd7228f2d",
 }
 
+@timed("build_image_url")
 def build_image_url(keywords: str, fallback: str = "default") -> str:
     """Build Unsplash URL from AI-generated keywords using curated images"""
     
@@ -234,6 +247,7 @@ def get_mechanism_topic():
     }
 
 
+@timed("fetch_market_data")
 def fetch_weekly_market_data():
     """Fetch 7-day market data from CoinGecko"""
     data = {
@@ -247,7 +261,7 @@ def fetch_weekly_market_data():
     
     try:
         # Global data
-        global_resp = requests.get(f"{COINGECKO_API}/global", timeout=10)
+        global_resp = session().get(f"{COINGECKO_API}/global", timeout=10)
         if global_resp.ok:
             global_data = global_resp.json().get("data", {})
             data["total_market_cap"] = global_data.get("total_market_cap", {}).get("usd", 0)
@@ -256,7 +270,7 @@ def fetch_weekly_market_data():
             data["market_cap_change_24h"] = global_data.get("market_cap_change_percentage_24h_usd", 0)
         
         # Top coins with 7d and 30d data
-        coins_resp = requests.get(
+        coins_resp = session().get(
             f"{COINGECKO_API}/coins/markets",
             params={
                 "vs_currency": "usd",
@@ -309,6 +323,7 @@ def fetch_weekly_market_data():
     return data
 
 
+@timed("calculate_market_mood")
 def calculate_market_mood(market_data):
     """Calculate market mood for the 9-box grid"""
     top_coins = market_data.get("top_coins", [])
@@ -358,34 +373,6 @@ def calculate_market_mood(market_data):
     }
 
 
-def determine_zone(breadth, volume_ratio):
-    """Determine which of the 9 zones based on breadth and volume"""
-    # Breadth: 0-33 = left, 33-66 = middle, 66-100 = right
-    # Volume: 0-33 = bottom, 33-66 = middle, 66-100 = top
-    
-    if volume_ratio >= 66:  # Frenzied (top row)
-        if breadth < 33:
-            return "concentration"
-        elif breadth < 66:
-            return "leadership"
-        else:
-            return "strong-rally"
-    elif volume_ratio >= 33:  # Normal (middle row)
-        if breadth < 33:
-            return "rotation"
-        elif breadth < 66:
-            return "consolidation"
-        else:
-            return "steady-advance"
-    else:  # Quiet (bottom row)
-        if breadth < 33:
-            return "capitulation"
-        elif breadth < 66:
-            return "drift"
-        else:
-            return "weak-rally"
-
-
 def generate_7day_trail(current_breadth, current_volume, top_coins):
     """Generate 7-day trail points based on historical coin performance"""
     trail = []
@@ -686,8 +673,9 @@ IMPORTANT: Every section title MUST be a compelling, specific headline that capt
 """
 
 
-def call_anthropic_api(prompt):
-    """Call Anthropic API to generate magazine content"""
+@timed("call_anthropic_api")
+def call_anthropic_api(prompt, attempt=1):
+    """Call Anthropic API to generate magazine content; every attempt is recorded in the LLM ledger"""
     
     headers = {
         "x-api-key": ANTHROPIC_API_KEY,
@@ -695,6 +683,10 @@ def call_anthropic_api(prompt):
         "anthropic-version": "2023-06-01"
     }
     
+    # Add stronger JSON instruction on retries
+    if attempt > 1:
+        prompt += "\n\nIMPORTANT: Previous attempt failed JSON parsing. Please ensure valid JSON with properly escaped quotes."
+    
     payload = {
         "model": "claude-opus-4-5-20251101",
         "max_tokens": 8000,
@@ -704,30 +696,42 @@ def call_anthropic_api(prompt):
         ]
     }
     
+    ledger = dict(edition=MAGAZINE_JOB, model=payload["model"], prompt_id="weekend-magazine",
+                  prompt_version=prompt_version(get_magazine_prompt), attempt=attempt)
+    started = time.monotonic()
+    
     try:
-        response = requests.post(
-            "https://api.anthropic.com/v1/messages",
-            headers=headers,
-            json=payload,
-            timeout=120
-        )
+        with span("anthropic_request", model=payload["model"]):
+            response = session().post(
+                "https://api.anthropic.com/v1/messages",
+                headers=headers,
+                json=payload,
+                timeout=120
+            )
+            add(bytes_in=len(response.content))
+        latency_ms = (time.monotonic() - started) * 1000
         
         if response.ok:
-            content = response.json()["content"][0]["text"]
+            reply = response.json()
+            content = reply["content"][0]["text"]
             
-            # Extract JSON from response
-            json_match = re.search(r'\{[\s\S]*\}', content)
-            if json_match:
-                return json.loads(json_match.group())
-            else:
-                print("Warning: Could not extract JSON from response")
+            # Same fallback chain as the briefs, so the ledger names the path that worked
+            try:
+                magazine, strategy = extract_json_from_response(content)
+            except ValueError as e:
+                print(f"Warning: Could not extract JSON from response: {e}")
+                record(**ledger, latency_ms=latency_ms, response=reply, error=str(e)[:200])
                 return {"error": "Could not parse response"}
+            record(**ledger, latency_ms=latency_ms, response=reply, parse_strategy=strategy)
+            return magazine
         else:
             print(f"API Error: {response.status_code} - {response.text}")
+            record(**ledger, latency_ms=latency_ms, error=f"API error: {response.status_code}")
             return {"error": f"API error: {response.status_code}"}
             
     except Exception as e:
         print(f"Error calling Anthropic API: {e}")
+        record(**ledger, latency_ms=(time.monotonic() - started) * 1000, error=str(e)[:200])
         return {"error": str(e)}
 
 
@@ -749,8 +753,17 @@ def generate_weekend_magazine():
     
     # Generate magazine content
     print("\n📝 Generating magazine content...")
-    prompt = get_magazine_prompt(market_data, mechanism)
-    magazine_content = call_anthropic_api(prompt)
+    with span("build_prompt"):
+        prompt = get_magazine_prompt(market_data, mechanism)
+    for attempt in range(1, MAX_RETRIES + 1):
+        magazine_content = call_anthropic_api(prompt, attempt)
+        if "error" not in magazine_content:
+            break
+        print(f"  Attempt {attempt} failed: {magazine_content['error']}")
+        if attempt < MAX_RETRIES:
+            add(retries=1)
+            print("  Retrying in 5 seconds...")
+            time.sleep(5)
     
     if "error" in magazine_content:
         print(f"❌ Generation failed: {magazine_content['error']}")
@@ -798,10 +811,15 @@ def generate_weekend_magazine():
     os.makedirs(output_dir, exist_ok=True)
     
     output_path = os.path.join(output_dir, "magazine.json")
-    with open(output_path, "w") as f:
-        json.dump(magazine_content, f, indent=2)
+    with span("save_magazine"), PUBLISH_LOCK:
+        publish_content(output_path, magazine_content)
+        archive_file = archive_document(output_path, magazine_content)
+        page_file = render_magazine(output_path, magazine_content)
+        enqueue(output_path, "Weekend Magazine")
     
     print(f"\n✅ Magazine saved to {output_path}")
+    print(f"   Archived: {archive_file}")
+    print(f"   Prerendered: {page_file}")
     print(f"   Hero: {magazine_content.get('hero', {}).get('headline', 'N/A')}")
     print(f"   Keywords: {hero_keywords}")
     print(f"   Mechanism: {magazine_content.get('mechanism', {}).get('topic', 'N/A')}")
@@ -809,9 +827,34 @@ def generate_weekend_magazine():
     return magazine_content
 
 
+def run_guarded(force=False):
+    """Generate the magazine once per ISO week unless forced (see job_guard.py)"""
+    edition = datetime.now(timezone.utc).strftime("%G-W%V")
+    digest = input_hash(edition, get_mechanism_topic()["topic"])
+    
+    with metrics_run(MAGAZINE_JOB) as metrics:
+        try:
+            with JobGuard(MAGAZINE_JOB) as guard:
+                previous = None if force else guard.completed(digest)
+                if previous:
+                    print(f"⏭️ Magazine for {edition} already generated at {previous['completed_at']} - use --force to regenerate")
+                    metrics.outcome = "skipped"
+                    return True
+                
+                if generate_weekend_magazine() is None:
+                    metrics.outcome = "failed"
+                    return False
+                guard.record(digest, [os.path.join("content", "weekend", "magazine.json")])
+                return True
+        except JobLocked as e:
+            print(f"⏭️ {e} - skipping")
+            metrics.outcome = "skipped"
+            return True
+
+
 if __name__ == "__main__":
     if not ANTHROPIC_API_KEY:
         print("Error: ANTHROPIC_API_KEY environment variable not set")
         exit(1)
     
-    generate_weekend_magazine()
+    exit(0 if run_guarded(force="--force" in sys.argv) else 1)
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+HTTP Pool - The Litmus
+One warm HTTP session per process, shared by every generator, plus a short
+snapshot cache for market data that several jobs read at the same moment.
+
+- session()                         the shared requests.Session (keep-alive
+                                    connection pools per host, thread-safe
+                                    for the GET/POST calls the generators make)
+- get_json(url, ttl=...)            GET and decode JSON. With ttl > 0 a recent
+                                    response is reused, and concurrent callers
+                                    for the same URL wait for a single fetch
+- post_json(url, payload)           POST JSON and decode the reply (Anthropic)
+- NETWORK_ERRORS                    what those raise on network and HTTP errors,
+                                    with or without requests installed
+
+Run as separate scripts the behaviour is what it was before; under
+scheduler.py the briefs, week-ahead and capture_mood share connections and
+CoinGecko snapshots instead of each opening their own.
+
+Requires: requests (optional - falls back to urllib without pooling)
+"""
+
+import json
+import threading
+import time
+import urllib.error
+import urllib.request
+
+from run_metrics import add
+
+try:
+    import requests
+except ImportError:  # Plain urllib, one connection per request
+    requests = None
+
+USER_AGENT = "TheLitmus/1.0"
+POOL_SIZE = 16          # Connections kept per host
+MARKET_TTL = 300        # CoinGecko snapshots shared across jobs for 5 minutes
+
+NETWORK_ERRORS = (urllib.error.URLError, requests.RequestException) if requests else (urllib.error.URLError,)
+
+_session = None
+_session_lock = threading.Lock()
+
+_snapshots = {}         # url -> (fetched_at, payload)
+_url_locks = {}
+_url_locks_lock = threading.Lock()
+
+
+def session():
+    """The process-wide requests.Session (None without requests)."""
+    global _session
+    if requests is None:
+        return None
+    with _session_lock:
+        if _session is None:
+            _session = requests.Session()
+            adapter = requests.adapters.HTTPAdapter(pool_connections=POOL_SIZE, pool_maxsize=POOL_SIZE)
+            _session.mount("https://", adapter)
+            _session.mount("http://", adapter)
+            _session.headers["User-Agent"] = USER_AGENT
+    return _session
+
+
+def fetch_json(url: str, timeout: float = 30, headers: dict = None):
+    """Uncached GET through the shared session; raises on HTTP errors."""
+    if requests is None:
+        request = urllib.request.Request(url, headers={"User-Agent": USER_AGENT, **(headers or {})})
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            body = response.read()
+        add(bytes_in=len(body))
+        return json.loads(body.decode())
+
+    response = session().get(url, headers=headers, timeout=timeout)
+    response.raise_for_status()
+    add(bytes_in=len(response.content))
+    return response.json()
+
+
+def post_json(url: str, payload: dict, timeout: float = 120, headers: dict = None):
+    """POST a JSON body through the shared session and decode the JSON reply."""
+    data = json.dumps(payload).encode()
+    add(bytes_out=len(data))
+    if requests is None:
+        request = urllib.request.Request(
+            url,
+            data=data,
+            headers={"User-Agent": USER_AGENT, "Content-Type": "application/json", **(headers or {})},
+        )
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            body = response.read()
+        add(bytes_in=len(body))
+        return json.loads(body.decode())
+
+    response = session().post(url, data=data, headers={"Content-Type": "application/json", **(headers or {})}, timeout=timeout)
+    response.raise_for_status()
+    add(bytes_in=len(response.content))
+    return response.json()
+
+
+def url_lock(url: str) -> threading.Lock:
+    with _url_locks_lock:
+        return _url_locks.setdefault(url, threading.Lock())
+
+
+def get_json(url: str, ttl: float = 0, timeout: float = 30, headers: dict = None):
+    """GET JSON, reusing a response younger than ttl seconds."""
+    if ttl <= 0:
+        return fetch_json(url, timeout, headers)
+
+    with url_lock(url):
+        cached = _snapshots.get(url)
+        if cached and time.monotonic() - cached[0] < ttl:
+            return cached[1]
+        payload = fetch_json(url, timeout, headers)
+        _snapshots[url] = (time.monotonic(), payload)
+        return payload
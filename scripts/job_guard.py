@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Job Guard - The Litmus
+Makes the content generators idempotent when several triggers fire for the
+same edition (schedule + workflow_run + manual dispatch, or a local daemon).
+
+Two guards per job:
+- Advisory lock (.cache/locks/<job>.lock, fcntl) - an overlapping run on the
+  same machine exits at once instead of generating in parallel
+- Input manifest (data/jobs/<job>.json) - maps the hash of a run's inputs to
+  the outputs it produced; a run whose inputs hash the same and whose outputs
+  still exist is skipped. Manifests are committed with the content so the
+  check survives a fresh checkout.
+
+Usage:
+    digest = input_hash(text, voice_id, settings)
+    with JobGuard("weekend-audio") as guard:
+        if guard.completed(digest):
+            return
+        ...
+        guard.record(digest, [output_path])
+
+Run: python scripts/job_guard.py [job]    Show recorded runs
+"""
+
+import hashlib
+import json
+import os
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:  # Windows - run without the lock, the manifest still applies
+    fcntl = None
+
+# Paths - outputs are recorded relative to the repo root
+SCRIPT_DIR = Path(__file__).parent
+REPO_ROOT = SCRIPT_DIR.parent
+JOBS_DIR = REPO_ROOT / "data" / "jobs"
+LOCK_DIR = REPO_ROOT / ".cache" / "locks"
+
+MAX_RUNS = 30   # Runs kept per job manifest (batch audio records one per episode)
+
+
+class JobLocked(Exception):
+    """Another process holds the job's lock."""
+
+
+def input_hash(*inputs) -> str:
+    """Stable sha256 over the inputs of a run.
+
+    Paths contribute their file contents; anything else its canonical JSON.
+    """
+    digest = hashlib.sha256()
+    for item in inputs:
+        if isinstance(item, Path):
+            digest.update(item.read_bytes())
+        else:
+            digest.update(json.dumps(item, sort_keys=True, ensure_ascii=False, default=str).encode())
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def edition_key(now: datetime = None) -> str:
+    """UTC date of the current edition - the natural input of a scheduled brief."""
+    return (now or datetime.now(timezone.utc)).strftime("%Y-%m-%d")
+
+
+class JobGuard:
+    """Advisory lock plus input-hash manifest for one job."""
+
+    def __init__(self, job: str):
+        self.job = job
+        self.manifest_path = JOBS_DIR / f"{job}.json"
+        self.lock_path = LOCK_DIR / f"{job}.lock"
+        self.lock_file = None
+
+    def __enter__(self):
+        if fcntl is not None:
+            LOCK_DIR.mkdir(parents=True, exist_ok=True)
+            self.lock_file = open(self.lock_path, "a")
+            try:
+                fcntl.flock(self.lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                self.lock_file.close()
+                self.lock_file = None
+                raise JobLocked(f"{self.job} is already running")
+        return self
+
+    def __exit__(self, *exc):
+        if self.lock_file is not None:
+            fcntl.flock(self.lock_file, fcntl.LOCK_UN)
+            self.lock_file.close()
+            self.lock_file = None
+        return False
+
+    def load(self) -> dict:
+        try:
+            with open(self.manifest_path, "r") as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {"job": self.job, "runs": []}
+
+    def completed(self, digest: str) -> dict:
+        """The recorded run for these inputs if all its outputs still exist, else None."""
+        for run in self.load()["runs"]:
+            if run["input_hash"] == digest and all((REPO_ROOT / path).exists() for path in run["outputs"]):
+                return run
+        return None
+
+    def record(self, digest: str, outputs: list):
+        """Record a finished run (newest first) and write the manifest atomically."""
+        manifest = self.load()
+        runs = [run for run in manifest["runs"] if run["input_hash"] != digest]
+        runs.insert(0, {
+            "input_hash": digest,
+            "outputs": [Path(path).resolve().relative_to(REPO_ROOT.resolve()).as_posix() for path in outputs],
+            "completed_at": datetime.now(timezone.utc).isoformat(),
+        })
+        manifest["runs"] = runs[:MAX_RUNS]
+
+        JOBS_DIR.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.manifest_path.with_name(f".{self.manifest_path.name}.tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(manifest, f, indent=2)
+        os.replace(tmp_path, self.manifest_path)
+
+
+def main():
+    jobs = sys.argv[1:] or sorted(path.stem for path in JOBS_DIR.glob("*.json"))
+    for job in jobs:
+        runs = JobGuard(job).load()["runs"]
+        print(f"{job}: {len(runs)} recorded runs")
+        for run in runs[:5]:
+            print(f"  {run['completed_at']}  {run['input_hash'][:12]}  {', '.join(run['outputs'])}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
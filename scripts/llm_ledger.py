@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+LLM Ledger - The Litmus
+Append-only record of every Anthropic call, so the cost and latency of each
+edition can be tracked week by week.
+
+record() appends one JSON line per call to data/llm-ledger/<YYYY-MM>.jsonl:
+- ts, edition (e.g. "emea-morning", "weekend-magazine"), model, attempt
+- prompt_id and prompt_version - a hash of the prompt builder's source, so
+  a prompt change shows up as a new version without anyone bumping a number
+- input / output / cache write / cache read tokens from the API's usage field
+- latency_ms, stop_reason, parse_strategy (see generate_brief.extract_json_from_response)
+- cost_usd at PRICING, and error for calls that failed
+Lines are never rewritten; the ledger is committed with the content
+(publish_queue.py) so history survives fresh checkouts.
+
+Run:
+  python scripts/llm_ledger.py report [weeks]    Calls, tokens, p50/p95 latency and cost
+                                                 per edition per ISO week (default 8 weeks)
+"""
+
+import hashlib
+import inspect
+import json
+import sys
+import threading
+from datetime import datetime, timedelta, timezone
+
+from job_guard import REPO_ROOT
+from run_metrics import add, percentile
+
+LEDGER_DIR = REPO_ROOT / "data" / "llm-ledger"
+
+# USD per million tokens; cache writes are the 5-minute rate (1.25x input)
+PRICING = {
+    "claude-opus-4-5": {"input": 5.00, "output": 25.00, "cache_write": 6.25, "cache_read": 0.50},
+}
+
+_append_lock = threading.Lock()
+
+
+def prompt_version(*builders) -> str:
+    """Short hash of the source of the functions that build a prompt."""
+    digest = hashlib.sha256()
+    for builder in builders:
+        try:
+            digest.update(inspect.getsource(builder).encode())
+        except (OSError, TypeError):
+            digest.update(builder.__code__.co_code)
+    return digest.hexdigest()[:12]
+
+
+def price_of(model: str) -> dict:
+    return next((price for prefix, price in PRICING.items() if model.startswith(prefix)), None)
+
+
+def cost_of(model: str, tokens: dict) -> float:
+    price = price_of(model)
+    if price is None:
+        return None
+    return round(sum(tokens[kind] * price[kind] for kind in price) / 1_000_000, 6)
+
+
+def record(edition: str, model: str, prompt_id: str, prompt_version: str, attempt: int,
+           latency_ms: float, response: dict = None, parse_strategy: str = None, error: str = None) -> dict:
+    """Append one call to the ledger; response is the decoded Messages API reply (None if it failed)."""
+    usage = (response or {}).get("usage") or {}
+    tokens = {
+        "input": usage.get("input_tokens", 0),
+        "output": usage.get("output_tokens", 0),
+        "cache_write": usage.get("cache_creation_input_tokens") or 0,
+        "cache_read": usage.get("cache_read_input_tokens") or 0,
+    }
+    now = datetime.now(timezone.utc)
+    entry = {
+        "ts": now.isoformat(),
+        "edition": edition,
+        "model": (response or {}).get("model") or model,
+        "prompt_id": prompt_id,
+        "prompt_version": prompt_version,
+        "attempt": attempt,
+        "input_tokens": tokens["input"],
+        "output_tokens": tokens["output"],
+        "cache_write_tokens": tokens["cache_write"],
+        "cache_read_tokens": tokens["cache_read"],
+        "latency_ms": round(latency_ms, 1),
+        "stop_reason": (response or {}).get("stop_reason"),
+        "parse_strategy": parse_strategy,
+        "cost_usd": cost_of(model, tokens),
+        "error": error,
+    }
+
+    LEDGER_DIR.mkdir(parents=True, exist_ok=True)
+    line = json.dumps(entry, separators=(",", ":")) + "\n"
+    with _append_lock, open(LEDGER_DIR / f"{now:%Y-%m}.jsonl", "a", encoding="utf-8") as f:
+        f.write(line)
+
+    add(input_tokens=tokens["input"], output_tokens=tokens["output"], cost_usd=entry["cost_usd"] or 0)
+    if entry["stop_reason"] == "max_tokens":
+        print(f"  ⚠️ {edition}: response hit max_tokens ({tokens['output']} output tokens)")
+    return entry
+
+
+def load_entries(since: datetime) -> list:
+    entries = []
+    for path in sorted(LEDGER_DIR.glob("*.jsonl")):
+        if path.stem < f"{since:%Y-%m}":
+            continue
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    entry = json.loads(line)
+                    if datetime.fromisoformat(entry["ts"]) >= since:
+                        entries.append(entry)
+    return entries
+
+
+def report(weeks: int = 8):
+    since = datetime.now(timezone.utc) - timedelta(weeks=weeks)
+    groups = {}
+    for entry in load_entries(since):
+        week = datetime.fromisoformat(entry["ts"]).strftime("%G-W%V")
+        groups.setdefault(week, {}).setdefault(entry["edition"], []).append(entry)
+    if not groups:
+        print(f"No LLM calls recorded in the last {weeks} weeks ({LEDGER_DIR})")
+        return
+
+    for week, editions in sorted(groups.items()):
+        week_cost = sum(entry["cost_usd"] or 0 for calls in editions.values() for entry in calls)
+        print(f"{week}  ${week_cost:.2f}")
+        for edition, calls in sorted(editions.items()):
+            latencies = [entry["latency_ms"] / 1000 for entry in calls if entry["stop_reason"] or not entry["error"]]
+            failed = sum(1 for entry in calls if entry["error"] or entry["parse_strategy"] is None)
+            truncated = sum(1 for entry in calls if entry["stop_reason"] == "max_tokens")
+            versions = len({entry["prompt_version"] for entry in calls})
+            print(
+                f"  {edition:<18} {len(calls):>3} calls"
+                f"  in {sum(entry['input_tokens'] for entry in calls):>8,}"
+                f"  out {sum(entry['output_tokens'] for entry in calls):>7,}"
+                f"  p50 {percentile(latencies, 0.5):5.1f}s  p95 {percentile(latencies, 0.95):5.1f}s"
+                f"  ${sum(entry['cost_usd'] or 0 for entry in calls):6.2f}"
+                f"{f'  {failed} failed' if failed else ''}"
+                f"{f'  {truncated} max_tokens' if truncated else ''}"
+                f"{f'  {versions} prompt versions' if versions > 1 else ''}"
+            )
+
+
+def main():
+    if len(sys.argv) > 1 and sys.argv[1] == "report":
+        report(int(sys.argv[2]) if len(sys.argv) > 2 else 8)
+        return 0
+    print(__doc__)
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
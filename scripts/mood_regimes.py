@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+Market Mood Regime Analytics - The Litmus
+Classifies every archived hourly mood point (data/mood-archive.json, written by
+capture_mood.py and its backfill) into the 9-box zones and publishes zone
+occupancy, dwell times and a 9x9 transition-probability matrix per window.
+Windows longer than the archive are left out rather than repeating "all".
+Answers questions like "how often does Drift turn into Capitulation?" for
+prompts and the frontend.
+
+Run: python scripts/mood_regimes.py [window ...]
+  window: 24h, 7d, 30d, 1y, all (default: 7d 30d all)
+
+Scheduled daily by scheduler.py (mood-regimes) and .github/workflows/mood-analytics.yml.
+
+Requires: numpy
+"""
+
+import json
+import os
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+
+import numpy as np
+
+from mood_zones import BREADTH_BOUNDS, VOLUME_BOUNDS, MV_RANGE
+
+# Paths
+SCRIPT_DIR = Path(__file__).parent
+DATA_DIR = SCRIPT_DIR.parent / "data"
+MOOD_ARCHIVE_FILE = DATA_DIR / "mood-archive.json"
+REGIMES_FILE = DATA_DIR / "mood-regimes.json"
+
+# Zone index = row * 3 + col, same grid as MOOD_ZONES in app.js
+ZONES = [
+    "concentration", "leadership", "strong-rally",
+    "rotation", "consolidation", "steady-advance",
+    "capitulation", "drift", "weak-rally",
+]
+
+DEFAULT_WINDOWS = ["7d", "30d", "all"]
+WINDOW_UNITS = {"h": 3600, "d": 86400, "w": 7 * 86400, "y": 365 * 86400}
+MAX_GAP_SECONDS = 3 * 3600   # Missing captures longer than this break a spell
+TOP_TRANSITIONS = 5
+
+
+def load_series(archive: dict) -> tuple:
+    """Return (timestamps in epoch seconds, breadth, mv) arrays sorted by time."""
+    timestamps = np.array(archive.get("timestamps", []), dtype=np.int64)
+    breadth = np.array(archive.get("breadth", []), dtype=np.float64)
+    mv = np.array(archive.get("mv", []), dtype=np.float64)
+
+    order = np.argsort(timestamps, kind="stable")
+    return timestamps[order], breadth[order], mv[order]
+
+
+def classify_zones(breadth: np.ndarray, mv: np.ndarray) -> np.ndarray:
+    """Vectorised determine_zone(): zone index for every point."""
+    low, high = MV_RANGE
+    volume = np.clip((1 - (mv - low) / (high - low)) * 100, 0, 100)
+
+    col = np.searchsorted(BREADTH_BOUNDS, breadth, side="right")
+    row = 2 - np.searchsorted(VOLUME_BOUNDS, volume, side="right")
+    return (row * 3 + col).astype(np.int64)
+
+
+def parse_window(window: str) -> int:
+    """Window string (e.g. '7d') to seconds; None means all history."""
+    if window == "all":
+        return None
+    return int(window[:-1]) * WINDOW_UNITS[window[-1]]
+
+
+def analyse_window(timestamps: np.ndarray, zones: np.ndarray) -> dict:
+    """Occupancy, dwell times and transition probabilities for one window."""
+    n = len(zones)
+    gaps = np.diff(timestamps)
+    step = int(np.median(gaps)) if n > 1 else 3600
+    linked = gaps <= MAX_GAP_SECONDS
+
+    # Transitions between consecutive captures (self-transitions included)
+    pairs = zones[:-1][linked] * 9 + zones[1:][linked]
+    counts = np.bincount(pairs, minlength=81).reshape(9, 9)
+    totals = counts.sum(axis=1, keepdims=True)
+    probabilities = np.divide(counts, totals, out=np.zeros((9, 9)), where=totals > 0)
+
+    # Run-length encode into spells; a spell ends on a zone change or a gap
+    breaks = np.flatnonzero((zones[1:] != zones[:-1]) | ~linked) + 1
+    starts = np.concatenate(([0], breaks))
+    ends = np.concatenate((breaks, [n])) - 1
+    spell_zones = zones[starts]
+    spell_hours = (timestamps[ends] - timestamps[starts] + step) / 3600
+
+    occupancy = np.bincount(zones, minlength=9) / n
+    dwell = {}
+    for index in np.unique(spell_zones):
+        hours = spell_hours[spell_zones == index]
+        dwell[ZONES[index]] = {
+            "spells": int(len(hours)),
+            "mean": round(float(hours.mean()), 1),
+            "median": round(float(np.median(hours)), 1),
+            "max": round(float(hours.max()), 1),
+        }
+
+    # Most likely moves out of each zone, for prompts
+    off_diagonal = np.where(np.eye(9, dtype=bool), 0, counts)
+    top = np.argsort(off_diagonal, axis=None)[::-1][:TOP_TRANSITIONS]
+    top_transitions = [
+        {
+            "from": ZONES[i // 9],
+            "to": ZONES[i % 9],
+            "count": int(off_diagonal.flat[i]),
+            "probability": round(float(probabilities.flat[i]), 3),
+        }
+        for i in top if off_diagonal.flat[i] > 0
+    ]
+
+    return {
+        "points": n,
+        "start": datetime.fromtimestamp(int(timestamps[0]), timezone.utc).isoformat(),
+        "end": datetime.fromtimestamp(int(timestamps[-1]), timezone.utc).isoformat(),
+        "current": {"zone": ZONES[spell_zones[-1]], "dwell_hours": round(float(spell_hours[-1]), 1)},
+        "occupancy": {ZONES[i]: round(float(share), 3) for i, share in enumerate(occupancy) if share > 0},
+        "dwell_hours": dwell,
+        "transitions": np.round(probabilities, 3).tolist(),
+        "top_transitions": top_transitions,
+    }
+
+
+def build_regimes(archive: dict, windows: list) -> dict:
+    """Classify the whole archive once, then slice it per window."""
+    timestamps, breadth, mv = load_series(archive)
+    zones = classify_zones(breadth, mv)
+
+    result = {
+        "generated_at": datetime.now(timezone.utc).isoformat(),
+        "zones": ZONES,
+        "windows": {},
+    }
+
+    for window in windows:
+        seconds = parse_window(window)
+        if len(timestamps) < 2:
+            continue
+        if seconds is not None and timestamps[-1] - timestamps[0] + 3600 < seconds:
+            print(f"  {window}: skipped - the archive only covers {(timestamps[-1] - timestamps[0]) / 86400:.1f} days")
+            continue
+        start = 0 if seconds is None else np.searchsorted(timestamps, timestamps[-1] - seconds)
+        result["windows"][window] = analyse_window(timestamps[start:], zones[start:])
+
+    return result
+
+
+def save_regimes(regimes: dict):
+    """Write compact JSON atomically."""
+    DATA_DIR.mkdir(parents=True, exist_ok=True)
+    tmp_path = REGIMES_FILE.with_name(f".{REGIMES_FILE.name}.tmp")
+    with open(tmp_path, "w") as f:
+        json.dump(regimes, f, separators=(",", ":"))
+    os.replace(tmp_path, REGIMES_FILE)
+
+
+def main(windows: list = None):
+    windows = windows or DEFAULT_WINDOWS
+    print(f"[{datetime.now(timezone.utc).isoformat()}] Building mood regime analytics ({', '.join(windows)})...")
+
+    try:
+        with open(MOOD_ARCHIVE_FILE, "r") as f:
+            archive = json.load(f)
+
+        regimes = build_regimes(archive, windows)
+        save_regimes(regimes)
+
+        for window, stats in regimes["windows"].items():
+            print(f"  {window}: {stats['points']} points, now {stats['current']['zone']} for {stats['current']['dwell_hours']}h")
+        print(f"  Saved to {REGIMES_FILE}")
+        return 0
+
+    except (FileNotFoundError, json.JSONDecodeError, KeyError, ValueError) as e:
+        print(f"  ERROR: {e}")
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
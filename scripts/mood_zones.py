@@ -0,0 +1,53 @@
+"""
+Market Mood Zones - The Litmus
+Shared 9-box classification used by the weekend magazine, the hourly mood
+capture and regime analytics.
+
+Breadth (% of coins green) picks the column, volume activity picks the row:
+    volume >= 66   concentration | leadership    | strong-rally
+    volume >= 33   rotation      | consolidation | steady-advance
+    volume <  33   capitulation  | drift         | weak-rally
+"""
+
+# Column / row boundaries on a 0-100 scale
+BREADTH_BOUNDS = (33, 66)
+VOLUME_BOUNDS = (33, 66)
+
+# M/V ratio range mapped onto the volume axis (same as the frontend mvRange).
+# Lower M/V = more volume relative to market cap = more active.
+MV_RANGE = (10, 45)
+
+
+def determine_zone(breadth, volume_ratio):
+    """Determine which of the 9 zones based on breadth and volume"""
+    # Breadth: 0-33 = left, 33-66 = middle, 66-100 = right
+    # Volume: 0-33 = bottom, 33-66 = middle, 66-100 = top
+    
+    if volume_ratio >= VOLUME_BOUNDS[1]:  # Frenzied (top row)
+        if breadth < BREADTH_BOUNDS[0]:
+            return "concentration"
+        elif breadth < BREADTH_BOUNDS[1]:
+            return "leadership"
+        else:
+            return "strong-rally"
+    elif volume_ratio >= VOLUME_BOUNDS[0]:  # Normal (middle row)
+        if breadth < BREADTH_BOUNDS[0]:
+            return "rotation"
+        elif breadth < BREADTH_BOUNDS[1]:
+            return "consolidation"
+        else:
+            return "steady-advance"
+    else:  # Quiet (bottom row)
+        if breadth < BREADTH_BOUNDS[0]:
+            return "capitulation"
+        elif breadth < BREADTH_BOUNDS[1]:
+            return "drift"
+        else:
+            return "weak-rally"
+
+
+def mv_to_volume_ratio(mv):
+    """Map an M/V ratio onto the 0-100 volume axis (low M/V = top row)"""
+    low, high = MV_RANGE
+    normalized = (mv - low) / (high - low)
+    return max(0.0, min(100.0, (1 - normalized) * 100))
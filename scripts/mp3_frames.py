@@ -0,0 +1,180 @@
+"""
+MP3 frame utilities - The Litmus
+Just enough MPEG audio parsing to join separately synthesised MP3 files at
+frame boundaries: skips ID3 tags and Xing/Info/VBRI header frames, and drops
+trailing partial frames so the joined stream decodes cleanly.
+
+Also reads each frame's Layer III side info for a loudness envelope without
+decoding: global_gain is the quantiser step size (1.5 dB per step), so the
+loudest granule's gain tracks the level of the frame and empty granules
+(no Huffman data) are silence.
+"""
+
+# Bitrates in kbps by [MPEG1?][index] for Layer III
+BITRATES = {
+    True: [0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320],
+    False: [0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160],
+}
+
+# Sample rates by version bits (3 = MPEG1, 2 = MPEG2, 0 = MPEG2.5)
+SAMPLE_RATES = {
+    3: [44100, 48000, 32000],
+    2: [22050, 24000, 16000],
+    0: [11025, 12000, 8000],
+}
+
+
+def parse_header(data, offset):
+    """Parse a Layer III frame header at offset; return a dict or None."""
+    if offset + 4 > len(data) or data[offset] != 0xFF or (data[offset + 1] & 0xE0) != 0xE0:
+        return None
+
+    b1, b2, b3 = data[offset + 1], data[offset + 2], data[offset + 3]
+    version = (b1 >> 3) & 0x03
+    layer = (b1 >> 1) & 0x03
+    bitrate_index = b2 >> 4
+    rate_index = (b2 >> 2) & 0x03
+
+    if version == 1 or layer != 1 or bitrate_index in (0, 15) or rate_index == 3:
+        return None
+
+    mpeg1 = version == 3
+    bitrate = BITRATES[mpeg1][bitrate_index] * 1000
+    sample_rate = SAMPLE_RATES[version][rate_index]
+    padding = (b2 >> 1) & 0x01
+    mono = (b3 >> 6) == 3
+
+    return {
+        "mpeg1": mpeg1,
+        "protected": not (b1 & 0x01),
+        "mono": mono,
+        "sample_rate": sample_rate,
+        "samples": 1152 if mpeg1 else 576,
+        "length": (144 if mpeg1 else 72) * bitrate // sample_rate + padding,
+    }
+
+
+def frame_gain(data, offset, header):
+    """Loudest global_gain in the frame's granules/channels; 0 for a silent frame."""
+    start = offset + 4 + (2 if header["protected"] else 0)
+    channels = 1 if header["mono"] else 2
+    if header["mpeg1"]:
+        side_bytes, skip, granules, entry = (17 if channels == 1 else 32), 9 + (5 if channels == 1 else 3) + 4 * channels, 2, 59
+    else:
+        side_bytes, skip, granules, entry = (9 if channels == 1 else 17), 8 + channels, 1, 63
+
+    bits = int.from_bytes(data[start:start + side_bytes], "big")
+    total = side_bytes * 8
+    gain = 0
+    for i in range(granules * channels):
+        position = skip + i * entry                      # part2_3_length(12) big_values(9) global_gain(8)
+        part2_3_length = (bits >> (total - position - 12)) & 0xFFF
+        if part2_3_length:
+            gain = max(gain, (bits >> (total - position - 29)) & 0xFF)
+    return gain
+
+
+def skip_id3v2(data):
+    """Offset of the first byte after any leading ID3v2 tag."""
+    if data[:3] != b"ID3" or len(data) < 10:
+        return 0
+    size = (data[6] << 21) | (data[7] << 14) | (data[8] << 7) | data[9]
+    footer = 10 if data[5] & 0x10 else 0
+    return 10 + size + footer
+
+
+def side_info_length(header):
+    return (32 if not header["mono"] else 17) if header["mpeg1"] else (17 if not header["mono"] else 9)
+
+
+def is_info_frame(data, offset, header):
+    """True for Xing/Info/VBRI frames, which describe the file rather than carry audio."""
+    tag_offset = offset + 4 + side_info_length(header)
+    return data[tag_offset:tag_offset + 4] in (b"Xing", b"Info") or data[offset + 36:offset + 40] == b"VBRI"
+
+
+def encoder_delay(data):
+    """Encoder delay in samples from the LAME tag of a leading Xing/Info frame (0 without one)."""
+    offset = skip_id3v2(data)
+    header = parse_header(data, offset)
+    if header is None:
+        return 0
+    tag = offset + 4 + side_info_length(header)
+    if data[tag:tag + 4] not in (b"Xing", b"Info"):
+        return 0
+
+    # Optional frame count, byte count, TOC and quality fields precede the LAME tag
+    flags = int.from_bytes(data[tag + 4:tag + 8], "big")
+    lame = tag + 8 + 4 * bool(flags & 1) + 4 * bool(flags & 2) + 100 * bool(flags & 4) + 4 * bool(flags & 8)
+    field = data[lame + 21:lame + 24]                    # delay(12) padding(12)
+    return int.from_bytes(field, "big") >> 12 if len(field) == 3 else 0
+
+
+def iter_frames(data):
+    """Yield (offset, header) for every complete audio frame in an MP3 byte string."""
+    offset = skip_id3v2(data)
+    end = len(data) - 128 if data[-128:-125] == b"TAG" else len(data)
+
+    while offset + 4 <= end:
+        header = parse_header(data, offset)
+        if header is None:
+            offset += 1  # Resync on garbage between frames
+            continue
+        if offset + header["length"] > end:
+            break  # Trailing partial frame
+        if not is_info_frame(data, offset, header):
+            yield offset, header
+        offset += header["length"]
+
+
+def audio_frames(data):
+    """Return only the audio frames of an MP3 (no tags, no info frames)."""
+    return b"".join(data[offset:offset + header["length"]] for offset, header in iter_frames(data))
+
+
+def duration_seconds(data):
+    """Playback duration from the frame count."""
+    return sum(header["samples"] / header["sample_rate"] for _, header in iter_frames(data))
+
+
+def frame_levels(data):
+    """(seconds, frame_gain) for every audio frame of an MP3, as append_mp3 collects them."""
+    return [(header["samples"] / header["sample_rate"], frame_gain(data, offset, header)) for offset, header in iter_frames(data)]
+
+
+def append_mp3(data, out, levels=None):
+    """Append the audio frames of one MP3 to an open file; return seconds appended.
+
+    If levels is a list, (seconds, frame_gain) is appended to it for every frame.
+    """
+    seconds = 0.0
+    for offset, header in iter_frames(data):
+        out.write(data[offset:offset + header["length"]])
+        frame_seconds = header["samples"] / header["sample_rate"]
+        if levels is not None:
+            levels.append((frame_seconds, frame_gain(data, offset, header)))
+        seconds += frame_seconds
+    return seconds
+
+
+def peaks(levels, count, range_db=36.0):
+    """Downsample per-frame gains to `count` peak values in 0-100.
+
+    Each bucket takes its loudest frame; levels are in dB below the loudest
+    frame of the episode, with range_db mapped onto the 0-100 scale.
+    """
+    if not levels:
+        return []
+    loudest = max(gain for _, gain in levels) or 1
+    total = sum(seconds for seconds, _ in levels)
+    buckets = [0] * count
+    elapsed = 0.0
+    for seconds, gain in levels:
+        index = min(count - 1, int(elapsed / total * count))
+        if gain:
+            buckets[index] = max(buckets[index], gain)
+        elapsed += seconds
+    return [
+        max(0, round(100 * (1 - (loudest - gain) * 1.5 / range_db))) if gain else 0
+        for gain in buckets
+    ]
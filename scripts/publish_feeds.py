@@ -0,0 +1,382 @@
+#!/usr/bin/env python3
+"""
+Publish Feeds - The Litmus
+One publishing pass over every current edition: loads the content once and
+renders each syndication format from the same items.
+
+- feed.xml             RSS 2.0 (full text, audio enclosures)
+- feed.json            JSON Feed 1.1
+- content/digest.html  email-ready HTML digest (tables, inline styles)
+- sitemap.xml          site pages plus every prerendered edition page,
+                       with Google News tags for editions under two days old
+- llms.txt             the "Latest editions" block between the markers;
+                       the hand-written text around it is left alone
+
+Templates are compiled once per process and items are built once per
+content hash, so the scheduler can call publish() repeatedly without
+rebuilding either. Each format is keyed on the hashes of the artefacts it
+includes (via the job manifest, see job_guard.py): a format whose inputs are
+unchanged is skipped.
+
+Run: python scripts/publish_feeds.py [--force]
+"""
+
+import html
+import json
+import sys
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from string import Template
+from xml.sax.saxutils import escape
+
+from content_manifest import CONTENT_DIR, KNOWN_ARTEFACTS, REPO_ROOT, load_manifest
+from content_writer import atomic_write, write_served
+from job_guard import JobGuard, JobLocked, input_hash
+from render_static import SITE_NAME, SITE_URL, description_of, edition_parts, page_path
+
+FEEDS_JOB = "publish-feeds"
+FEEDS_VERSION = 1        # Bump when a template changes to force a rebuild
+
+# Outputs
+RSS_FILE = REPO_ROOT / "feed.xml"
+JSON_FEED_FILE = REPO_ROOT / "feed.json"
+DIGEST_FILE = CONTENT_DIR / "digest.html"
+SITEMAP_FILE = REPO_ROOT / "sitemap.xml"
+LLMS_FILE = REPO_ROOT / "llms.txt"
+
+FEED_TITLE = f"{SITE_NAME} - Crypto Intelligence"
+FEED_DESCRIPTION = "Daily crypto market briefs for the Americas, EMEA and APAC, plus the weekend magazine."
+NEWS_WINDOW = timedelta(days=2)     # Google News only wants recent articles
+LLMS_START = "<!-- latest-editions:start -->"
+LLMS_END = "<!-- latest-editions:end -->"
+
+# Site pages: (path, changefreq, priority). Lastmod follows the newest edition
+# for pages that show editions and stays at STATIC_LASTMOD for the rest.
+SITE_PAGES = [
+    ("/", "daily", "1.0"),
+    ("/index.html", "daily", "1.0"),
+    ("/weekend.html", "weekly", "0.9"),
+    ("/personal.html", "monthly", "0.7"),
+    ("/media.html", "weekly", "0.6"),
+    ("/terms.html", "yearly", "0.3"),
+    ("/privacy.html", "yearly", "0.3"),
+]
+EDITION_PAGES = {"/", "/index.html", "/weekend.html"}
+STATIC_LASTMOD = "2025-12-10"
+
+# Compiled once per process
+RSS = Template("""<?xml version="1.0" encoding="UTF-8"?>
+<rss version="2.0" xmlns:atom="http://www.w3.org/2005/Atom" xmlns:content="http://purl.org/rss/1.0/modules/content/">
+<channel>
+<title>$title</title>
+<link>$site_url/</link>
+<atom:link href="$site_url/feed.xml" rel="self" type="application/rss+xml"/>
+<description>$description</description>
+<language>en</language>
+<lastBuildDate>$updated</lastBuildDate>
+$items
+</channel>
+</rss>
+""")
+
+RSS_ITEM = Template("""<item>
+<title>$title</title>
+<link>$url</link>
+<guid isPermaLink="false">$guid</guid>
+<pubDate>$published</pubDate>
+<category>$edition</category>
+<description>$summary</description>
+<content:encoded>$content</content:encoded>
+$enclosure</item>""")
+
+DIGEST = Template("""<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="UTF-8">
+<meta name="viewport" content="width=device-width, initial-scale=1.0">
+<title>$title</title>
+</head>
+<body style="margin:0;padding:0;background:#FFF8F2;">
+<table role="presentation" width="100%" cellpadding="0" cellspacing="0" style="background:#FFF8F2;">
+<tr><td align="center" style="padding:24px 12px;">
+<table role="presentation" width="600" cellpadding="0" cellspacing="0" style="max-width:600px;width:100%;font-family:Georgia,serif;color:#1a1a1a;">
+<tr><td style="padding:0 0 16px;border-bottom:1px solid #E8DFD5;font-size:28px;font-weight:700;">$site_name</td></tr>
+<tr><td style="padding:12px 0 24px;font-family:Arial,sans-serif;font-size:13px;color:#7a7a7a;">$date_label</td></tr>
+$items
+<tr><td style="padding:24px 0;font-family:Arial,sans-serif;font-size:12px;color:#7a7a7a;border-top:1px solid #E8DFD5;">
+You are receiving the $site_name digest. <a href="$site_url/" style="color:#12728A;">Read online</a>
+</td></tr>
+</table>
+</td></tr>
+</table>
+</body>
+</html>
+""")
+
+DIGEST_ITEM = Template("""<tr><td style="padding:0 0 32px;">
+<a href="$url"><img src="$image" alt="$image_alt" width="600" style="display:block;width:100%;max-width:600px;height:auto;border:0;"></a>
+<p style="margin:12px 0 4px;font-family:Arial,sans-serif;font-size:11px;font-weight:700;letter-spacing:1px;color:#8A123C;">$edition</p>
+<h2 style="margin:0 0 8px;font-size:22px;font-weight:400;line-height:1.25;"><a href="$url" style="color:#1a1a1a;text-decoration:none;">$title</a></h2>
+<p style="margin:0 0 8px;font-size:16px;line-height:1.5;color:#4a4a4a;">$summary</p>
+<a href="$url" style="font-family:Arial,sans-serif;font-size:13px;font-weight:700;color:#12728A;">Read the full edition &rarr;</a>
+</td></tr>""")
+
+SITEMAP = Template("""<?xml version="1.0" encoding="UTF-8"?>
+<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9"
+        xmlns:news="http://www.google.com/schemas/sitemap-news/0.9">
+$urls
+</urlset>
+""")
+
+SITEMAP_URL = Template("""  <url>
+    <loc>$loc</loc>
+    <lastmod>$lastmod</lastmod>
+    <changefreq>$changefreq</changefreq>
+    <priority>$priority</priority>$news
+  </url>""")
+
+SITEMAP_NEWS = Template("""
+    <news:news>
+      <news:publication><news:name>$site_name</news:name><news:language>en</news:language></news:publication>
+      <news:publication_date>$published</news:publication_date>
+      <news:title>$title</news:title>
+    </news:news>""")
+
+# Items built from each artefact, by content hash
+_items = {}
+
+
+def parse_timestamp(value: str) -> datetime:
+    """generated_at as an aware UTC datetime (the magazine writes naive UTC)."""
+    try:
+        moment = datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        return datetime.now(timezone.utc)
+    return moment if moment.tzinfo else moment.replace(tzinfo=timezone.utc)
+
+
+def build_item(key: str, entry: dict, payload: dict) -> dict:
+    """Everything any format needs about one edition, computed once per content hash."""
+    if entry["hash"] not in _items:
+        parts = edition_parts(payload)
+        audio = payload.get("audio_url")
+        audio_path = REPO_ROOT / audio if audio else None
+        _items[entry["hash"]] = {
+            "key": key,
+            "id": f"{key}:{entry['hash']}",
+            "title": parts["headline"],
+            "edition": parts["edition"],
+            "summary": description_of(parts.get("subtitle") or parts["lead_text"]),
+            "content_html": parts["body"],
+            "image": parts["image"],
+            "image_alt": parts["image_alt"],
+            "url": f"{SITE_URL}/{page_path(REPO_ROOT / entry['path']).relative_to(REPO_ROOT).as_posix()}",
+            "published": parse_timestamp(parts["published"]),
+            "audio_url": f"{SITE_URL}/{audio}" if audio else None,
+            "audio_size": audio_path.stat().st_size if audio_path and audio_path.exists() else 0,
+            "audio_duration": payload.get("audio_duration"),
+        }
+    return _items[entry["hash"]]
+
+
+def load_items() -> list:
+    """Current editions that have a manifest entry, newest first."""
+    artefacts = load_manifest()["artefacts"]
+    items = []
+    for name in KNOWN_ARTEFACTS:
+        key = name[:-len(".json")]
+        path = CONTENT_DIR / name
+        if key not in artefacts or not path.exists():
+            continue
+        with open(path, "r", encoding="utf-8") as f:
+            payload = json.load(f)
+        items.append(build_item(key, artefacts[key], payload))
+    return sorted(items, key=lambda item: item["published"], reverse=True)
+
+
+def render_rss(items: list, now: datetime) -> str:
+    entries = []
+    for item in items:
+        enclosure = ""
+        if item["audio_url"]:
+            enclosure = f'<enclosure url="{escape(item["audio_url"])}" length="{item["audio_size"]}" type="audio/mpeg"/>\n'
+        entries.append(RSS_ITEM.substitute(
+            title=escape(item["title"]),
+            url=escape(item["url"]),
+            guid=escape(item["id"]),
+            published=format_datetime(item["published"]),
+            edition=escape(item["edition"]),
+            summary=escape(item["summary"]),
+            content=escape(item["content_html"]),
+            enclosure=enclosure,
+        ))
+    return RSS.substitute(
+        title=escape(FEED_TITLE),
+        site_url=SITE_URL,
+        description=escape(FEED_DESCRIPTION),
+        updated=format_datetime(now),
+        items="\n".join(entries),
+    )
+
+
+def render_json_feed(items: list) -> dict:
+    entries = []
+    for item in items:
+        entry = {
+            "id": item["id"],
+            "url": item["url"],
+            "title": item["title"],
+            "summary": item["summary"],
+            "content_html": item["content_html"],
+            "image": item["image"],
+            "date_published": item["published"].isoformat(),
+            "tags": [item["edition"]],
+        }
+        if item["audio_url"]:
+            attachment = {"url": item["audio_url"], "mime_type": "audio/mpeg"}
+            if item["audio_size"]:
+                attachment["size_in_bytes"] = item["audio_size"]
+            if item["audio_duration"]:
+                attachment["duration_in_seconds"] = item["audio_duration"]
+            entry["attachments"] = [attachment]
+        entries.append(entry)
+    return {
+        "version": "https://jsonfeed.org/version/1.1",
+        "title": FEED_TITLE,
+        "home_page_url": f"{SITE_URL}/",
+        "feed_url": f"{SITE_URL}/feed.json",
+        "description": FEED_DESCRIPTION,
+        "language": "en",
+        "items": entries,
+    }
+
+
+def render_digest(items: list, now: datetime) -> str:
+    entries = [
+        DIGEST_ITEM.substitute(
+            url=html.escape(item["url"]),
+            image=html.escape(item["image"]),
+            image_alt=html.escape(item["image_alt"]),
+            edition=html.escape(item["edition"].upper()),
+            title=html.escape(item["title"]),
+            summary=html.escape(item["summary"]),
+        )
+        for item in items
+    ]
+    return DIGEST.substitute(
+        title=html.escape(f"{SITE_NAME} digest - {now:%d %B %Y}"),
+        site_name=SITE_NAME,
+        site_url=SITE_URL,
+        date_label=f"{now:%A} {now.day} {now:%B %Y}",
+        items="\n".join(entries),
+    )
+
+
+def render_sitemap(items: list, now: datetime) -> str:
+    newest = items[0]["published"].date().isoformat() if items else STATIC_LASTMOD
+    urls = [
+        SITEMAP_URL.substitute(
+            loc=escape(f"{SITE_URL}{path}"),
+            lastmod=newest if path in EDITION_PAGES else STATIC_LASTMOD,
+            changefreq=changefreq,
+            priority=priority,
+            news="",
+        )
+        for path, changefreq, priority in SITE_PAGES
+    ]
+    for item in items:
+        news = ""
+        if now - item["published"] < NEWS_WINDOW:
+            news = SITEMAP_NEWS.substitute(
+                site_name=escape(SITE_NAME),
+                published=item["published"].isoformat(),
+                title=escape(item["title"]),
+            )
+        urls.append(SITEMAP_URL.substitute(
+            loc=escape(item["url"]),
+            lastmod=item["published"].date().isoformat(),
+            changefreq="weekly" if item["key"].startswith("weekend/") else "daily",
+            priority="0.8",
+            news=news,
+        ))
+    return SITEMAP.substitute(urls="\n\n".join(urls))
+
+
+def render_llms(items: list) -> str:
+    """llms.txt with its generated block replaced (or appended the first time)."""
+    lines = [LLMS_START, "## Latest Editions", ""]
+    lines += [f"- [{item['edition']}: {item['title']}]({item['url']}): {item['summary']}" for item in items]
+    lines.append(LLMS_END)
+    block = "\n".join(lines)
+
+    text = LLMS_FILE.read_text(encoding="utf-8") if LLMS_FILE.exists() else ""
+    if LLMS_START in text and LLMS_END in text:
+        head, _, rest = text.partition(LLMS_START)
+        _, _, tail = rest.partition(LLMS_END)
+        return f"{head}{block}{tail}"
+    return f"{text.rstrip()}\n\n{block}\n"
+
+
+def write_rss(items: list, now: datetime):
+    write_served(RSS_FILE, render_rss(items, now).encode("utf-8"))
+
+
+def write_json_feed(items: list, now: datetime):
+    body = json.dumps(render_json_feed(items), separators=(",", ":"), ensure_ascii=False)
+    write_served(JSON_FEED_FILE, body.encode("utf-8"))
+
+
+def write_digest(items: list, now: datetime):
+    write_served(DIGEST_FILE, render_digest(items, now).encode("utf-8"))
+
+
+def write_sitemap(items: list, now: datetime):
+    atomic_write(SITEMAP_FILE, render_sitemap(items, now).encode("utf-8"))
+
+
+def write_llms(items: list, now: datetime):
+    atomic_write(LLMS_FILE, render_llms(items).encode("utf-8"))
+
+
+# format -> (output files, writer)
+FORMATS = {
+    "rss": ([RSS_FILE], write_rss),
+    "json-feed": ([JSON_FEED_FILE], write_json_feed),
+    "digest": ([DIGEST_FILE], write_digest),
+    "sitemap": ([SITEMAP_FILE], write_sitemap),
+    "llms": ([LLMS_FILE], write_llms),
+}
+
+
+def publish(force: bool = False) -> list:
+    """Render every format whose inputs changed; returns the formats written."""
+    items = load_items()
+    now = datetime.now(timezone.utc)
+    inputs = [item["id"] for item in items]
+    written = []
+
+    with JobGuard(FEEDS_JOB) as guard:
+        for name, (outputs, write) in FORMATS.items():
+            # Google News tags age out, so the sitemap also changes with the date
+            digest = input_hash(name, FEEDS_VERSION, inputs, now.date().isoformat() if name == "sitemap" else None)
+            if not force and guard.completed(digest):
+                continue
+            write(items, now)
+            guard.record(digest, outputs)
+            written.append(name)
+    return written
+
+
+def main():
+    force = "--force" in sys.argv
+    try:
+        written = publish(force)
+    except JobLocked as e:
+        print(f"{e} - skipping")
+        return 0
+    print(f"  Published {', '.join(written)}" if written else "  Feeds are current")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,266 @@
+#!/usr/bin/env python3
+"""
+Publish Queue - The Litmus
+Coalesces content changes into one commit, push and deploy per window
+instead of one full site build per artefact.
+
+Generators call enqueue(path, message) after publishing an artefact; the
+queue (.cache/publish-queue.json) records the artefact's manifest hash, or
+for files outside content/ (the hourly data/snapshots) a hash of the file
+itself. flush() then, once the oldest queued change is PUBLISH_WINDOW seconds
+old, a change queued with a shorter window is due (the snapshots use 0: the
+endpoints only serve them for a few minutes), or at once with --now:
+- drops artefacts whose hash is the one already deployed
+  (data/publish-state.json, committed with the content) - if nothing is left,
+  there is no commit and no deploy
+- stages PUBLISH_PATHS, makes one commit naming every queued change and
+  pushes it to PUBLISH_REMOTE
+- POSTs PUBLISH_DEPLOY_HOOK once, and records the deployed hashes
+
+Staging and the commit hold content_manifest.PUBLISH_LOCK, so a generator
+saving in the same process never has half its files in a commit. Only
+queued artefacts trigger a flush: the LLM ledger and job manifests
+(data/llm-ledger, data/jobs) are not queued, so what a failed run writes
+there is committed with the next published artefact, not on its own.
+
+A failed push leaves the queue in place; a failed deploy is retried on the
+next flush even when there is nothing new to commit.
+
+Configuration (environment):
+  PUBLISH_WINDOW        seconds to collect changes before publishing (900)
+  PUBLISH_REMOTE        git remote name or URL - a local bare repo works (origin)
+  PUBLISH_BRANCH        branch to push to (the current branch)
+  PUBLISH_DEPLOY_HOOK   deploy hook URL; unset = push without deploying
+
+Run:
+  python scripts/publish_queue.py enqueue <path> [message]   Queue an artefact
+  python scripts/publish_queue.py flush [--now]              Publish if the window has passed
+  python scripts/publish_queue.py status                     Show queued changes
+
+Test against a local bare repo and any stub on :8765 that answers POST with 200:
+  git init --bare /tmp/site.git
+  PUBLISH_REMOTE=/tmp/site.git PUBLISH_DEPLOY_HOOK=http://localhost:8765/deploy \\
+      python scripts/publish_queue.py flush --now
+"""
+
+import hashlib
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+from datetime import datetime, timezone
+from pathlib import Path
+
+from content_manifest import HASH_LENGTH, PUBLISH_LOCK, artefact_key, load_manifest
+from content_writer import atomic_write
+from job_guard import REPO_ROOT, JobGuard, JobLocked
+
+PUBLISH_JOB = "publish"
+QUEUE_FILE = REPO_ROOT / ".cache" / "publish-queue.json"
+STATE_FILE = REPO_ROOT / "data" / "publish-state.json"
+
+PUBLISH_WINDOW = int(os.environ.get("PUBLISH_WINDOW", "900"))
+PUBLISH_REMOTE = os.environ.get("PUBLISH_REMOTE", "origin")
+PUBLISH_BRANCH = os.environ.get("PUBLISH_BRANCH", "")
+PUBLISH_DEPLOY_HOOK = os.environ.get("PUBLISH_DEPLOY_HOOK", "")
+DEPLOY_TIMEOUT = 30
+
+# Everything the generators and the feed pass write (git pathspecs)
+PUBLISH_PATHS = [
+    "content",
+    "data/jobs",
+    "data/correlation",
+    "data/llm-ledger",
+    "data/mood-archive.json",
+    "data/mood-history.json",
+    "data/mood-regimes.json",
+    "data/publish-state.json",
+    "data/snapshots",
+    "feed.xml",
+    "feed.json",
+    "sitemap.xml",
+    "llms.txt",
+]
+
+_queue_lock = threading.Lock()
+
+
+def load_json(path: Path, default: dict) -> dict:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return default
+
+
+def load_queue() -> dict:
+    return load_json(QUEUE_FILE, {"changes": {}, "deploy_pending": False})
+
+
+def save_queue(queue: dict):
+    atomic_write(QUEUE_FILE, json.dumps(queue, indent=2).encode())
+
+
+def load_state() -> dict:
+    return load_json(STATE_FILE, {"deployed": {}, "published_at": None})
+
+
+def change_hash(path) -> tuple:
+    """Queue key and hash: the manifest entry for content/, the file's own sha256 elsewhere."""
+    try:
+        key = artefact_key(path)
+    except ValueError:
+        path = Path(path).resolve()
+        key = path.relative_to(REPO_ROOT).as_posix()
+        return key, hashlib.sha256(path.read_bytes()).hexdigest()[:HASH_LENGTH]
+    return key, load_manifest()["artefacts"].get(key, {}).get("hash")
+
+
+def enqueue(path, message: str = "", window: int = None) -> dict:
+    """Queue a published file for the next flush, due after window seconds (PUBLISH_WINDOW)."""
+    key, digest = change_hash(path)
+    with _queue_lock:
+        queue = load_queue()
+        change = queue["changes"].get(key, {})
+        queue["changes"][key] = {
+            "hash": digest,
+            "message": message or key,
+            "queued_at": change.get("queued_at") or time.time(),
+            "window": min(change.get("window", PUBLISH_WINDOW), PUBLISH_WINDOW if window is None else window),
+        }
+        save_queue(queue)
+    return queue["changes"][key]
+
+
+def git(*args, check: bool = True) -> subprocess.CompletedProcess:
+    return subprocess.run(["git", *args], cwd=REPO_ROOT, capture_output=True, text=True, check=check)
+
+
+def post_deploy_hook() -> bool:
+    if not PUBLISH_DEPLOY_HOOK:
+        return True
+    request = urllib.request.Request(PUBLISH_DEPLOY_HOOK, data=b"", method="POST")
+    try:
+        with urllib.request.urlopen(request, timeout=DEPLOY_TIMEOUT) as response:
+            return 200 <= response.status < 300
+    except (urllib.error.URLError, OSError) as e:
+        print(f"  ⚠️ Deploy hook failed: {e}")
+        return False
+
+
+def publish_pathspecs() -> list:
+    """PUBLISH_PATHS that exist or are tracked - git add fails on a pathspec matching nothing."""
+    return [spec for spec in PUBLISH_PATHS
+            if any(REPO_ROOT.glob(spec)) or git("ls-files", "--", spec).stdout]
+
+
+def commit_and_push(messages: list) -> str:
+    """Stage the publish paths, commit once and push; returns the commit (None if nothing staged)."""
+    subject = f"📰 {messages[0]}" if len(messages) == 1 else f"📰 Publish {len(messages)} updates"
+    body = "\n".join(f"- {message}" for message in messages)
+    with PUBLISH_LOCK:
+        git("add", "-A", "--", *publish_pathspecs())
+        if git("diff", "--staged", "--quiet", check=False).returncode == 0:
+            return None
+        git("commit", "-m", f"{subject} - {datetime.now(timezone.utc):%Y-%m-%d %H:%M} UTC", "-m", body)
+    git("push", PUBLISH_REMOTE, f"HEAD:{PUBLISH_BRANCH}" if PUBLISH_BRANCH else "HEAD")
+    return git("rev-parse", "HEAD").stdout.strip()
+
+
+def flush(now: bool = False) -> str:
+    """Publish the queue if its window has passed; returns what happened."""
+    with _queue_lock:
+        queue = load_queue()
+    changes = queue["changes"]
+    if not changes and not queue["deploy_pending"]:
+        return "empty"
+
+    due = min((change["queued_at"] + change.get("window", PUBLISH_WINDOW) for change in changes.values()), default=0)
+    if not now and time.time() < due:
+        return "waiting"
+
+    state = load_state()
+    pending = {key: change for key, change in changes.items() if state["deployed"].get(key) != change["hash"]}
+    commit = None
+    if pending:
+        state["deployed"].update({key: change["hash"] for key, change in pending.items()})
+        state["published_at"] = datetime.now(timezone.utc).isoformat()
+        previous = STATE_FILE.read_bytes() if STATE_FILE.exists() else None
+        atomic_write(STATE_FILE, json.dumps(state, indent=2).encode())
+
+        try:
+            commit = commit_and_push(sorted(change["message"] for change in pending.values()))
+        except subprocess.CalledProcessError as e:
+            # Nothing went out - put the state back so the next flush retries
+            if previous is None:
+                STATE_FILE.unlink(missing_ok=True)
+            else:
+                atomic_write(STATE_FILE, previous)
+            print(f"  ✗ git {e.cmd[1]} failed: {e.stderr.strip()}")
+            return "failed"
+    elif not queue["deploy_pending"]:
+        print(f"  {len(changes)} queued artefacts unchanged since the last deploy - nothing to publish")
+        clear_queue(changes)
+        return "unchanged"
+
+    if not post_deploy_hook():
+        clear_queue(changes, deploy_pending=True)
+        return "deploy-failed"
+
+    clear_queue(changes)
+    if pending:
+        print(f"  ✓ Published {len(pending)} artefacts in {commit[:12] if commit else 'the current commit'}")
+    else:
+        print("  ✓ Retried the deploy hook")
+    return "published"
+
+
+def clear_queue(flushed: dict, deploy_pending: bool = False):
+    """Drop flushed changes, keeping anything queued since with a different hash."""
+    with _queue_lock:
+        queue = load_queue()
+        for key, change in flushed.items():
+            if queue["changes"].get(key, {}).get("hash") == change["hash"]:
+                del queue["changes"][key]
+        queue["deploy_pending"] = deploy_pending
+        save_queue(queue)
+
+
+def main():
+    command = sys.argv[1] if len(sys.argv) > 1 else "status"
+
+    if command == "enqueue" and len(sys.argv) > 2:
+        change = enqueue(Path(sys.argv[2]), " ".join(sys.argv[3:]))
+        print(f"  Queued {sys.argv[2]} ({change['hash']})")
+        return 0
+
+    if command == "flush":
+        try:
+            with JobGuard(PUBLISH_JOB):
+                result = flush(now="--now" in sys.argv)
+        except JobLocked as e:
+            print(f"{e} - skipping")
+            return 0
+        print(f"  Publish queue: {result}")
+        return 1 if result in ("failed", "deploy-failed") else 0
+
+    if command == "status":
+        changes = load_queue()["changes"]
+        deployed = load_state()["deployed"]
+        for key, change in sorted(changes.items()):
+            age = int(time.time() - change["queued_at"])
+            flag = "unchanged" if deployed.get(key) == change["hash"] else "pending"
+            print(f"  {key:<20} {change['hash']}  {flag:<9}  queued {age}s ago  {change['message']}")
+        print(f"  {len(changes)} queued, window {PUBLISH_WINDOW}s")
+        return 0
+
+    print(__doc__)
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,321 @@
+#!/usr/bin/env python3
+"""
+Static Render - The Litmus
+Prerenders every edition to a complete HTML page at save time, so crawlers
+and first-time readers get the brief in the first response instead of
+waiting for app.js / weekend.js to fetch and render the JSON.
+
+- content/<region>/<type>.html      daily briefs (from save_brief)
+- content/week-ahead.html           the Week Ahead
+- content/weekend/magazine.html     the weekend magazine (from generate_weekend_magazine)
+
+Each page inlines its critical CSS, carries the hero image metadata (preload,
+Open Graph / Twitter card, NewsArticle JSON-LD, width and height so nothing
+shifts) and links to the interactive app for the live market panels.
+
+Run: python scripts/render_static.py    Render every edition in content/
+"""
+
+import html
+import json
+import re
+import sys
+from datetime import datetime
+from pathlib import Path
+from string import Template
+
+from content_manifest import CONTENT_DIR, KNOWN_ARTEFACTS, REPO_ROOT
+from content_writer import write_served
+
+SITE_URL = "https://sirruna.com"
+SITE_NAME = "Sirruna"
+HERO_WIDTH = 1200
+HERO_HEIGHT = 600
+DESCRIPTION_LENGTH = 160
+
+REGION_NAMES = {"apac": "APAC", "emea": "EMEA", "americas": "Americas", "global": "Global"}
+
+# Magazine sections in reading order, labelled as weekend.js labels them
+MAGAZINE_SECTIONS = [
+    ("week_in_review", "THE WEEK IN REVIEW"),
+    ("apac", "ASIA-PACIFIC"),
+    ("emea", "EUROPE & MIDDLE EAST"),
+    ("americas", "AMERICAS"),
+    ("capital_flows", "CAPITAL FLOWS"),
+    ("corporate", "CORPORATE MOVES"),
+    ("week_ahead", "THE WEEK AHEAD"),
+    ("mechanism", "THE MECHANISM"),
+]
+
+# Closing quote fields, shown as a pull quote rather than a section
+QUOTE_FIELDS = ("the_takeaway", "the_closing_line")
+
+# Only what the first screen needs - style.css loads without blocking
+CRITICAL_CSS = """
+:root{--burgundy:#8A123C;--teal:#12728A;--paper:#FFF8F2;--rule:#E8DFD5;--ink:#1a1a1a;--ink-secondary:#4a4a4a;--ink-tertiary:#7a7a7a;--serif-display:'Bodoni Moda',Georgia,serif;--serif:'DM Serif Display',Georgia,serif;--sans:'DM Sans',-apple-system,sans-serif}
+*{box-sizing:border-box}
+body{margin:0;background:var(--paper);color:var(--ink);font-family:var(--sans);line-height:1.65}
+.static-masthead{display:flex;justify-content:space-between;align-items:baseline;max-width:46rem;margin:0 auto;padding:1.25rem 1rem;border-bottom:1px solid var(--rule)}
+.static-masthead a{color:var(--ink);text-decoration:none}
+.static-brand{font-family:var(--serif-display);font-size:1.6rem;font-weight:700}
+.static-edition{font-size:.8rem;letter-spacing:.08em;text-transform:uppercase;color:var(--ink-tertiary)}
+.static-article{max-width:46rem;margin:0 auto;padding:1.5rem 1rem 3rem}
+.static-hero{margin:0 0 1.5rem}
+.static-hero img{display:block;width:100%;height:auto;aspect-ratio:2/1;object-fit:cover;background:var(--rule)}
+.article-label{font-size:.75rem;font-weight:700;letter-spacing:.1em;color:var(--burgundy)}
+h1,h2{font-family:var(--serif);font-weight:400;line-height:1.2}
+h1{font-size:2.2rem;margin:.25rem 0 .5rem}
+h2{font-size:1.5rem;margin:.25rem 0 .75rem}
+.static-subtitle{font-size:1.15rem;color:var(--ink-secondary);margin:0 0 .5rem}
+.static-byline{font-size:.85rem;color:var(--ink-tertiary);margin-bottom:2rem}
+.static-section{margin:0 0 2.5rem}
+.static-section p{margin:0 0 1rem}
+.sub-region-header{font-family:var(--serif);font-weight:400;font-size:1.15rem;margin:1.25rem 0 .5rem}
+.takeaway-text{font-family:var(--serif);font-size:1.35rem;border-left:3px solid var(--burgundy);margin:2rem 0;padding-left:1rem}
+.static-open{display:inline-block;margin-top:1rem;color:var(--teal);font-weight:700}
+"""
+
+PAGE = Template("""<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="UTF-8">
+<meta name="viewport" content="width=device-width, initial-scale=1.0">
+<title>$title</title>
+<meta name="description" content="$description">
+<meta name="robots" content="index, follow">
+<link rel="canonical" href="$url">
+<meta property="og:type" content="article">
+<meta property="og:url" content="$url">
+<meta property="og:title" content="$headline">
+<meta property="og:description" content="$description">
+<meta property="og:image" content="$image">
+<meta property="og:image:width" content="$image_width">
+<meta property="og:image:height" content="$image_height">
+<meta property="og:image:alt" content="$image_alt">
+<meta property="og:site_name" content="$site_name">
+<meta property="article:published_time" content="$published">
+<meta name="twitter:card" content="summary_large_image">
+<meta name="twitter:title" content="$headline">
+<meta name="twitter:description" content="$description">
+<meta name="twitter:image" content="$image">
+<link rel="preload" as="image" href="$image" fetchpriority="high">
+<style>$critical_css</style>
+<link rel="stylesheet" href="/style.css" media="print" onload="this.media='all'">
+<script type="application/ld+json">$json_ld</script>
+</head>
+<body>
+<header class="static-masthead">
+<a class="static-brand" href="$app_url">$site_name</a>
+<span class="static-edition">$edition</span>
+</header>
+<main class="static-article">
+<article>
+<figure class="static-hero"><img src="$image" alt="$image_alt" width="$image_width" height="$image_height" fetchpriority="high"></figure>
+<span class="article-label">$label</span>
+<h1>$headline</h1>
+$subtitle<div class="static-byline"><time datetime="$published">$published_label</time></div>
+$body
+</article>
+<a class="static-open" href="$app_url">Open the full edition with live markets &rarr;</a>
+</main>
+</body>
+</html>
+""")
+
+
+def paragraphs(content: str) -> list:
+    """Paragraphs as the app shows them: bullet lists stay lists, blank lines split paragraphs."""
+    content = (content or "").strip()
+    if not content:
+        return []
+    if "•" in content or re.search(r"^[-–—]\s", content, re.M):
+        items = [item.strip() for item in re.split(r"\s*•\s*", content) if item.strip()]
+        return ['<ul class="editorial-bullets">' + "".join(f"<li>{html.escape(item)}</li>" for item in items) + "</ul>"]
+    return [f"<p>{html.escape(part.strip())}</p>" for part in re.split(r"\n\s*\n", content) if part.strip()]
+
+
+def section_html(label: str, title: str, content) -> str:
+    """One <section>: label, title and body (sub-regions get their own headers)."""
+    parts = [f'<section class="static-section"><span class="article-label">{html.escape(label)}</span>']
+    if title:
+        parts.append(f"<h2>{html.escape(title)}</h2>")
+    if isinstance(content, dict):
+        for key, value in content.items():
+            if isinstance(value, dict) and value.get("name"):
+                parts.append(f'<h3 class="sub-region-header">{html.escape(value["name"])}</h3>')
+                parts.extend(paragraphs(value.get("content", "")))
+            elif key == "content":
+                parts.extend(paragraphs(value))
+    else:
+        parts.extend(paragraphs(content))
+    parts.append("</section>")
+    return "".join(parts)
+
+
+def label_of(key: str) -> str:
+    """'the_lead' -> 'THE LEAD'"""
+    return key.replace("_", " ").upper()
+
+
+def description_of(text: str) -> str:
+    text = " ".join((text or "").replace("•", " ").split())
+    return text if len(text) <= DESCRIPTION_LENGTH else text[:DESCRIPTION_LENGTH - 1].rsplit(" ", 1)[0] + "…"
+
+
+def published_label(timestamp: str) -> str:
+    try:
+        published = datetime.fromisoformat(timestamp)
+        return f"{published:%A} {published.day} {published:%B %Y · %H:%M}"
+    except (TypeError, ValueError):
+        return ""
+
+
+def page_url(path: Path) -> str:
+    return f"{SITE_URL}/{Path(path).resolve().relative_to(REPO_ROOT.resolve()).as_posix()}"
+
+
+def render_page(path: Path, *, headline, label, edition, body, image, image_alt, lead_text,
+                published, subtitle="", app_url="/") -> Path:
+    """Fill the page template and write it."""
+    url = page_url(path)
+    description = description_of(subtitle or lead_text)
+    json_ld = {
+        "@context": "https://schema.org",
+        "@type": "NewsArticle",
+        "headline": headline,
+        "description": description,
+        "image": [{"@type": "ImageObject", "url": image, "width": HERO_WIDTH, "height": HERO_HEIGHT}],
+        "datePublished": published,
+        "mainEntityOfPage": url,
+        "publisher": {"@type": "Organization", "name": SITE_NAME, "logo": {"@type": "ImageObject", "url": f"{SITE_URL}/litmuslogo.png"}},
+    }
+    page = PAGE.substitute(
+        title=html.escape(f"{headline} | {SITE_NAME} {edition}"),
+        headline=html.escape(headline),
+        description=html.escape(description),
+        url=url,
+        image=html.escape(image),
+        image_alt=html.escape(image_alt),
+        image_width=HERO_WIDTH,
+        image_height=HERO_HEIGHT,
+        site_name=SITE_NAME,
+        published=html.escape(published or ""),
+        published_label=published_label(published),
+        critical_css=CRITICAL_CSS.strip(),
+        json_ld=json.dumps(json_ld, ensure_ascii=False).replace("</", "<\\/"),
+        app_url=app_url,
+        edition=html.escape(edition),
+        label=html.escape(label),
+        subtitle=f'<p class="static-subtitle">{html.escape(subtitle)}</p>\n' if subtitle else "",
+        body=body,
+    )
+    return write_served(path, page.encode("utf-8"))
+
+
+def brief_parts(brief: dict) -> dict:
+    """Page fields for a daily brief or the Week Ahead."""
+    sections = brief.get("sections", {})
+    keys = [key for key in sections if not key.endswith("_title") and key not in QUOTE_FIELDS]
+
+    body = []
+    for index, key in enumerate(keys):
+        value = sections[key]
+        title = sections.get(f"{key}_title") or (value.get("title") if isinstance(value, dict) else "")
+        # The lead's title is the page headline already
+        body.append(section_html(label_of(key), "" if index == 0 else title, value))
+    for key in QUOTE_FIELDS:
+        if sections.get(key):
+            body.append(f'<blockquote class="takeaway-text">{html.escape(str(sections[key]))}</blockquote>')
+
+    lead = sections.get(keys[0], "") if keys else ""
+    lead_text = lead.get("content", "") if isinstance(lead, dict) else lead
+    brief_type = brief.get("type", "")
+    region = REGION_NAMES.get(brief.get("region", ""), brief.get("region", "").upper())
+    edition = "The Week Ahead" if brief_type == "week-ahead" else f"{region} {brief_type.title()} Brief"
+
+    return {
+        "headline": brief.get("headline", ""),
+        "label": label_of(keys[0]) if keys else "",
+        "edition": edition,
+        "body": "\n".join(body),
+        "image": brief.get("image_url", ""),
+        "image_alt": brief.get("image_keywords", "") or brief.get("headline", ""),
+        "lead_text": lead_text,
+        "published": brief.get("generated_at", ""),
+        "app_url": "/",
+    }
+
+
+def magazine_parts(magazine: dict) -> dict:
+    """Page fields for the weekend magazine."""
+    hero = magazine.get("hero", {})
+    body = []
+    for field, label in MAGAZINE_SECTIONS:
+        section = magazine.get(field)
+        if not section:
+            continue
+        title = section.get("title", "")
+        if field == "mechanism":
+            title = section.get("topic") or title
+        body.append(section_html(label, title, section.get("content", "")))
+
+    if magazine.get("key_dates"):
+        dates = "".join(
+            f"<li><strong>{html.escape(item.get('day', ''))}</strong> {html.escape(item.get('event', ''))}</li>"
+            for item in magazine["key_dates"]
+        )
+        body.append(f'<section class="static-section"><span class="article-label">KEY DATES</span><ul>{dates}</ul></section>')
+
+    return {
+        "headline": hero.get("headline", ""),
+        "label": "THE WEEKEND EDITION",
+        "edition": "Weekend",
+        "body": "\n".join(body),
+        "image": hero.get("image_url", ""),
+        "image_alt": hero.get("image_keywords", "") or hero.get("headline", ""),
+        "lead_text": magazine.get("week_in_review", {}).get("content", ""),
+        "published": magazine.get("generated_at", ""),
+        "subtitle": hero.get("subtitle", ""),
+        "app_url": "/weekend.html",
+    }
+
+
+def edition_parts(payload: dict) -> dict:
+    """Page fields for whichever kind of edition payload is (also used by publish_feeds.py)."""
+    return magazine_parts(payload) if "hero" in payload else brief_parts(payload)
+
+
+def page_path(json_path) -> Path:
+    """content/emea/morning.json -> content/emea/morning.html"""
+    return Path(json_path).with_suffix(".html")
+
+
+def render_brief(json_path, brief: dict) -> Path:
+    """content/<region>/<type>.json -> .html beside it"""
+    return render_page(page_path(json_path), **brief_parts(brief))
+
+
+def render_magazine(json_path, magazine: dict) -> Path:
+    """content/weekend/magazine.json -> magazine.html"""
+    return render_page(page_path(json_path), **magazine_parts(magazine))
+
+
+def render_content(json_path, payload: dict) -> Path:
+    """Render whichever kind of edition payload is."""
+    return render_page(page_path(json_path), **edition_parts(payload))
+
+
+def main():
+    for name in KNOWN_ARTEFACTS:
+        path = CONTENT_DIR / name
+        if not path.exists():
+            continue
+        with open(path, "r", encoding="utf-8") as f:
+            payload = json.load(f)
+        output_file = render_content(path, payload)
+        print(f"  {output_file.relative_to(REPO_ROOT)}  {output_file.stat().st_size} bytes")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
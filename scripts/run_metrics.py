@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""
+Run Metrics - The Litmus
+Per-stage timing spans for the generators, and one structured metrics file
+per run, so a slow run can be pinned on CoinGecko, Opus, JSON repair,
+Unsplash, ElevenLabs or the disk.
+
+Usage:
+    with metrics_run("brief-emea-morning") as run:
+        with span("build_prompt"):
+            ...
+        run.outcome = "skipped"         # ok / error are set automatically
+
+    @timed("fetch_market_data")
+    def fetch_market_data(): ...
+
+    add(bytes_in=len(body))             # counters on the innermost open span
+    annotate(strategy="cleaned")        # attributes on the innermost open span
+
+Each span records its parent, start offset, duration, status and counters;
+counters also sum into the run's totals (bytes_in, bytes_out, bytes_written,
+retries...). Spans are tracked per context, so concurrent jobs under
+scheduler.py keep separate runs; worker threads join the run when submitted
+with contextvars.copy_context(). Outside a run every call is a no-op.
+
+Files: .cache/metrics/<job>/<started>.json, the newest MAX_RUNS kept per job.
+The workflows upload the directory as a build artifact.
+
+Run: python scripts/run_metrics.py [job]    Per-stage p50 / max over recent runs
+"""
+
+import contextvars
+import functools
+import json
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+from job_guard import REPO_ROOT
+
+METRICS_DIR = REPO_ROOT / ".cache" / "metrics"
+METRICS_VERSION = 1
+MAX_RUNS = 50           # Metrics files kept per job
+
+_run = contextvars.ContextVar("run_metrics", default=None)
+_spans = contextvars.ContextVar("run_metrics_spans", default=())
+
+
+class RunMetrics:
+    """Spans and totals of one generator run."""
+
+    def __init__(self, job: str):
+        self.job = job
+        self.started_at = datetime.now(timezone.utc)
+        self.clock = time.monotonic()
+        self.spans = []
+        self.totals = {}
+        self.outcome = None
+        self.error = None
+        self.lock = threading.Lock()
+
+    def offset_ms(self) -> float:
+        return round((time.monotonic() - self.clock) * 1000, 1)
+
+    def add(self, record: dict, counts: dict):
+        with self.lock:
+            for name, value in counts.items():
+                if record is not None:
+                    record["counters"][name] = record["counters"].get(name, 0) + value
+                self.totals[name] = self.totals.get(name, 0) + value
+
+    def to_dict(self) -> dict:
+        return {
+            "version": METRICS_VERSION,
+            "job": self.job,
+            "started_at": self.started_at.isoformat(),
+            "duration_ms": self.offset_ms(),
+            "outcome": self.outcome,
+            "error": self.error,
+            "totals": self.totals,
+            "spans": self.spans,
+        }
+
+    def save(self):
+        from content_writer import atomic_write  # content_writer reports its bytes here
+
+        directory = METRICS_DIR / self.job
+        path = directory / f"{self.started_at:%Y%m%dT%H%M%S}.json"
+        atomic_write(path, json.dumps(self.to_dict(), indent=2).encode())
+        for old in sorted(directory.glob("*.json"))[:-MAX_RUNS]:
+            old.unlink(missing_ok=True)
+        return path
+
+
+@contextmanager
+def metrics_run(job: str):
+    """Collect spans for one run of job and write its metrics file at the end."""
+    run = RunMetrics(job)
+    run_token, spans_token = _run.set(run), _spans.set(())
+    try:
+        yield run
+    except BaseException as e:
+        run.outcome, run.error = "error", f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        run.outcome = run.outcome or "ok"
+        _run.reset(run_token)
+        _spans.reset(spans_token)
+        try:
+            run.save()
+        except OSError as e:
+            print(f"  ⚠️ Could not write run metrics: {e}")
+
+
+@contextmanager
+def span(name: str, **attrs):
+    """Time a stage of the current run; nested spans record their parent."""
+    run = _run.get()
+    if run is None:
+        yield None
+        return
+
+    parents = _spans.get()
+    record = {
+        "name": name,
+        "parent": parents[-1]["name"] if parents else None,
+        "start_ms": run.offset_ms(),
+        "duration_ms": None,
+        "status": "ok",
+        "attrs": dict(attrs),
+        "counters": {},
+    }
+    with run.lock:
+        run.spans.append(record)
+    token = _spans.set(parents + (record,))
+    started = time.monotonic()
+    try:
+        yield record
+    except BaseException as e:
+        record["status"] = type(e).__name__
+        raise
+    finally:
+        record["duration_ms"] = round((time.monotonic() - started) * 1000, 1)
+        _spans.reset(token)
+
+
+def timed(name: str):
+    """Decorator form of span()."""
+    def decorate(function):
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            with span(name):
+                return function(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def add(**counts):
+    """Add to counters of the innermost open span and the run totals."""
+    run = _run.get()
+    if run is not None:
+        spans = _spans.get()
+        run.add(spans[-1] if spans else None, counts)
+
+
+def annotate(**attrs):
+    """Set attributes on the innermost open span."""
+    spans = _spans.get()
+    if _run.get() is not None and spans:
+        spans[-1]["attrs"].update(attrs)
+
+
+def percentile(values: list, fraction: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(fraction * len(values)))] if values else 0
+
+
+def summarise(job: str):
+    runs = []
+    for path in sorted((METRICS_DIR / job).glob("*.json")):
+        with open(path, "r", encoding="utf-8") as f:
+            runs.append(json.load(f))
+    if not runs:
+        return
+
+    outcomes = {}
+    for run in runs:
+        outcomes[run["outcome"]] = outcomes.get(run["outcome"], 0) + 1
+    print(f"{job}: {len(runs)} runs ({', '.join(f'{n} {outcome}' for outcome, n in sorted(outcomes.items()))})")
+
+    stages = {}
+    for run in runs:
+        stages.setdefault("(run)", []).append(run["duration_ms"])
+        for record in run["spans"]:
+            stages.setdefault(record["name"], []).append(record["duration_ms"] or 0)
+    for name, durations in stages.items():
+        print(f"  {name:<28} n={len(durations):<4} p50 {percentile(durations, 0.5) / 1000:7.2f}s  max {max(durations) / 1000:7.2f}s")
+
+    latest = runs[-1]
+    if latest["totals"]:
+        print(f"  latest totals: {', '.join(f'{name}={value}' for name, value in sorted(latest['totals'].items()))}")
+
+
+def main():
+    jobs = sys.argv[1:] or sorted(path.name for path in METRICS_DIR.glob("*") if path.is_dir())
+    if not jobs:
+        print(f"No run metrics in {METRICS_DIR}")
+    for job in jobs:
+        summarise(job)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
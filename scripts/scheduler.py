@@ -0,0 +1,378 @@
+#!/usr/bin/env python3
+"""
+Scheduler - The Litmus
+One long-running process that runs every generator on its cron expression,
+instead of a cold-started workflow per job.
+
+Jobs run as asyncio tasks (the generators themselves in worker threads), so
+they share one warm HTTP session and the CoinGecko snapshot cache
+(http_pool.py). Each job has
+- a cron expression (the one its workflow used; capture_mood runs hourly,
+  and five minutes later mood-trigger runs the on-air brief out of cycle if
+  capture_mood left a pending mood trigger)
+- a concurrency limit - a due run is skipped while the job's previous run
+  is still going
+- the rate-limited APIs it uses; GROUP_LIMITS caps how many jobs call the
+  same API at once (two Anthropic generations, one ElevenLabs narration)
+- a catch-up window - on start, the latest scheduled run missed while the
+  daemon was down is run once if it is younger than the window. Older misses
+  are dropped, and several missed runs are coalesced into one.
+
+Successful content jobs refresh the feeds (publish_feeds.py); the publish
+queue is flushed every FLUSH_INTERVAL seconds and commits, pushes and deploys
+once its window has passed (publish_queue.py). JobGuard still applies to
+every run, so the daemon and a manual workflow never generate an edition twice.
+
+State (.cache/scheduler-state.json) records each job's last successful
+scheduled time and its last result; a failed run is retried by the next
+start's catch-up.
+
+Run:
+  python scripts/scheduler.py                  Run the daemon (SIGTERM / Ctrl-C to stop)
+  python scripts/scheduler.py --list           Show each job's next and missed runs
+  python scripts/scheduler.py --once <job>     Run one job now with its limits, then publish
+"""
+
+import asyncio
+import importlib
+import json
+import os
+import signal
+import sys
+import time
+from contextlib import AsyncExitStack
+from datetime import datetime, timedelta, timezone
+
+from content_writer import atomic_write
+from job_guard import REPO_ROOT, JobGuard, JobLocked
+
+STATE_FILE = REPO_ROOT / ".cache" / "scheduler-state.json"
+
+FLUSH_INTERVAL = 60         # Seconds between publish queue checks
+MAX_SLEEP = 60              # Re-check the clock at least this often (suspend, clock changes)
+DEFAULT_CATCH_UP = timedelta(hours=6)
+
+# Jobs calling the same API at once
+GROUP_LIMITS = {
+    "anthropic": 2,
+    "elevenlabs": 1,
+}
+
+CRON_FIELDS = (
+    ("minute", 0, 59),
+    ("hour", 0, 23),
+    ("day", 1, 31),
+    ("month", 1, 12),
+    ("weekday", 0, 6),
+)
+
+
+def parse_field(text: str, low: int, high: int) -> set:
+    """Values of one cron field: *, n, a-b, lists and /step."""
+    values = set()
+    for part in text.split(","):
+        spec, _, step = part.partition("/")
+        if spec == "*":
+            start, end = low, high
+        elif "-" in spec:
+            start, end = (int(bound) for bound in spec.split("-", 1))
+        else:
+            start = int(spec)
+            end = high if step else start
+        if high == 6:  # Day of week: 7 is Sunday too
+            start, end = min(start, 7), min(end, 7)
+        if start < low or end > (7 if high == 6 else high) or start > end:
+            raise ValueError(f"Cron field out of range: {part}")
+        values.update(value % 7 if high == 6 else value for value in range(start, end + 1, int(step or 1)))
+    return values
+
+
+class Cron:
+    """Standard five-field cron expression, evaluated in UTC."""
+
+    def __init__(self, expression: str):
+        fields = expression.split()
+        if len(fields) != len(CRON_FIELDS):
+            raise ValueError(f"Cron expression needs five fields: {expression!r}")
+        self.expression = expression
+        self.minutes, self.hours, self.days, self.months, self.weekdays = (
+            parse_field(text, low, high) for text, (_, low, high) in zip(fields, CRON_FIELDS)
+        )
+        # Day of month and day of week combine with OR when both are restricted
+        self.any_day = fields[2] == "*"
+        self.any_weekday = fields[4] == "*"
+
+    def day_matches(self, when: datetime) -> bool:
+        day = when.day in self.days
+        weekday = when.isoweekday() % 7 in self.weekdays
+        if self.any_day or self.any_weekday:
+            return day and weekday
+        return day or weekday
+
+    def next_after(self, when: datetime) -> datetime:
+        """First scheduled minute strictly after when."""
+        when = when.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        limit = when + timedelta(days=366 * 4)
+        while when < limit:
+            if when.month not in self.months:
+                when = (when.replace(day=1, hour=0, minute=0) + timedelta(days=32)).replace(day=1)
+            elif not self.day_matches(when):
+                when = when.replace(hour=0, minute=0) + timedelta(days=1)
+            elif when.hour not in self.hours:
+                when = when.replace(minute=0) + timedelta(hours=1)
+            elif when.minute not in self.minutes:
+                when += timedelta(minutes=1)
+            else:
+                return when
+        raise ValueError(f"Cron expression never fires: {self.expression!r}")
+
+    def previous(self, when: datetime) -> datetime:
+        """Last scheduled minute at or before when."""
+        when = when.replace(second=0, microsecond=0)
+        limit = when - timedelta(days=366 * 4)
+        while when > limit:
+            if when.month not in self.months:
+                when = when.replace(day=1, hour=0, minute=0) - timedelta(minutes=1)
+            elif not self.day_matches(when):
+                when = when.replace(hour=0, minute=0) - timedelta(minutes=1)
+            elif when.hour not in self.hours:
+                when = when.replace(minute=0) - timedelta(minutes=1)
+            elif when.minute not in self.minutes:
+                when -= timedelta(minutes=1)
+            else:
+                return when
+        raise ValueError(f"Cron expression never fires: {self.expression!r}")
+
+
+class Job:
+    """A generator entry point on a cron schedule."""
+
+    def __init__(self, name: str, cron: str, target: str, *args, groups: tuple = (),
+                 limit: int = 1, catch_up: timedelta = DEFAULT_CATCH_UP, publishes: bool = True):
+        self.name = name
+        self.cron = Cron(cron)
+        self.target = target        # "module:function", imported on first run
+        self.args = args
+        self.groups = groups
+        self.limit = limit
+        self.catch_up = catch_up
+        self.publishes = publishes
+        self.running = 0
+
+    def call(self):
+        module, function = self.target.split(":")
+        return getattr(importlib.import_module(module), function)(*self.args)
+
+
+def brief_job(region: str, brief_type: str, cron: str) -> Job:
+    return Job(f"{region}-{brief_type}", cron, "generate_brief:run", region, brief_type, groups=("anthropic",))
+
+
+def trigger_brief() -> int:
+    """Regenerate the edition most recently due (the one on air) if a mood trigger is pending."""
+    from generate_brief import run
+
+    now = utc_now()
+    editions = [job for job in JOBS.values() if job.target == "generate_brief:run" and job.args[1] != "week-ahead"]
+    on_air = max(editions, key=lambda job: job.cron.previous(now))
+    return run(*on_air.args, on_trigger=True)
+
+
+JOBS = {job.name: job for job in [
+    Job("capture-mood", "0 * * * *", "capture_mood:main", catch_up=timedelta(hours=1)),
+    Job("mood-regimes", "30 0 * * *", "mood_regimes:main", publishes=False),
+    Job("correlation-matrix", "35 0 * * *", "correlation_matrix:main", publishes=False),
+    brief_job("emea", "morning", "0 6 * * *"),
+    brief_job("apac", "evening", "0 10 * * *"),
+    brief_job("americas", "morning", "0 11 * * *"),
+    brief_job("emea", "evening", "0 18 * * *"),
+    brief_job("apac", "morning", "0 22 * * *"),
+    brief_job("americas", "evening", "0 23 * * *"),
+    Job("mood-trigger", "5 * * * *", "scheduler:trigger_brief",
+        groups=("anthropic",), catch_up=timedelta(hours=1)),
+    Job("week-ahead", "0 20 * * 0", "generate_brief:run", "global", "week-ahead",
+        groups=("anthropic",), catch_up=timedelta(hours=12)),
+    Job("weekend-magazine", "0 23 * * 5", "generate_weekend:run_guarded",
+        groups=("anthropic",), catch_up=timedelta(hours=24)),
+    Job("weekend-audio", "0 9 * * 6", "generate_audio:main",
+        groups=("elevenlabs",), catch_up=timedelta(hours=24)),
+]}
+
+
+def utc_now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def load_state() -> dict:
+    try:
+        with open(STATE_FILE, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def save_state(state: dict):
+    atomic_write(STATE_FILE, json.dumps(state, indent=2).encode())
+
+
+def missed_run(job: Job, state: dict, now: datetime) -> datetime:
+    """The latest scheduled time not yet run, if it is inside the catch-up window."""
+    due = job.cron.previous(now)
+    last = state.get(job.name, {}).get("due")
+    if last and datetime.fromisoformat(last) >= due:
+        return None
+    return due if now - due <= job.catch_up else None
+
+
+def succeeded(result) -> bool:
+    """Entry points return an exit code (capture_mood, briefs) or a bool (magazine, audio)."""
+    return result if isinstance(result, bool) else not result
+
+
+def publish_feeds():
+    from content_manifest import PUBLISH_LOCK
+    from publish_feeds import publish
+
+    try:
+        with PUBLISH_LOCK:
+            publish()
+    except JobLocked as e:
+        print(f"  {e} - feeds left to the running pass")
+
+
+def flush_queue() -> str:
+    from publish_queue import PUBLISH_JOB, flush
+
+    try:
+        with JobGuard(PUBLISH_JOB):
+            return flush()
+    except JobLocked:
+        return "locked"
+
+
+class Scheduler:
+    def __init__(self, jobs: dict):
+        self.jobs = jobs
+        self.state = load_state()
+        self.groups = {group: asyncio.Semaphore(limit) for group, limit in GROUP_LIMITS.items()}
+        self.tasks = set()
+
+    def start(self, job: Job, due: datetime, reason: str):
+        task = asyncio.create_task(self.run(job, due, reason))
+        self.tasks.add(task)
+        task.add_done_callback(self.tasks.discard)
+
+    async def run(self, job: Job, due: datetime, reason: str) -> bool:
+        if job.running >= job.limit:
+            print(f"[scheduler] {job.name} ({reason} {due:%Y-%m-%d %H:%M}) skipped - previous run still going")
+            return False
+
+        job.running += 1
+        try:
+            async with AsyncExitStack() as stack:
+                for group in job.groups:
+                    await stack.enter_async_context(self.groups[group])
+                print(f"[scheduler] {job.name} started ({reason} {due:%Y-%m-%d %H:%M} UTC)")
+                started = time.monotonic()
+                try:
+                    result = await asyncio.to_thread(job.call)
+                    ok = succeeded(result)
+                    error = None if ok else f"exit {result}"
+                except Exception as e:
+                    ok, error = False, f"{type(e).__name__}: {e}"
+                elapsed = time.monotonic() - started
+        finally:
+            job.running -= 1
+
+        entry = self.state.setdefault(job.name, {})
+        if ok and reason != "manual":
+            entry["due"] = due.isoformat()
+        entry.update(last_run=utc_now().isoformat(), seconds=round(elapsed, 1), error=error)
+        save_state(self.state)
+        print(f"[scheduler] {job.name} {'finished' if ok else 'failed: ' + error} in {elapsed:.0f}s")
+
+        if ok and job.publishes:
+            await asyncio.to_thread(publish_feeds)
+        return ok
+
+    async def schedule(self, job: Job):
+        due = missed_run(job, self.state, utc_now())
+        if due:
+            self.start(job, due, "catch-up")
+
+        while True:
+            due = job.cron.next_after(utc_now())
+            while (remaining := (due - utc_now()).total_seconds()) > 0:
+                await asyncio.sleep(min(remaining, MAX_SLEEP))
+            self.start(job, due, "scheduled")
+
+    async def flush_loop(self):
+        while True:
+            await asyncio.sleep(FLUSH_INTERVAL)
+            result = await asyncio.to_thread(flush_queue)
+            if result not in ("empty", "waiting", "locked"):
+                print(f"[scheduler] Publish queue: {result}")
+
+    async def serve(self):
+        stop = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(signum, stop.set)
+
+        loops = [asyncio.create_task(self.schedule(job)) for job in self.jobs.values()]
+        loops.append(asyncio.create_task(self.flush_loop()))
+        print(f"[scheduler] Running {len(self.jobs)} jobs - next: {describe_next(self.jobs, utc_now())}")
+
+        await stop.wait()
+        print(f"[scheduler] Stopping - waiting for {len(self.tasks)} running jobs")
+        for task in loops:
+            task.cancel()
+        await asyncio.gather(*loops, *self.tasks, return_exceptions=True)
+        await asyncio.to_thread(flush_queue)
+
+
+def describe_next(jobs: dict, now: datetime) -> str:
+    job = min(jobs.values(), key=lambda job: job.cron.next_after(now))
+    return f"{job.name} at {job.cron.next_after(now):%Y-%m-%d %H:%M} UTC"
+
+
+def list_jobs(jobs: dict):
+    now = utc_now()
+    state = load_state()
+    for job in jobs.values():
+        missed = missed_run(job, state, now)
+        groups = ",".join(job.groups) or "-"
+        flag = f"  missed {missed:%Y-%m-%d %H:%M}" if missed else ""
+        print(f"  {job.name:<18} {job.cron.expression:<12} next {job.cron.next_after(now):%Y-%m-%d %H:%M}  {groups:<10}{flag}")
+
+
+def main():
+    os.chdir(REPO_ROOT)  # Generators write paths relative to the repo root, as in the workflows
+
+    if "--list" in sys.argv:
+        list_jobs(JOBS)
+        return 0
+
+    if "--once" in sys.argv:
+        name = sys.argv[sys.argv.index("--once") + 1] if sys.argv.index("--once") + 1 < len(sys.argv) else ""
+        if name not in JOBS:
+            print(f"Unknown job: {name or '(none)'} - one of {', '.join(JOBS)}")
+            return 1
+
+        async def once():
+            ok = await Scheduler(JOBS).run(JOBS[name], utc_now(), "manual")
+            print(f"  Publish queue: {await asyncio.to_thread(flush_queue)}")
+            return ok
+
+        return 0 if asyncio.run(once()) else 1
+
+    if len(sys.argv) > 1:
+        print(__doc__)
+        return 1
+
+    asyncio.run(Scheduler(JOBS).serve())
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+speech_normaliser.py - Single-pass text normalisation for text-to-speech
+
+All rules (markdown, HTML entities, currency, percentages, abbreviations,
+whitespace) are compiled once into one ordered alternation and applied in a
+single left-to-right tokenising pass, so cost is linear in the text length.
+Alternatives are ordered by the same precedence the rules used to run in:
+at any position the earliest rule that matches wins. Plain text and single
+spaces never reach Python code - only tokens that change are replaced.
+
+The output is equivalent to the old multi-pass clean_text_for_speech on the
+production fields (content/ and the golden fixtures), not on every input.
+The sequential passes saw the text left by earlier passes, so where removing
+markup or replacing an entity joins a word to an abbreviation, or moves
+whitespace, the two differ:
+  'x**BTC**y'    old 'xBTCy'        here 'xBitcoiny'
+  '&amp;BTC'     old 'andBTC'       here 'andBitcoin'
+  'x#&nbsp;-ETH' old 'x -Ethereum'  here 'x-Ethereum' (the header rule eats &nbsp;)
+
+Run:
+  python scripts/speech_normaliser.py --check        Compare against golden fixtures
+  python scripts/speech_normaliser.py --bench [N]    Time N passes over the magazine
+"""
+
+import json
+import re
+import sys
+import time
+from pathlib import Path
+
+FIXTURES_DIR = Path(__file__).parent / 'fixtures' / 'speech'
+MAGAZINE_PATH = Path(__file__).parent.parent / 'content' / 'weekend' / 'magazine.json'
+
+# Crypto terms pronunciation hints
+SPEECH_ABBREVIATIONS = {
+    'BTC': 'Bitcoin',
+    'ETH': 'Ethereum',
+    'DeFi': 'DeFi',
+    'NFT': 'N F T',
+    'TVL': 'total value locked',
+    'ATH': 'all-time high',
+    'HODL': 'hodl',
+}
+
+# Whitespace includes &nbsp; so runs of either collapse to one space
+WS = r'(?:\s|&nbsp;)'
+
+# Ordered rule table: (name, pattern, replacement). Replacements are either a
+# template using named groups or a callable taking the match.
+RULES = [
+    # Markdown - inner text is normalised recursively
+    ('bold', r'\*\*(?P<bold_text>[^*]+)\*\*', lambda m: normalise(m.group('bold_text'), strip=False)),
+    ('italic', r'\*(?P<italic_text>[^*]+)\*', lambda m: normalise(m.group('italic_text'), strip=False)),
+    ('underscore', r'_(?P<underscore_text>[^_]+)_', lambda m: normalise(m.group('underscore_text'), strip=False)),
+    ('link', r'\[(?P<link_text>[^\]]+)\]\([^)]+\)', lambda m: normalise(m.group('link_text'), strip=False)),
+    ('header', r'#{1,6}' + WS + '*', ''),
+
+    # HTML entities and dashes
+    ('amp', r'&amp;', 'and'),
+    ('em_dash', WS + '*—' + WS + '*', ' — '),
+    ('en_dash', WS + '*–' + WS + '*', ' - '),
+
+    # Currency - make it speakable
+    ('usd_millions', r'\$(?P<m1>\d{1,3}),(?P<m2>\d{3}),\d{3}', '{m1} point {m2} billion dollars'),
+    ('usd_thousands', r'\$(?P<t1>\d{1,3}),\d{3}', '{t1} thousand dollars'),
+    ('usd_b', r'\$(?P<b>\d+)(?i:b)', '{b} billion dollars'),
+    ('usd_m', r'\$(?P<mm>\d+)(?i:m)', '{mm} million dollars'),
+    ('usd_k', r'\$(?P<k>\d+)(?i:k)', '{k} thousand dollars'),
+    ('usd', r'\$(?P<d>\d+)', '{d} dollars'),
+
+    # Percentages
+    ('percent', r'(?P<pct>\d+\.?\d*)%', '{pct} percent'),
+
+    # Abbreviations - the leading word boundary is checked in the handler so the
+    # compiled pattern keeps a first-character prefix the regex engine can scan for
+    ('abbreviation', r'(?P<abbr>' + '|'.join(map(re.escape, SPEECH_ABBREVIATIONS)) + r')\b',
+     lambda m: m.group('abbr') if is_word_char_before(m) else SPEECH_ABBREVIATIONS[m.group('abbr')]),
+
+    # Whitespace - a lone space is already normal and stays in the literal run
+    ('space', r'(?: ' + WS + '+|[^\S ]' + WS + '*|&nbsp;' + WS + '*)', ' '),
+]
+
+
+def is_word_char_before(match):
+    """True if the match is preceded by a word character (no \\b boundary)"""
+    start = match.start()
+    return start > 0 and (match.string[start - 1].isalnum() or match.string[start - 1] == '_')
+
+
+# Cheap lookahead on the characters a token can start with, so the engine only
+# tries the full alternation where a rule could possibly match
+TOKEN_START = (
+    r'(?=[*_\[#&—–$\d' + ''.join(sorted({abbr[0] for abbr in SPEECH_ABBREVIATIONS})) + r']'
+    r'|[^\S ]| (?:\s|&nbsp;|[—–]))'
+)
+
+TOKEN_PATTERN = re.compile(TOKEN_START + '(?:' + '|'.join(f'(?P<{name}>{pattern})' for name, pattern, _ in RULES) + ')')
+REPLACEMENTS = {
+    name: replacement if callable(replacement) else (lambda m, t=replacement: t.format(**m.groupdict()))
+    for name, _, replacement in RULES
+}
+
+
+def normalise(text, strip=True):
+    """Normalise text for speech in one pass over the compiled rule table"""
+    out = []
+    last_space = True if strip else False
+    position = 0
+
+    for match in TOKEN_PATTERN.finditer(text):
+        pieces = (text[position:match.start()], REPLACEMENTS[match.lastgroup](match))
+        position = match.end()
+        for piece in pieces:
+            # Merge spaces across token boundaries so output never has runs
+            if last_space:
+                piece = piece.lstrip(' ')
+            if piece:
+                out.append(piece)
+                last_space = piece.endswith(' ')
+
+    tail = text[position:]
+    if tail:
+        out.append(tail.lstrip(' ') if last_space else tail)
+
+    result = ''.join(out)
+    return result.strip() if strip else result
+
+
+def load_fixtures():
+    """Yield (name, input text, expected output) for every golden fixture"""
+    for input_path in sorted(FIXTURES_DIR.glob('*.md')):
+        expected_path = input_path.with_suffix('.txt')
+        yield (
+            input_path.stem,
+            input_path.read_text(encoding='utf-8'),
+            expected_path.read_text(encoding='utf-8').rstrip('\n'),
+        )
+
+
+def check():
+    """Compare output with golden fixtures; return True if all match"""
+    failures = 0
+    for name, text, expected in load_fixtures():
+        actual = normalise(text)
+        if actual == expected:
+            print(f"✅ {name}")
+            continue
+        failures += 1
+        at = next((i for i, (a, b) in enumerate(zip(actual, expected)) if a != b), min(len(actual), len(expected)))
+        print(f"❌ {name}: first difference at {at}")
+        print(f"   expected: {expected[max(0, at - 40):at + 40]!r}")
+        print(f"   actual:   {actual[max(0, at - 40):at + 40]!r}")
+    return failures == 0
+
+
+def bench(passes=200):
+    """Time normalisation of every text field in the magazine"""
+    with open(MAGAZINE_PATH, 'r', encoding='utf-8') as f:
+        magazine = json.load(f)
+
+    texts = [v['content'] for v in magazine.values() if isinstance(v, dict) and isinstance(v.get('content'), str)]
+    corpus = '\n\n'.join(texts)
+
+    for size in (1, 10, 100):
+        text = '\n\n'.join([corpus] * size)
+        runs = max(1, passes // size)
+        started = time.perf_counter()
+        for _ in range(runs):
+            normalise(text)
+        elapsed = (time.perf_counter() - started) / runs
+        print(f"⏱️ {len(text) / 1024:8.0f} KB: {elapsed * 1000:8.2f} ms/pass ({len(text) / 1024 / 1024 / elapsed:.1f} MB/s)")
+
+
+if __name__ == '__main__':
+    if '--bench' in sys.argv:
+        args = [a for a in sys.argv[1:] if not a.startswith('--')]
+        bench(int(args[0]) if args else 200)
+    else:
+        sys.exit(0 if check() else 1)